@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 from functools import lru_cache
 
 
@@ -17,11 +18,33 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str
     REDIS_POOL_MAX_CONNECTIONS: int = 50
+    REDIS_BYTES_POOL_MAX_CONNECTIONS: int = 10  # Binary client for large cached blobs
+    REDIS_MICRO_BATCHING: bool = True  # Send redis_service commands issued in the same event-loop tick as one pipeline
+    CACHE_CODEC: str = "msgpack+zlib"  # json, msgpack, zlib or msgpack+zlib
+    
+    # Rate limiting
+    RATE_LIMIT_SIGNALS_FREE: int = 60  # GET /signals/ requests per minute per free user
+    RATE_LIMIT_SIGNALS_PAID: int = 600  # ... per paid user
+    LOCAL_LIMITER_MAX_KEYS: int = 100000  # Identities tracked by each worker's pre-limiter (~200 bytes each)
+    LOCAL_LIMITER_SYNC_INTERVAL: float = 5.0  # Seconds between syncs of local rejection counts to Redis
+    USAGE_REDIS_FLUSH_INTERVAL: float = 5.0  # Seconds of usage counts a worker holds in memory (lost if it crashes)
+    USAGE_DB_FLUSH_INTERVAL: float = 60.0  # Seconds between bulk upserts of usage counts into Postgres
     
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_SIZE: int = 10000  # Verified token payloads kept per worker
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False  # /signals/ trusts id and tier in the token (one Redis lookup, no user load)
+    
+    # Authenticated user cache
+    USER_CACHE_SIZE: int = 10000  # Users kept in each worker's memory
+    USER_CACHE_TTL: int = 60  # Seconds a worker trusts its copy (changes are also broadcast)
+    USER_CACHE_REDIS_TTL: int = 300  # Seconds the shared Redis copy lives
+    
+    # Password hashing (bcrypt runs on a thread pool, off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64  # Pending hashes per worker before signup/login return 503
     
     # Stripe
     STRIPE_SECRET_KEY: str
@@ -32,6 +55,18 @@ class Settings(BaseSettings):
     # Frontend
     FRONTEND_URL: str
     
+    # Signals
+    INSTRUMENTS_FILE: Optional[str] = None  # CSV with symbol,base_price columns
+    
+    # Market data
+    TICK_SOURCE: Optional[str] = None  # file:/path.csv, udp://host:port or tcp://host:port; simulated if unset
+    TICK_BUFFER_CAPACITY: int = 1024  # Ticks kept per instrument
+    TICK_REPLAY_SPEED: float = 0.0  # file: replay pace (1.0 = recorded pace, 0 = as fast as possible)
+    
+    # Signal computation
+    SIGNAL_POOL_WORKERS: Optional[int] = None  # Processes for indicator math; None = one per CPU core, 0 = inline
+    SIGNAL_POOL_MIN_SYMBOLS: int = 5000  # Smaller universes are computed inline
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
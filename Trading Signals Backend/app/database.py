@@ -1,4 +1,5 @@
 import asyncpg
+from pathlib import Path
 from typing import Optional
 from contextlib import asynccontextmanager
 from app.config import settings
@@ -7,6 +8,9 @@ from app.config import settings
 # Global connection pool
 db_pool: Optional[asyncpg.Pool] = None
 
+SCHEMA_FILE = Path(__file__).resolve().parent.parent / "init.sql"
+SCHEMA_LOCK_ID = 724_300_001  # pg_advisory_xact_lock key, so workers apply the schema one at a time
+
 
 async def create_db_pool():
     """Create database connection pool"""
@@ -25,6 +29,23 @@ async def create_db_pool():
     return db_pool
 
 
+async def apply_schema():
+    """
+    Apply init.sql (idempotent) to the database
+    
+    Postgres only runs init.sql when its data volume is first created, so
+    tables and columns added since then are created here on startup.
+    """
+    schema = SCHEMA_FILE.read_text()
+    
+    async with get_pool().acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", SCHEMA_LOCK_ID)
+            await conn.execute(schema)
+    
+    print("Database schema applied")
+
+
 async def close_db_pool():
     """Close database connection pool"""
     global db_pool
@@ -1,40 +1,93 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
-from app.services.auth_service import verify_token, get_user_by_id
-from app.models.user import UserInDB
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.services.auth_service import verify_token, get_user_by_id_cached, create_user_token
+from app.services.token_versions import get_token_versions
+from app.models.user import UserRecord, TokenUser
 
 security = HTTPBearer()
 
+# Response header carrying a replacement for a token whose claims went stale
+REISSUED_TOKEN_HEADER = "X-Access-Token"
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserInDB:
-    token = credentials.credentials
-    
-    payload = verify_token(token)
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _token_payload(credentials: HTTPAuthorizationCredentials) -> Dict[str, Any]:
+    payload = verify_token(credentials.credentials)
     
     if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Invalid authentication credentials")
+    
+    if payload.get("user_id") is None:
+        raise _unauthorized("Invalid token payload")
     
+    return payload
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserRecord:
+    payload = _token_payload(credentials)
     user_id: Optional[int] = payload.get("user_id")
     
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user = await get_user_by_id_cached(user_id)
+    
+    if user is None:
+        raise _unauthorized("User not found")
+    
+    if payload.get("ver", 0) < user.token_min_version:
+        raise _unauthorized("Token has been revoked")
+    
+    return user
+
+
+async def get_token_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenUser:
+    """
+    Authenticate from the token's claims, for routes that only need id and tier
+    
+    With AUTH_TRUST_TOKEN_CLAIMS the only lookup is the user's token versions
+    in Redis. A token older than the current version (e.g. issued before a
+    payment) is answered from the user record instead, and a fresh token is
+    attached for the route to send back (see token_headers). Without it this
+    is the same check as get_current_user.
+    """
+    if not settings.AUTH_TRUST_TOKEN_CLAIMS:
+        user = await get_current_user(credentials)
+        return TokenUser(id=user.id, email=user.email, is_paid=user.is_paid)
+    
+    payload = _token_payload(credentials)
+    user_id: int = payload["user_id"]
+    
+    versions = await get_token_versions(user_id)
+    
+    if versions is None:
+        raise _unauthorized("User not found")
     
-    user = await get_user_by_id(user_id)
+    version, min_version = versions
+    claimed = payload.get("ver", 0)
+    
+    if claimed < min_version:
+        raise _unauthorized("Token has been revoked")
+    
+    if claimed >= version:
+        return TokenUser(id=user_id, email=payload["email"], is_paid=payload.get("is_paid", False))
+    
+    user = await get_user_by_id_cached(user_id)
     
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("User not found")
     
-    return user
\ No newline at end of file
+    return TokenUser(id=user.id, email=user.email, is_paid=user.is_paid, reissued_token=create_user_token(user))
+
+
+def token_headers(user: TokenUser) -> Dict[str, str]:
+    """Response headers delivering a re-issued token, if there is one"""
+    if user.reissued_token is None:
+        return {}
+    return {REISSUED_TOKEN_HEADER: user.reissued_token}
@@ -0,0 +1,21 @@
+from .signal_engine import Universe, generate_signal_columns, columns_to_records, generate_signals, random_walk_ticks
+from .signal_index import SignalIndex
+from .indicators import IndicatorEngine
+from .tick_store import TickStore
+from .backtest import PriceSeries, SignalBatch, load_price_directory, run_backtest, summarize
+
+__all__ = [
+    "Universe",
+    "generate_signal_columns",
+    "columns_to_records",
+    "generate_signals",
+    "random_walk_ticks",
+    "SignalIndex",
+    "IndicatorEngine",
+    "TickStore",
+    "PriceSeries",
+    "SignalBatch",
+    "load_price_directory",
+    "run_backtest",
+    "summarize",
+]
@@ -0,0 +1,359 @@
+"""
+Vectorized backtesting of signals against OHLC price series
+
+For every signal we find which of its target and stoploss is touched first
+after the signal time. The search runs on all signals of a symbol at once:
+a sparse table of range maxima (highs) and minima (lows) is built per
+symbol, and a binary-lifting descent moves every signal's position forward
+by 2^k bars while the level is still out of reach. Each signal therefore
+costs O(log bars) array operations, regardless of how long it stays open.
+
+Prices are loaded from CSV or .npz files (one file per symbol). Run as:
+    python -m app.engine.backtest --signals signals.csv --prices data/prices/
+"""
+import argparse
+import csv
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+
+TARGET = 1
+STOPLOSS = -1
+OPEN = 0  # Neither level touched within the horizon / available data
+
+
+class PriceSeries:
+    """OHLC bars for one symbol, timestamps as epoch seconds (ascending)"""
+
+    def __init__(self, timestamps, open_, high, low, close):
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.open = np.asarray(open_, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+
+        self._high_table: Optional[List[np.ndarray]] = None
+        self._low_table: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def high_table(self) -> List[np.ndarray]:
+        if self._high_table is None:
+            self._high_table = _sparse_table(self.high, np.maximum)
+        return self._high_table
+
+    @property
+    def low_table(self) -> List[np.ndarray]:
+        if self._low_table is None:
+            self._low_table = _sparse_table(self.low, np.minimum)
+        return self._low_table
+
+
+def _to_epoch_seconds(values: Iterable[Any]) -> np.ndarray:
+    return np.asarray(list(values), dtype="datetime64[s]").astype(np.int64)
+
+
+def load_price_series(path: str) -> PriceSeries:
+    """
+    Load OHLC bars from a file
+
+    - .csv: header with timestamp, open, high, low, close (ISO timestamps)
+    - .npz: arrays named timestamp (epoch seconds), open, high, low, close
+    """
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return PriceSeries(data["timestamp"], data["open"], data["high"], data["low"], data["close"])
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    return PriceSeries(
+        _to_epoch_seconds(row["timestamp"] for row in rows),
+        [float(row["open"]) for row in rows],
+        [float(row["high"]) for row in rows],
+        [float(row["low"]) for row in rows],
+        [float(row["close"]) for row in rows],
+    )
+
+
+def save_price_series(path: str, series: PriceSeries) -> None:
+    """Save bars as .npz, which loads much faster than CSV"""
+    np.savez(path, timestamp=series.timestamps, open=series.open, high=series.high, low=series.low, close=series.close)
+
+
+def load_price_directory(directory: str) -> Dict[str, PriceSeries]:
+    """Load every SYMBOL.csv / SYMBOL.npz file in a directory"""
+    prices = {}
+
+    for name in sorted(os.listdir(directory)):
+        symbol, extension = os.path.splitext(name)
+        if extension in (".csv", ".npz"):
+            prices[symbol.upper()] = load_price_series(os.path.join(directory, name))
+
+    return prices
+
+
+class SignalBatch:
+    """Signals to score, stored as parallel arrays"""
+
+    def __init__(self, symbols, timestamps, is_buy, entry, target, stoploss):
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.is_buy = np.asarray(is_buy, dtype=bool)
+        self.entry = np.asarray(entry, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+        self.stoploss = np.asarray(stoploss, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "SignalBatch":
+        """Build from signal dicts, e.g. rows of /signals/history or a CSV export of signal_history"""
+        return cls(
+            [record["symbol"].upper() for record in records],
+            _to_epoch_seconds(record["generated_at"] for record in records),
+            [record["action"].upper() == "BUY" for record in records],
+            [float(record["price"]) for record in records],
+            [float(record["target"]) for record in records],
+            [float(record["stoploss"]) for record in records],
+        )
+
+    @classmethod
+    def from_csv(cls, path: str) -> "SignalBatch":
+        with open(path, newline="") as f:
+            return cls.from_records(list(csv.DictReader(f)))
+
+
+def _sparse_table(values: np.ndarray, combine) -> List[np.ndarray]:
+    """table[k][i] = combine(values[i : i + 2**k]) for every i where the range fits"""
+    table = [values]
+    span = 1
+
+    while span * 2 <= len(values):
+        previous = table[-1]
+        table.append(combine(previous[:-span], previous[span:]))
+        span *= 2
+
+    return table
+
+
+def _first_reach(table: List[np.ndarray], start: np.ndarray, limit: np.ndarray, level: np.ndarray, above: bool) -> np.ndarray:
+    """
+    First index in [start, limit) whose value reaches level, else limit
+
+    above=True looks for value >= level on a max table, above=False for
+    value <= level on a min table. Every signal descends independently: it
+    skips a block of 2^k bars whenever the block's extreme is still short of
+    its level.
+    """
+    position = start.copy()
+
+    for k in range(len(table) - 1, -1, -1):
+        block = table[k]
+        span = 1 << k
+
+        fits = position + span <= limit
+        extreme = block[np.minimum(position, len(block) - 1)]
+        short = extreme < level if above else extreme > level
+
+        position = np.where(fits & short, position + span, position)
+
+    # After the descent, position is the first bar that reached the level,
+    # unless the level was never reached before the limit
+    inside = position < limit
+    value = table[0][np.minimum(position, len(table[0]) - 1)]
+    reached = inside & ((value >= level) if above else (value <= level))
+
+    return np.where(reached, position, limit)
+
+
+def score_symbol(prices: PriceSeries, signals: SignalBatch, max_bars: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Score signals of one symbol against its bars
+
+    The first bar at or after a signal's timestamp is its entry bar. When
+    target and stoploss are touched in the same bar, the stoploss is assumed
+    to have come first.
+
+    Returns:
+        Arrays per signal: outcome (TARGET/STOPLOSS/OPEN), exit_price,
+        r_multiple, holding_bars, holding_seconds
+    """
+    n_bars = len(prices)
+    if n_bars == 0:
+        raise ValueError("price series has no bars")
+
+    start = np.searchsorted(prices.timestamps, signals.timestamps, side="left")
+    limit = np.full(len(signals), n_bars, dtype=np.int64) if max_bars is None else np.minimum(start + max_bars, n_bars)
+
+    is_buy = signals.is_buy
+
+    # BUY: target is above (watch highs), stop below (watch lows). SELL: mirrored.
+    target_up = _first_reach(prices.high_table, start, limit, signals.target, above=True)
+    target_down = _first_reach(prices.low_table, start, limit, signals.target, above=False)
+    stop_down = _first_reach(prices.low_table, start, limit, signals.stoploss, above=False)
+    stop_up = _first_reach(prices.high_table, start, limit, signals.stoploss, above=True)
+
+    target_at = np.where(is_buy, target_up, target_down)
+    stop_at = np.where(is_buy, stop_down, stop_up)
+
+    outcome = np.where(
+        stop_at <= target_at,
+        np.where(stop_at < limit, STOPLOSS, OPEN),
+        TARGET
+    )
+    exit_at = np.minimum(np.minimum(target_at, stop_at), limit - 1)
+
+    # Open signals are marked to the close of the last bar inside the horizon
+    valid_exit = np.clip(exit_at, 0, n_bars - 1)
+    last_close = prices.close[valid_exit]
+    exit_price = np.select([outcome == TARGET, outcome == STOPLOSS], [signals.target, signals.stoploss], last_close)
+
+    direction = np.where(is_buy, 1.0, -1.0)
+    risk = np.abs(signals.entry - signals.stoploss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_multiple = np.where(risk > 0, (exit_price - signals.entry) * direction / risk, np.nan)
+
+    # No bars after the signal at all: nothing to score
+    no_data = start >= n_bars
+    r_multiple = np.where(no_data, np.nan, r_multiple)
+
+    holding_bars = np.where(no_data, 0, exit_at - start + 1)
+    holding_seconds = np.where(no_data, 0, prices.timestamps[valid_exit] - signals.timestamps)
+
+    return {
+        "outcome": outcome.astype(np.int8),
+        "exit_price": exit_price,
+        "r_multiple": r_multiple,
+        "holding_bars": holding_bars,
+        "holding_seconds": holding_seconds,
+        "scored": ~no_data,
+    }
+
+
+def run_backtest(
+    signals: SignalBatch,
+    prices: Dict[str, PriceSeries],
+    max_bars: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Score every signal that has a price series
+
+    Returns:
+        Per-signal result arrays (see score_symbol) aligned with `signals`,
+        plus symbol_code/symbols for grouping. Signals without prices are
+        marked scored=False.
+    """
+    n = len(signals)
+    symbols, codes = np.unique(signals.symbols, return_inverse=True)
+
+    results = {
+        "outcome": np.zeros(n, dtype=np.int8),
+        "exit_price": np.full(n, np.nan),
+        "r_multiple": np.full(n, np.nan),
+        "holding_bars": np.zeros(n, dtype=np.int64),
+        "holding_seconds": np.zeros(n, dtype=np.int64),
+        "scored": np.zeros(n, dtype=bool),
+    }
+
+    # One vectorized pass per symbol over all of its signals
+    order = np.argsort(codes, kind="stable")
+    boundaries = np.searchsorted(codes[order], np.arange(len(symbols) + 1))
+
+    for code, symbol in enumerate(symbols):
+        series = prices.get(symbol)
+        if series is None or len(series) == 0:
+            continue
+
+        members = order[boundaries[code]:boundaries[code + 1]]
+        subset = SignalBatch(
+            signals.symbols[members],
+            signals.timestamps[members],
+            signals.is_buy[members],
+            signals.entry[members],
+            signals.target[members],
+            signals.stoploss[members],
+        )
+
+        for key, values in score_symbol(series, subset, max_bars).items():
+            results[key][members] = values
+
+    results["symbols"] = symbols
+    results["symbol_code"] = codes
+    return results
+
+
+def summarize(results: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+    """
+    Per-symbol report: hit rate (target hits / resolved signals), average
+    R-multiple and average holding time, aggregated with bincount
+    """
+    symbols = results["symbols"]
+    scored = results["scored"]
+    codes = results["symbol_code"][scored]
+    outcome = results["outcome"][scored]
+    size = len(symbols)
+
+    def count(mask):
+        return np.bincount(codes[mask], minlength=size)
+
+    def total(values):
+        return np.bincount(codes, weights=values, minlength=size)
+
+    signals_count = count(np.ones(len(codes), dtype=bool))
+    targets = count(outcome == TARGET)
+    stops = count(outcome == STOPLOSS)
+
+    r_values = results["r_multiple"][scored]
+    r_known = ~np.isnan(r_values)
+    r_sum = np.bincount(codes[r_known], weights=r_values[r_known], minlength=size)
+    r_count = np.bincount(codes[r_known], minlength=size)
+
+    bars_sum = total(results["holding_bars"][scored].astype(np.float64))
+    seconds_sum = total(results["holding_seconds"][scored].astype(np.float64))
+
+    report = {}
+    for i, symbol in enumerate(symbols):
+        if signals_count[i] == 0:
+            continue
+
+        resolved = targets[i] + stops[i]
+        report[str(symbol)] = {
+            "signals": int(signals_count[i]),
+            "target_hits": int(targets[i]),
+            "stoploss_hits": int(stops[i]),
+            "open": int(signals_count[i] - resolved),
+            "hit_rate": float(targets[i] / resolved) if resolved else 0.0,
+            "avg_r_multiple": float(r_sum[i] / r_count[i]) if r_count[i] else 0.0,
+            "avg_holding_bars": float(bars_sum[i] / signals_count[i]),
+            "avg_holding_seconds": float(seconds_sum[i] / signals_count[i]),
+        }
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backtest stored signals against OHLC price files")
+    parser.add_argument("--signals", required=True, help="CSV with symbol, action, price, target, stoploss, generated_at")
+    parser.add_argument("--prices", required=True, help="Directory of SYMBOL.csv / SYMBOL.npz OHLC files")
+    parser.add_argument("--max-bars", type=int, default=None, help="Close signals still open after this many bars")
+    args = parser.parse_args(argv)
+
+    signals = SignalBatch.from_csv(args.signals)
+    prices = load_price_directory(args.prices)
+    report = summarize(run_backtest(signals, prices, args.max_bars))
+
+    print(f"{'symbol':<14} {'signals':>8} {'target':>7} {'stop':>6} {'open':>6} {'hit rate':>9} {'avg R':>7} {'avg bars':>9}")
+    for symbol, stats in report.items():
+        print(
+            f"{symbol:<14} {stats['signals']:>8} {stats['target_hits']:>7} {stats['stoploss_hits']:>6} "
+            f"{stats['open']:>6} {stats['hit_rate']:>9.1%} {stats['avg_r_multiple']:>7.2f} {stats['avg_holding_bars']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Incremental technical indicators over a tick stream
+
+State for every symbol lives in flat arrays indexed by the symbol's position
+in the universe. A tick updates each indicator in O(1): running sums over a
+ring of recent prices for the SMAs, exponential smoothing for the EMAs and
+MACD, and Wilder smoothing for RSI and ATR. A batch of ticks (one per symbol)
+is applied with a handful of array operations, so thousands of symbols cost
+about as much Python work as one.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+SMA_FAST = 10
+SMA_SLOW = 30
+EMA_FAST = 12
+EMA_SLOW = 26
+MACD_SIGNAL = 9
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+
+TARGET_ATR = 3.0  # Target distance in ATRs
+STOPLOSS_ATR = 2.0  # Stoploss distance in ATRs
+MIN_ATR_PCT = 0.001  # ATR floor as a fraction of price, keeps levels off the entry
+
+
+def _alpha(period: int) -> float:
+    return 2.0 / (period + 1)
+
+
+class IndicatorEngine:
+    """Rolling SMA/EMA/MACD/RSI/ATR state for a fixed number of symbols"""
+
+    def __init__(self, size: int, sma_fast: int = SMA_FAST, sma_slow: int = SMA_SLOW):
+        if not 0 < sma_fast <= sma_slow:
+            raise ValueError("sma_fast must be positive and at most sma_slow")
+
+        self.size = size
+        self.sma_fast = sma_fast
+        self.sma_slow = sma_slow
+
+        self._rows = np.arange(size)
+        self.count = np.zeros(size, dtype=np.int64)  # Ticks seen per symbol
+        self.last = np.zeros(size)
+
+        # Last sma_slow prices per symbol; slot count % sma_slow is overwritten next
+        self._window = np.zeros((size, sma_slow))
+        self._sum_fast = np.zeros(size)
+        self._sum_slow = np.zeros(size)
+
+        self.ema_fast = np.zeros(size)
+        self.ema_slow = np.zeros(size)
+        self.macd_signal = np.zeros(size)
+
+        self._avg_gain = np.zeros(size)
+        self._avg_loss = np.zeros(size)
+        self.atr = np.zeros(size)
+
+        # Held between ticks when the indicators disagree
+        self.is_buy = np.ones(size, dtype=bool)
+
+    def update(
+        self,
+        prices: np.ndarray,
+        positions: Optional[np.ndarray] = None,
+        highs: Optional[np.ndarray] = None,
+        lows: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Apply one tick per symbol
+
+        Args:
+            prices: Last traded price per updated symbol
+            positions: Unique symbol positions the prices belong to (all symbols if None)
+            highs, lows: Bar range for the true range; without them ATR uses |price change|
+        """
+        rows = self._rows if positions is None else np.asarray(positions)
+        idx = slice(None) if positions is None else rows
+        price = np.asarray(prices, dtype=np.float64)
+
+        count = self.count[idx]
+        first = count == 0
+        previous = np.where(first, price, self.last[idx])
+
+        # SMAs: add the new price, drop the ones leaving each window
+        slot = count % self.sma_slow
+        leaving_slow = np.where(count >= self.sma_slow, self._window[rows, slot], 0.0)
+        leaving_fast = np.where(count >= self.sma_fast, self._window[rows, (count - self.sma_fast) % self.sma_slow], 0.0)
+        self._window[rows, slot] = price
+        self._sum_fast[idx] += price - leaving_fast
+        self._sum_slow[idx] += price - leaving_slow
+
+        # EMAs and MACD, seeded with the first price
+        ema_fast = np.where(first, price, self.ema_fast[idx] + _alpha(EMA_FAST) * (price - self.ema_fast[idx]))
+        ema_slow = np.where(first, price, self.ema_slow[idx] + _alpha(EMA_SLOW) * (price - self.ema_slow[idx]))
+        macd = ema_fast - ema_slow
+        self.macd_signal[idx] = np.where(first, macd, self.macd_signal[idx] + _alpha(MACD_SIGNAL) * (macd - self.macd_signal[idx]))
+        self.ema_fast[idx] = ema_fast
+        self.ema_slow[idx] = ema_slow
+
+        # Wilder smoothing; averaging over fewer samples during warm-up makes
+        # the first `period` values a plain mean, as in Wilder's original seed
+        change = price - previous
+        rsi_period = np.clip(count, 1, RSI_PERIOD)
+        self._avg_gain[idx] += (np.maximum(change, 0.0) - self._avg_gain[idx]) / rsi_period * ~first
+        self._avg_loss[idx] += (np.maximum(-change, 0.0) - self._avg_loss[idx]) / rsi_period * ~first
+
+        if highs is None or lows is None:
+            # Like RSI, the first tick has no range yet
+            true_range = np.abs(change)
+            atr_period = np.clip(count, 1, ATR_PERIOD)
+            weight = ~first
+        else:
+            high = np.asarray(highs, dtype=np.float64)
+            low = np.asarray(lows, dtype=np.float64)
+            true_range = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+            atr_period = np.minimum(count + 1, ATR_PERIOD)
+            weight = True
+        self.atr[idx] += (true_range - self.atr[idx]) / atr_period * weight
+
+        self.last[idx] = price
+        self.count[idx] = count + 1
+
+    def sma(self) -> Dict[str, np.ndarray]:
+        """Fast and slow simple moving averages (over the ticks seen so far during warm-up)"""
+        return {
+            "fast": self._sum_fast / np.clip(self.count, 1, self.sma_fast),
+            "slow": self._sum_slow / np.clip(self.count, 1, self.sma_slow),
+        }
+
+    def macd(self) -> np.ndarray:
+        return self.ema_fast - self.ema_slow
+
+    def rsi(self) -> np.ndarray:
+        """Relative strength index, 50 until there has been any movement"""
+        gain, loss = self._avg_gain, self._avg_loss
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+        rsi = np.where(loss == 0, np.where(gain > 0, 100.0, 50.0), rsi)
+        return rsi
+
+    def signal_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Turn the current indicator state into signals
+
+        SMA and MACD trends vote for a direction, RSI adds a vote against
+        overbought/oversold extremes. A tie keeps the previous direction, so
+        a symbol flips only on a crossover that outvotes the other trend.
+        Target and stoploss are placed at ATR multiples from the last price.
+
+        Returns:
+            Same columns as generate_signal_columns: price, is_buy, target, stoploss
+        """
+        sma = self.sma()
+        rsi = self.rsi()
+
+        votes = (
+            np.where(sma["fast"] > sma["slow"], 1, -1)
+            + np.where(self.macd() > self.macd_signal, 1, -1)
+            + (rsi < RSI_OVERSOLD).astype(np.int64)
+            - (rsi > RSI_OVERBOUGHT).astype(np.int64)
+        )
+        self.is_buy = np.where(votes == 0, self.is_buy, votes > 0)
+
+        price = np.round(self.last, 2)
+        atr = np.maximum(self.atr, price * MIN_ATR_PCT)
+        direction = np.where(self.is_buy, 1.0, -1.0)
+
+        return {
+            "price": price,
+            "is_buy": self.is_buy.copy(),
+            "target": np.round(price + direction * TARGET_ATR * atr, 2),
+            "stoploss": np.round(price - direction * STOPLOSS_ATR * atr, 2),
+        }
+
+
+# Per-symbol state arrays, in the order they are sliced and written back
+_STATE_FIELDS = (
+    "count", "last", "_window", "_sum_fast", "_sum_slow", "ema_fast", "ema_slow",
+    "macd_signal", "_avg_gain", "_avg_loss", "atr", "is_buy",
+)
+
+
+def split_engine(engine: IndicatorEngine, start: int, stop: int) -> IndicatorEngine:
+    """Copy the state of symbols [start, stop) into an independent engine"""
+    chunk = IndicatorEngine.__new__(IndicatorEngine)
+    chunk.size = stop - start
+    chunk.sma_fast = engine.sma_fast
+    chunk.sma_slow = engine.sma_slow
+    chunk._rows = np.arange(chunk.size)
+
+    for name in _STATE_FIELDS:
+        setattr(chunk, name, getattr(engine, name)[start:stop].copy())
+    return chunk
+
+
+def merge_engine(engine: IndicatorEngine, start: int, chunk: IndicatorEngine) -> None:
+    """Write a chunk's state back into the symbols it was split from"""
+    for name in _STATE_FIELDS:
+        getattr(engine, name)[start:start + chunk.size] = getattr(chunk, name)
+
+
+def split_rounds(rounds: List[Tuple[np.ndarray, np.ndarray]], bounds: np.ndarray) -> List[List[Tuple[np.ndarray, np.ndarray]]]:
+    """
+    Partition tick rounds (ascending positions, prices) by symbol chunk
+
+    Positions in each chunk's rounds are made relative to the chunk start.
+    """
+    chunks: List[List[Tuple[np.ndarray, np.ndarray]]] = [[] for _ in range(len(bounds) - 1)]
+
+    for positions, prices in rounds:
+        cuts = np.searchsorted(positions, bounds)
+        for i, chunk in enumerate(chunks):
+            if cuts[i + 1] > cuts[i]:
+                chunk.append((positions[cuts[i]:cuts[i + 1]] - bounds[i], prices[cuts[i]:cuts[i + 1]]))
+
+    return chunks
+
+
+def advance(engine: IndicatorEngine, rounds: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[IndicatorEngine, Dict[str, np.ndarray]]:
+    """
+    Apply tick rounds and compute signal columns
+
+    Module-level so it can run in a worker process: the engine (or a chunk
+    of it) goes in, the updated engine and its signals come back.
+    """
+    for positions, prices in rounds:
+        engine.update(prices, positions)
+    return engine, engine.signal_columns()
@@ -0,0 +1,99 @@
+"""
+Per-snapshot lookup indexes for filtered signal queries
+
+Built once per snapshot, then every query is answered from hash lookups,
+precomputed position buckets and a binary search over sorted prices instead
+of scanning the signal list. Positions refer to the snapshot's signal order,
+which is also the pagination order.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _buckets(keys: List[str]) -> Dict[str, np.ndarray]:
+    """Group positions by key, each bucket sorted ascending"""
+    buckets: Dict[str, List[int]] = {}
+    for position, key in enumerate(keys):
+        buckets.setdefault(key, []).append(position)
+    return {key: np.asarray(positions, dtype=np.int64) for key, positions in buckets.items()}
+
+
+class SignalIndex:
+    """Symbol hash, action/sector buckets and a sorted price array"""
+
+    def __init__(self, signals: List[Dict[str, Any]]):
+        self.size = len(signals)
+
+        self.by_symbol: Dict[str, int] = {signal["symbol"].upper(): i for i, signal in enumerate(signals)}
+        self.by_action = _buckets([signal["action"].upper() for signal in signals])
+        self.by_sector = _buckets([(signal.get("sector") or "").lower() for signal in signals])
+
+        prices = np.fromiter((signal["price"] for signal in signals), dtype=np.float64, count=self.size)
+        self.price_order = np.argsort(prices, kind="stable")
+        self.sorted_prices = prices[self.price_order]
+
+    def positions_for(self, symbols: Iterable[str]) -> np.ndarray:
+        """Sorted positions of the given symbols; unknown symbols are skipped"""
+        positions = [self.by_symbol[symbol] for symbol in symbols if symbol in self.by_symbol]
+        return np.sort(np.asarray(positions, dtype=np.int64))
+
+    def _price_range(self, min_price: Optional[float], max_price: Optional[float]) -> np.ndarray:
+        lo = 0 if min_price is None else np.searchsorted(self.sorted_prices, min_price, side="left")
+        hi = self.size if max_price is None else np.searchsorted(self.sorted_prices, max_price, side="right")
+        return np.sort(self.price_order[lo:hi])
+
+    def query(
+        self,
+        symbol: Optional[str] = None,
+        symbols: Optional[Iterable[str]] = None,
+        action: Optional[str] = None,
+        sector: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        visible: Optional[int] = None,
+        cursor: Optional[int] = None,
+        limit: int = 100
+    ) -> Tuple[List[int], Optional[int]]:
+        """
+        Find matching signal positions
+
+        Args:
+            symbol, action, sector, min_price, max_price: Filters (all optional, ANDed)
+            symbols: Only these symbols (upper case), e.g. a watchlist
+            visible: Only the first `visible` positions may be returned (free tier)
+            cursor: Position returned last on the previous page
+            limit: Maximum positions to return
+
+        Returns:
+            Tuple of (positions in snapshot order, next cursor or None on the last page)
+        """
+        if symbol is not None:
+            position = self.by_symbol.get(symbol.upper())
+            candidates = _EMPTY if position is None else np.asarray([position], dtype=np.int64)
+        else:
+            candidates = None
+
+        # Intersect the remaining filters; each bucket is already sorted
+        for bucket in (
+            None if symbols is None else self.positions_for(symbols),
+            None if action is None else self.by_action.get(action.upper(), _EMPTY),
+            None if sector is None else self.by_sector.get(sector.lower(), _EMPTY),
+            None if min_price is None and max_price is None else self._price_range(min_price, max_price),
+        ):
+            if bucket is None:
+                continue
+            candidates = bucket if candidates is None else np.intersect1d(candidates, bucket, assume_unique=True)
+
+        if candidates is None:
+            candidates = np.arange(self.size, dtype=np.int64)
+
+        start = 0 if cursor is None else np.searchsorted(candidates, cursor, side="right")
+        end = len(candidates) if visible is None else np.searchsorted(candidates, visible, side="left")
+
+        page = candidates[start:min(end, start + limit)]
+        next_cursor = int(page[-1]) if len(page) and start + limit < end else None
+
+        return page.tolist(), next_cursor
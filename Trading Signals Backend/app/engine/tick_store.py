@@ -0,0 +1,152 @@
+"""
+Fixed-size per-symbol tick ring buffers
+
+All buffers are allocated up front as one 2-D array per field, so memory is
+symbols x capacity x fields x 8 bytes (x2, see below) no matter how many ticks
+arrive. Each tick is written twice, at slot and slot + capacity. The newest
+`capacity` ticks of a symbol are therefore always one contiguous slice, and
+windows are returned as NumPy views without copying or re-ordering.
+"""
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+import numpy as np
+
+
+DEFAULT_CAPACITY = 1024
+
+
+def _occurrence_rank(positions: np.ndarray) -> np.ndarray:
+    """For each entry, how many earlier entries share its position"""
+    order = np.argsort(positions, kind="stable")
+    ordered = positions[order]
+    group_start = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    group_sizes = np.diff(np.r_[group_start, len(ordered)])
+
+    rank = np.empty(len(positions), dtype=np.int64)
+    rank[order] = np.arange(len(ordered)) - np.repeat(group_start, group_sizes)
+    return rank
+
+
+class TickStore:
+    """Preallocated ring buffers of (timestamp, price, volume) per symbol"""
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        capacity: int = DEFAULT_CAPACITY,
+        initial_prices: Optional[np.ndarray] = None
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        size = len(symbols)
+        self.symbols = list(symbols)
+        self.positions: Dict[str, int] = {symbol.upper(): i for i, symbol in enumerate(self.symbols)}
+        self.capacity = capacity
+
+        self._timestamps = np.zeros((size, 2 * capacity), dtype=np.int64)  # Epoch milliseconds
+        self._prices = np.zeros((size, 2 * capacity), dtype=np.float64)
+        self._volumes = np.zeros((size, 2 * capacity), dtype=np.float64)
+
+        # Ticks ever written per symbol; the next slot is written % capacity
+        self.written = np.zeros(size, dtype=np.int64)
+
+        # Reference price until a symbol's first tick arrives
+        self.last_prices = np.full(size, np.nan) if initial_prices is None else np.array(initial_prices, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the buffers, fixed at construction"""
+        return sum(array.nbytes for array in (self._timestamps, self._prices, self._volumes, self.written, self.last_prices))
+
+    def append(self, position: int, timestamp: int, price: float, volume: float = 0.0) -> None:
+        """Store one tick for the symbol at `position`"""
+        slot = self.written[position] % self.capacity
+        mirror = slot + self.capacity
+
+        self._timestamps[position, slot] = self._timestamps[position, mirror] = timestamp
+        self._prices[position, slot] = self._prices[position, mirror] = price
+        self._volumes[position, slot] = self._volumes[position, mirror] = volume
+
+        self.written[position] += 1
+        self.last_prices[position] = price
+
+    def append_batch(
+        self,
+        positions: np.ndarray,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        volumes: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Store many ticks at once, in order
+
+        Several ticks for the same symbol are allowed; they are written in
+        rounds so each round touches every symbol at most once.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.zeros(len(positions)) if volumes is None else np.asarray(volumes, dtype=np.float64)
+
+        if not len(positions):
+            return
+
+        rank = _occurrence_rank(positions)
+        rounds = [slice(None)] if rank.max() == 0 else [rank == r for r in range(rank.max() + 1)]
+
+        for selected in rounds:
+            rows = positions[selected]
+            slot = self.written[rows] % self.capacity
+
+            for buffer, values in ((self._timestamps, timestamps), (self._prices, prices), (self._volumes, volumes)):
+                buffer[rows, slot] = values[selected]
+                buffer[rows, slot + self.capacity] = values[selected]
+
+            self.written[rows] += 1
+            self.last_prices[rows] = prices[selected]
+
+    def window(self, position: int, size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Newest ticks of a symbol, oldest first, as read-only views
+
+        Args:
+            position: Symbol position
+            size: Number of ticks (default: all still held, at most capacity)
+
+        Returns:
+            Tuple of (timestamps, prices, volumes) views into the buffers
+        """
+        held = min(self.written[position], self.capacity)
+        size = held if size is None else min(size, held)
+
+        end = self.written[position] % self.capacity + self.capacity
+        view = slice(end - size, end)
+
+        result = (self._timestamps[position, view], self._prices[position, view], self._volumes[position, view])
+        for array in result:
+            array.flags.writeable = False
+        return result
+
+    def drain(self, consumed: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield ticks written since `consumed`, one round per tick depth
+
+        Each round is (positions, prices) with at most one tick per symbol,
+        in arrival order per symbol. `consumed` (ticks already read per
+        symbol) is advanced in place. Ticks overwritten before being read
+        are skipped.
+        """
+        written = self.written.copy()
+        np.maximum(consumed, written - self.capacity, out=consumed)
+
+        while True:
+            pending = np.flatnonzero(consumed < written)
+            if not len(pending):
+                return
+
+            slot = consumed[pending] % self.capacity
+            yield pending, self._prices[pending, slot]
+            consumed[pending] += 1
@@ -4,9 +4,21 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from app.config import settings
-from app.database import create_db_pool, close_db_pool
+from app.dependencies import REISSUED_TOKEN_HEADER
+from app.middleware.rate_limit_middleware import RateLimitMiddleware
+from app.database import create_db_pool, close_db_pool, apply_schema
 from app.redis_client import create_redis_pool, close_redis_pool
-from app.routers import auth_router, billing_router, signals_router
+from app.routers import auth_router, billing_router, signals_router, watchlist_router
+from app.services.pubsub_service import start_pubsub_listener, stop_pubsub_listener
+from app.services.signal_refresher import start_signal_refresher, stop_signal_refresher
+from app.services.history_service import flush_pending_writes
+from app.services.tick_ingestion import stop_tick_ingestion
+from app.services.compute_pool import start_compute_pool, stop_compute_pool
+from app.services.signal_service import UNIVERSE
+from app.services.password_pool import start_password_pool, stop_password_pool
+from app.services.token_cache import load_revoked_tokens
+from app.services.local_limiter import start_local_limiter_sync, stop_local_limiter_sync
+from app.services.usage_service import start_usage_metering, stop_usage_metering
 
 
 @asynccontextmanager
@@ -20,9 +32,34 @@ async def lifespan(app: FastAPI):
     # Initialize database pool
     await create_db_pool()
     
+    # Tables and columns added since the database volume was created
+    await apply_schema()
+    
     # Initialize Redis pool
     await create_redis_pool()
     
+    # Tokens revoked before this worker started
+    await load_revoked_tokens()
+    
+    # Share counts of requests this worker's rate limit pre-check rejects
+    await start_local_limiter_sync()
+    
+    # Batch per-user API usage counts into Postgres
+    await start_usage_metering()
+    
+    # Worker processes for indicator math on large universes, so generation never blocks requests
+    await start_compute_pool(len(UNIVERSE))
+    
+    # Threads for bcrypt, so logins never block requests
+    await start_password_pool()
+    
+    # Keep the signals cache warm so requests never wait for generation. The
+    # leader worker also feeds market data into its tick buffers.
+    await start_signal_refresher()
+    
+    # Receive signal/user cache invalidations and token revocations from other workers
+    await start_pubsub_listener()
+    
     print("\nFast API Server is running...")
     
     yield
@@ -30,6 +67,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("Shutting down FAST API Server...")
     
+    await stop_signal_refresher()
+    await stop_pubsub_listener()
+    await stop_tick_ingestion()
+    await stop_compute_pool()
+    await stop_password_pool()
+    await stop_local_limiter_sync()
+    await stop_usage_metering()
+    await flush_pending_writes()
     await close_db_pool()
     await close_redis_pool()
     
@@ -45,6 +90,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Rate limits per route (see RATE_LIMIT_RULES); added before CORS so 429s get CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -52,6 +100,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[REISSUED_TOKEN_HEADER, "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After"],
 )
 
 
@@ -98,6 +147,16 @@ async def health_check():
     """Health check endpoint with connection tests"""
     from app.database import get_pool
     from app.redis_client import get_redis
+    from app.services.signal_service import get_cache_stats
+    from app.services.signal_stream import get_stream_stats
+    from app.services.tick_ingestion import get_tick_stats
+    from app.services.compute_pool import get_pool_stats
+    from app.services.user_cache import get_user_cache_stats
+    from app.services.password_pool import get_password_pool_stats
+    from app.services.token_cache import get_token_cache_stats
+    from app.services.local_limiter import get_local_limiter_stats
+    from app.services.usage_service import get_usage_stats
+    from app.services.redis_service import get_batch_stats
     
     health_status = {
         "status": "healthy",
@@ -124,8 +183,20 @@ async def health_check():
         health_status["status"] = "unhealthy"
         health_status["redis_error"] = str(e)
     
+    health_status["signals_cache"] = get_cache_stats()
+    health_status["signals_stream"] = get_stream_stats()
+    health_status["ticks"] = get_tick_stats()
+    health_status["signals_compute"] = get_pool_stats()
+    health_status["users_cache"] = get_user_cache_stats()
+    health_status["password_hashing"] = get_password_pool_stats()
+    health_status["token_cache"] = get_token_cache_stats()
+    health_status["rate_limit_local"] = get_local_limiter_stats()
+    health_status["usage"] = get_usage_stats()
+    health_status["redis_batching"] = get_batch_stats()
+    
     return health_status
 
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(billing_router, prefix="/billing", tags=["Billing"])
-app.include_router(signals_router, prefix="/signals", tags=["Trading Signals"])
\ No newline at end of file
+app.include_router(signals_router, prefix="/signals", tags=["Trading Signals"])
+app.include_router(watchlist_router, prefix="/watchlist", tags=["Watchlist"])
\ No newline at end of file
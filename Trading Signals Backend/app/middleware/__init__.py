@@ -1,3 +1,4 @@
 from .rate_limit import rate_limit
+from .rate_limit_middleware import RATE_LIMIT_RULES, RateLimitMiddleware, RateLimitRule
 
-__all__ = ["rate_limit"]
\ No newline at end of file
+__all__ = ["rate_limit", "RATE_LIMIT_RULES", "RateLimitMiddleware", "RateLimitRule"]
\ No newline at end of file
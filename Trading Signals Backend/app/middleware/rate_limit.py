@@ -5,23 +5,32 @@ from functools import wraps
 from fastapi import Request, HTTPException, status
 from typing import Callable
 import inspect
-from app.services.redis_service import check_rate_limit
+import math
+from app.services.redis_service import RATE_LIMIT_SCRIPTS, RateLimitResult, hit_rate_limit
+from app.services.local_limiter import local_reject, record_result
 
 
 def rate_limit(
     key_prefix: str,
     max_requests: int,
     window_seconds: int,
-    identifier: str = "ip"
+    identifier: str = "ip",
+    algorithm: str = "fixed_window"
 ):
     """
     Rate limiting decorator for FastAPI routes
     
+    Routes of this app are limited by RateLimitMiddleware (see
+    rate_limit_middleware.RATE_LIMIT_RULES); the decorator is for handlers
+    that need a limit the route table cannot express.
+    
     Args:
         key_prefix: Prefix for Redis key (e.g., "login", "signup")
         max_requests: Maximum number of requests allowed
         window_seconds: Time window in seconds
         identifier: What to use as identifier - "ip" or "email"
+        algorithm: "fixed_window", "sliding_log" (exact), "sliding_window"
+            (approximate, constant memory) or "token_bucket" (allows bursts)
     
     Usage:
         @router.post("/login")
@@ -29,11 +38,15 @@ def rate_limit(
         async def login(request: Request, data: LoginRequest):
             ...
     """
+    if algorithm not in RATE_LIMIT_SCRIPTS:
+        raise ValueError(f"Invalid rate limit algorithm: {algorithm}")
+    
     def decorator(func: Callable):
+        # Inspected once, not per request
+        sig = inspect.signature(func)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Get function signature to find Request parameter
-            sig = inspect.signature(func)
             
             request: Request = None
             request_data = None
@@ -71,13 +84,27 @@ def rate_limit(
             else:
                 raise ValueError(f"Invalid identifier: {identifier}")
             
-            # Check rate limit
-            allowed = await check_rate_limit(rate_limit_key, max_requests, window_seconds)
+            # Clearly over the limit: rejected by this worker without asking Redis
+            local_retry_after = local_reject(rate_limit_key, max_requests, window_seconds)
+            
+            if local_retry_after is None:
+                # Check and count the request in one atomic Redis call
+                result = await hit_rate_limit(rate_limit_key, max_requests, window_seconds, algorithm)
+                record_result(rate_limit_key, window_seconds, result)
+            else:
+                result = RateLimitResult(False, max_requests, 0, local_retry_after)
             
-            if not allowed:
+            if not result.allowed:
+                retry_after = str(max(1, math.ceil(result.reset_after)))
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Too many requests. Please try again later."
+                    detail="Too many requests. Please try again later.",
+                    headers={
+                        "Retry-After": retry_after,
+                        "X-RateLimit-Limit": str(result.limit),
+                        "X-RateLimit-Remaining": "0",
+                        "X-RateLimit-Reset": retry_after,
+                    }
                 )
             
             # Call the actual route handler
@@ -0,0 +1,180 @@
+"""
+Route-level rate limiting as ASGI middleware
+
+Limits are declared once in RATE_LIMIT_RULES and compiled into a
+(method, path) lookup table when the app is built, so a request costs one
+dict lookup to find its limit and unlisted routes pass straight through.
+Identities are the client IP, the email in a JSON body (read once and
+replayed to the route), or the user id from the bearer token, in which case
+the quota follows the token's tier. Every limited response carries
+X-RateLimit-Limit, X-RateLimit-Remaining and X-RateLimit-Reset (seconds).
+"""
+import json
+import math
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from app.config import settings
+from app.services.auth_service import verify_token
+from app.services.local_limiter import local_reject, record_result
+from app.services.redis_service import RATE_LIMIT_SCRIPTS, RateLimitResult, hit_rate_limit
+
+
+MAX_IDENTITY_BODY = 16 * 1024  # Larger bodies are not parsed for an email; the IP is used instead
+
+
+class RateLimitRule(NamedTuple):
+    method: str
+    path: str
+    key_prefix: str
+    max_requests: int  # Per window; the free tier's quota for identifier="user"
+    window_seconds: int
+    identifier: str = "ip"  # "ip", "email" or "user"
+    algorithm: str = "fixed_window"
+    paid_max_requests: Optional[int] = None  # Paid tier's quota for identifier="user"
+
+
+RATE_LIMIT_RULES = [
+    RateLimitRule("POST", "/auth/signup", "signup", 5, 900),
+    RateLimitRule("POST", "/auth/login", "login", 5, 900, identifier="email", algorithm="sliding_log"),
+    RateLimitRule(
+        "GET", "/signals/", "signals", settings.RATE_LIMIT_SIGNALS_FREE, 60,
+        identifier="user", algorithm="token_bucket", paid_max_requests=settings.RATE_LIMIT_SIGNALS_PAID
+    ),
+    RateLimitRule("GET", "/signals/stream", "signals_stream", 10, 60, identifier="user", algorithm="sliding_window"),
+    RateLimitRule("GET", "/signals/history", "signals_history", 30, 60, identifier="user", algorithm="sliding_window"),
+    RateLimitRule("POST", "/billing/create-checkout", "checkout", 10, 3600, identifier="user"),
+    RateLimitRule("GET", "/billing/status", "billing_status", 60, 60, identifier="user", algorithm="sliding_window"),
+]
+
+
+def compile_rules(rules: Iterable[RateLimitRule]) -> Dict[Tuple[str, str], RateLimitRule]:
+    """Validate rules and index them by (method, path)"""
+    table = {}
+    for rule in rules:
+        if rule.algorithm not in RATE_LIMIT_SCRIPTS:
+            raise ValueError(f"Invalid rate limit algorithm for {rule.path}: {rule.algorithm}")
+        if rule.identifier not in ("ip", "email", "user"):
+            raise ValueError(f"Invalid identifier for {rule.path}: {rule.identifier}")
+        if (rule.method, rule.path) in table:
+            raise ValueError(f"Duplicate rate limit for {rule.method} {rule.path}")
+        table[(rule.method, rule.path)] = rule
+    return table
+
+
+def _bearer_claims(scope) -> Optional[dict]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return verify_token(token)
+            return None
+    return None
+
+
+def _client_ip(scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _read_body(receive) -> Tuple[bytes, List[dict]]:
+    """Read the request body (up to MAX_IDENTITY_BODY), keeping the messages for replay"""
+    messages, body = [], b""
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body", False) or len(body) > MAX_IDENTITY_BODY:
+            break
+    return body, messages
+
+
+def _body_email(body: bytes) -> Optional[str]:
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+def _limit_headers(result: RateLimitResult) -> List[Tuple[bytes, bytes]]:
+    return [
+        (b"x-ratelimit-limit", str(result.limit).encode()),
+        (b"x-ratelimit-remaining", str(result.remaining).encode()),
+        (b"x-ratelimit-reset", str(math.ceil(result.reset_after)).encode()),
+    ]
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying RATE_LIMIT_RULES"""
+
+    def __init__(self, app, rules: Iterable[RateLimitRule] = RATE_LIMIT_RULES):
+        self.app = app
+        self.table = compile_rules(rules)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        rule = self.table.get((scope["method"], scope["path"]))
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        max_requests = rule.max_requests
+        identity = None
+
+        if rule.identifier == "user":
+            claims = _bearer_claims(scope)
+            if claims is not None and claims.get("user_id") is not None:
+                identity = f"user:{claims['user_id']}"
+                if claims.get("is_paid") and rule.paid_max_requests is not None:
+                    max_requests = rule.paid_max_requests
+        elif rule.identifier == "email":
+            body, messages = await _read_body(receive)
+            identity = _body_email(body)
+            receive = self._replay(messages, receive)
+
+        # Requests the route will reject anyway (no token, no email) count against the IP
+        key = f"rate_limit:{rule.key_prefix}:{identity or _client_ip(scope)}"
+
+        retry_after = local_reject(key, max_requests, rule.window_seconds)
+        if retry_after is None:
+            result = await hit_rate_limit(key, max_requests, rule.window_seconds, rule.algorithm)
+            record_result(key, rule.window_seconds, result)
+        else:
+            result = RateLimitResult(False, max_requests, 0, retry_after)
+
+        headers = _limit_headers(result)
+
+        if not result.allowed:
+            return await self._reject(send, headers, result)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    def _replay(messages: List[dict], receive):
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+        return replay
+
+    @staticmethod
+    async def _reject(send, headers: List[Tuple[bytes, bytes]], result: RateLimitResult) -> None:
+        body = json.dumps({"detail": "Too many requests. Please try again later."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(result.reset_after))).encode()),
+                *headers,
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
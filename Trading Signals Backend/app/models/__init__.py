@@ -1,18 +1,27 @@
-from .user import UserResponse, UserInDB
+from .user import UserResponse, UserRecord, UserInDB, TokenUser
 from .auth import SignupRequest, LoginRequest, LoginResponse, TokenData
-from .billing import CheckoutResponse, SubscriptionStatus, WebhookResponse
-from .signal import Signal, SignalsResponse
+from .billing import CheckoutResponse, SubscriptionStatus, UsageDay, UsageResponse, WebhookResponse
+from .signal import Signal, SignalsResponse, HistoricalSignal, SignalHistoryResponse
+from .watchlist import WatchlistUpdate, WatchlistResponse
 
 __all__ = [
     "UserResponse",
+    "UserRecord",
     "UserInDB",
+    "TokenUser",
     "SignupRequest",
     "LoginRequest",
     "LoginResponse",
     "TokenData",
     "CheckoutResponse",
     "SubscriptionStatus",
+    "UsageDay",
+    "UsageResponse",
     "WebhookResponse",
     "Signal",
-    "SignalsResponse"
+    "SignalsResponse",
+    "HistoricalSignal",
+    "SignalHistoryResponse",
+    "WatchlistUpdate",
+    "WatchlistResponse"
 ]
\ No newline at end of file
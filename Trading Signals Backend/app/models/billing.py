@@ -1,5 +1,6 @@
+from datetime import date
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class CheckoutRequest(BaseModel):
@@ -21,6 +22,22 @@ class SubscriptionStatus(BaseModel):
     email: str
 
 
+class UsageDay(BaseModel):
+    """Requests a user made to one endpoint on one day (UTC)"""
+    day: date
+    endpoint: str
+    tier: str  # "paid" or "free", as the requests were served
+    requests: int
+
+
+class UsageResponse(BaseModel):
+    """Response model for usage reports"""
+    usage: List[UsageDay]
+    total_requests: int
+    start: date
+    end: date
+
+
 class WebhookResponse(BaseModel):
     """Response model for webhook endpoint"""
     status: str
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from datetime import datetime
 
 
 class Signal(BaseModel):
@@ -9,6 +10,7 @@ class Signal(BaseModel):
     target: float
     stoploss: float
     timestamp: str
+    sector: Optional[str] = None
 
 
 class SignalsResponse(BaseModel):
@@ -16,4 +18,27 @@ class SignalsResponse(BaseModel):
     total: int
     is_paid: bool
     cached: bool
-    message: Optional[str]
\ No newline at end of file
+    message: Optional[str]
+    version: Optional[int] = None  # Snapshot version, usable as ?since= on the next poll
+    since: Optional[int] = None  # Set when only signals changed since this version are included
+    next_cursor: Optional[int] = None  # Pass back as ?cursor= for the next page of a filtered query
+    watchlist: bool = False  # Set when only the user's watchlist symbols are included
+
+
+class HistoricalSignal(BaseModel):
+    """A signal as stored in the history table"""
+    version: int
+    symbol: str
+    action: str
+    price: float
+    target: float
+    stoploss: float
+    sector: Optional[str] = None
+    generated_at: datetime  # UTC
+
+
+class SignalHistoryResponse(BaseModel):
+    signals: List[HistoricalSignal]
+    total: int
+    start: datetime
+    end: datetime
@@ -13,20 +13,34 @@ class UserCreate(UserBase):
     password: str = Field(..., min_length=6, max_length=100)
 
 
-class UserInDB(UserBase):
-    """User model as stored in database"""
+class UserRecord(UserBase):
+    """User model without credentials, as cached for request authentication"""
     id: int
-    password_hash: str
     is_paid: bool = False
     stripe_customer_id: Optional[str] = None
     stripe_subscription_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    token_version: int = 0  # Tokens carry it as "ver"; bumped when their claims go stale
+    token_min_version: int = 0  # Tokens with an older "ver" are revoked
 
     class Config:
         from_attributes = True
 
 
+class UserInDB(UserRecord):
+    """User model as stored in database"""
+    password_hash: str
+
+
+class TokenUser(BaseModel):
+    """The claims of a verified access token, for routes that need nothing else"""
+    id: int
+    email: EmailStr
+    is_paid: bool = False
+    reissued_token: Optional[str] = None  # Replacement token when the claims were stale
+
+
 class UserResponse(UserBase):
     """User model for API responses (without sensitive data)"""
     id: int
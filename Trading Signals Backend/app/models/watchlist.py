@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+WATCHLIST_MAX_SYMBOLS = 100
+
+
+class WatchlistUpdate(BaseModel):
+    """Replace the whole watchlist"""
+    symbols: List[str] = Field(..., max_length=WATCHLIST_MAX_SYMBOLS)
+
+
+class WatchlistResponse(BaseModel):
+    symbols: List[str]
+    total: int
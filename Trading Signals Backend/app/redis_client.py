@@ -3,13 +3,15 @@ from typing import Optional
 from app.config import settings
 
 
-# Global Redis client
+# Global Redis clients: strings for counters, keys and small values, raw
+# bytes for large encoded blobs (see services/cache_codec.py)
 redis_client: Optional[aioredis.Redis] = None
+redis_bytes_client: Optional[aioredis.Redis] = None
 
 
 async def create_redis_pool():
-    """Create Redis connection pool"""
-    global redis_client
+    """Create Redis connection pools"""
+    global redis_client, redis_bytes_client
     
     redis_client = await aioredis.from_url(
         settings.REDIS_URL,
@@ -18,16 +20,25 @@ async def create_redis_pool():
         max_connections=settings.REDIS_POOL_MAX_CONNECTIONS
     )
     
-    # Test connection
+    redis_bytes_client = await aioredis.from_url(
+        settings.REDIS_URL,
+        decode_responses=False,
+        max_connections=settings.REDIS_BYTES_POOL_MAX_CONNECTIONS
+    )
+    
+    # Test connections
     await redis_client.ping()
+    await redis_bytes_client.ping()
     print(f"Redis pool created (max_connections={settings.REDIS_POOL_MAX_CONNECTIONS})")
     
     return redis_client
 
 
 async def close_redis_pool():
-    """Close Redis connection pool"""
-    global redis_client
+    """Close Redis connection pools"""
+    global redis_client, redis_bytes_client
+    if redis_bytes_client:
+        await redis_bytes_client.close()
     if redis_client:
         await redis_client.close()
         print("Redis pool closed")
@@ -37,4 +48,11 @@ def get_redis() -> aioredis.Redis:
     """Get the Redis client"""
     if redis_client is None:
         raise RuntimeError("Redis client not initialized. Call create_redis_pool() first.")
-    return redis_client
\ No newline at end of file
+    return redis_client
+
+
+def get_redis_bytes() -> aioredis.Redis:
+    """Get the Redis client that returns raw bytes (no response decoding)"""
+    if redis_bytes_client is None:
+        raise RuntimeError("Redis client not initialized. Call create_redis_pool() first.")
+    return redis_bytes_client
@@ -1,5 +1,6 @@
 from .auth import router as auth_router
 from .billing import router as billing_router
 from .signals import router as signals_router
+from .watchlist import router as watchlist_router
 
-__all__ = ["auth_router", "billing_router", "signals_router"]
\ No newline at end of file
+__all__ = ["auth_router", "billing_router", "signals_router", "watchlist_router"]
\ No newline at end of file
@@ -1,21 +1,23 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Response
+from fastapi.security import HTTPAuthorizationCredentials
 from app.models.auth import SignupRequest, LoginRequest, LoginResponse
-from app.models.user import UserResponse, UserInDB
+from app.models.user import UserResponse, UserRecord
 from app.services.auth_service import (
     get_user_by_email,
     create_user,
     authenticate_user,
-    create_access_token
+    create_user_token,
+    revoke_user_tokens,
+    verify_token
 )
-from app.dependencies import get_current_user
-from app.middleware.rate_limit import rate_limit
+from app.services.token_cache import revoke_token
+from app.dependencies import get_current_user, security
 
 router = APIRouter()
 
 
 @router.post("/signup", response_model=LoginResponse, status_code=status.HTTP_201_CREATED)
-@rate_limit(key_prefix="signup", max_requests=5, window_seconds=900, identifier="ip")
-async def signup(request: Request, data: SignupRequest):
+async def signup(data: SignupRequest):
     # Check if user already exists
     existing_user = await get_user_by_email(data.email)
     
@@ -29,13 +31,7 @@ async def signup(request: Request, data: SignupRequest):
     user = await create_user(data.email, data.password)
     
     # Generate JWT token
-    access_token = create_access_token(
-        data={
-            "user_id": user.id,
-            "email": user.email,
-            "is_paid": user.is_paid
-        }
-    )
+    access_token = create_user_token(user)
     
     return LoginResponse(
         access_token=access_token,
@@ -50,8 +46,7 @@ async def signup(request: Request, data: SignupRequest):
 
 
 @router.post("/login", response_model=LoginResponse)
-@rate_limit(key_prefix="login", max_requests=5, window_seconds=900, identifier="email")
-async def login(request: Request, data: LoginRequest):
+async def login(data: LoginRequest):
     # Authenticate user
     user = await authenticate_user(data.email, data.password)
     
@@ -63,13 +58,7 @@ async def login(request: Request, data: LoginRequest):
         )
     
     # Generate JWT token
-    access_token = create_access_token(
-        data={
-            "user_id": user.id,
-            "email": user.email,
-            "is_paid": user.is_paid
-        }
-    )
+    access_token = create_user_token(user)
     
     return LoginResponse(
         access_token=access_token,
@@ -83,8 +72,25 @@ async def login(request: Request, data: LoginRequest):
     )
 
 
+@router.post("/refresh", response_model=LoginResponse)
+async def refresh(current_user: UserRecord = Depends(get_current_user)):
+    """
+    Get a new token with the user's current claims, e.g. right after paying
+    """
+    return LoginResponse(
+        access_token=create_user_token(current_user),
+        token_type="bearer",
+        user={
+            "id": current_user.id,
+            "email": current_user.email,
+            "is_paid": current_user.is_paid,
+            "created_at": current_user.created_at.isoformat()
+        }
+    )
+
+
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: UserInDB = Depends(get_current_user)):
+async def get_me(current_user: UserRecord = Depends(get_current_user)):
     """
     Get current authenticated user's information which Requires valid JWT token in Authorization header
     """
@@ -93,4 +99,31 @@ async def get_me(current_user: UserInDB = Depends(get_current_user)):
         email=current_user.email,
         is_paid=current_user.is_paid,
         created_at=current_user.created_at
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Revoke the token in the Authorization header, on every server, until it expires
+    """
+    payload = verify_token(credentials.credentials)
+    
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    await revoke_token(credentials.credentials, payload["exp"])
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(current_user: UserRecord = Depends(get_current_user)):
+    """
+    Revoke every token issued to the current user so far
+    """
+    await revoke_user_tokens(current_user.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
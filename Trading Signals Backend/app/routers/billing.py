@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Request
-from app.models.billing import CheckoutResponse, SubscriptionStatus, WebhookResponse
-from app.models.user import UserInDB
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from app.models.billing import CheckoutResponse, SubscriptionStatus, UsageResponse, WebhookResponse
+from app.models.user import UserRecord
 from app.services.stripe_service import (
     create_checkout_session,
     verify_webhook_signature,
@@ -9,13 +11,17 @@ from app.services.stripe_service import (
     handle_checkout_completed,
     get_subscription_status
 )
+from app.services.usage_service import get_usage
 from app.dependencies import get_current_user
 
 router = APIRouter()
 
+USAGE_DEFAULT_DAYS = 30
+USAGE_MAX_DAYS = 366
+
 
 @router.post("/create-checkout", response_model=CheckoutResponse)
-async def create_checkout(current_user: UserInDB = Depends(get_current_user)):
+async def create_checkout(current_user: UserRecord = Depends(get_current_user)):
     # Check if user is already paid
     if current_user.is_paid:
         raise HTTPException(
@@ -36,7 +42,7 @@ async def create_checkout(current_user: UserInDB = Depends(get_current_user)):
 
 
 @router.get("/status", response_model=SubscriptionStatus)
-async def get_billing_status(current_user: UserInDB = Depends(get_current_user)):
+async def get_billing_status(current_user: UserRecord = Depends(get_current_user)):
     status_data = await get_subscription_status(current_user.id)
     
     if not status_data:
@@ -48,6 +54,43 @@ async def get_billing_status(current_user: UserInDB = Depends(get_current_user))
     return SubscriptionStatus(**status_data)
 
 
+@router.get("/usage", response_model=UsageResponse)
+async def get_billing_usage(
+    current_user: UserRecord = Depends(get_current_user),
+    start: Optional[date] = Query(None, description="Inclusive, defaults to 29 days before end"),
+    end: Optional[date] = Query(None, description="Inclusive, defaults to today (UTC)")
+):
+    """
+    Get the current user's API usage per day, endpoint and tier
+    
+    Counts reach the database in batches, so the last minute or two of
+    requests may not be included yet.
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=USAGE_DEFAULT_DAYS - 1)
+    
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    
+    if (end - start).days >= USAGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {USAGE_MAX_DAYS} days can be requested at once"
+        )
+    
+    usage = await get_usage(current_user.id, start, end)
+    
+    return UsageResponse(
+        usage=usage,
+        total_requests=sum(row["requests"] for row in usage),
+        start=start,
+        end=end
+    )
+
+
 @router.post("/webhooks/stripe", response_model=WebhookResponse)
 async def stripe_webhook(request: Request):
     """
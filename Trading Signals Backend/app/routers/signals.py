@@ -1,14 +1,48 @@
-from fastapi import APIRouter, Depends
-from app.models.signal import SignalsResponse
-from app.models.user import UserInDB
-from app.services.signal_service import get_signals_for_user
-from app.dependencies import get_current_user
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from app.models.signal import SignalsResponse, SignalHistoryResponse
+from app.models.user import TokenUser
+from app.services.signal_service import SignalsUnavailable, get_snapshot, etag_matches, query_signals, render_signals_body
+from app.services.signal_stream import open_stream, StreamFull
+from app.services.signal_snapshot import MEDIA_TYPES, encode_view, negotiate_format
+from app.services.history_service import get_signal_history
+from app.services.watchlist_service import get_watchlist
+from app.services.usage_service import record_usage
+from app.dependencies import get_token_user, token_headers
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+HISTORY_DEFAULT_RANGE = timedelta(days=1)
+HISTORY_MAX_ROWS = 10000
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    """History timestamps are stored as naive UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 
 @router.get("/", response_model=SignalsResponse)
-async def get_signals(current_user: UserInDB = Depends(get_current_user)):
+async def get_signals(
+    current_user: TokenUser = Depends(get_token_user),
+    symbol: Optional[str] = Query(None, description="Exact symbol, e.g. RELIANCE"),
+    action: Optional[Literal["BUY", "SELL"]] = Query(None),
+    sector: Optional[str] = Query(None, description="Sector name, e.g. Banking"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    since: Optional[int] = Query(None, ge=0, description="Only signals changed after this version"),
+    watchlist: bool = Query(True, description="Only the user's watchlist symbols, if the watchlist is not empty"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None)
+):
     """
     Get trading signals based on user's subscription status
     
@@ -17,15 +51,152 @@ async def get_signals(current_user: UserInDB = Depends(get_current_user)):
     - **Free users**: See 3 signals
     - **Paid users**: See all 20 signals
     
-    Signals are cached for 5 minutes for performance
+    Optional filters (symbol, action, sector, price range) and cursor/limit
+    pagination narrow the list; filters only match signals the user's tier
+    can see. Follow `next_cursor` until it is null to read every page.
+    
+    Responses carry an ETag for the snapshot version; sending it back in
+    `If-None-Match` returns `304 Not Modified` while nothing changed. With
+    `?since=<version>` only signals that changed after that version are
+    returned, also combined with filters and pagination (`since` is null in
+    the response if a full list was sent instead).
+    
+    `Accept: application/msgpack` or `application/vnd.signals.columns+json`
+    returns the signals as one array per field (timestamps as epoch seconds)
+    instead of one object per signal.
+    
+    Users with a non-empty watchlist only get signals for its symbols
+    (`watchlist` is true in the response); pass `?watchlist=false` for all.
+    
+    Signals are cached for 5 minutes for performance. A token issued before
+    the user's last upgrade is answered with a replacement in `X-Access-Token`.
+    """
+    record_usage(current_user.id, current_user.is_paid, "signals")
+    
+    try:
+        snapshot, cached = await get_snapshot()
+    except SignalsUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Signals are being generated. Please try again shortly."
+        )
+    
+    symbols = await get_watchlist(current_user.id) if watchlist else None
+    
+    filters = {
+        "symbol": symbol,
+        "action": action,
+        "sector": sector,
+        "min_price": min_price,
+        "max_price": max_price,
+    }
+    is_query = any(value is not None for value in filters.values()) or cursor is not None or limit is not None
+    
+    # A filtered page depends on every query parameter, so they all go into its tag
+    query = {**filters, "cursor": cursor, "limit": limit, "since": since} if is_query else None
+    
+    fmt = negotiate_format(accept)
+    etag = snapshot.etag(current_user.is_paid, fmt, symbols, query)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept", **token_headers(current_user)}
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if is_query:
+        result = query_signals(
+            snapshot,
+            cached,
+            is_paid=current_user.is_paid,
+            cursor=cursor,
+            limit=limit or DEFAULT_PAGE_SIZE,
+            watchlist=symbols,
+            since=since,
+            **filters
+        )
+        return Response(content=encode_view(result, fmt), media_type=MEDIA_TYPES[fmt], headers=headers)
+    
+    # Pre-rendered per snapshot, tier and format, so no model validation or
+    # encoding happens here
+    body = render_signals_body(snapshot, cached, current_user.is_paid, since, fmt, symbols)
+    
+    return Response(content=body, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+@router.get("/stream")
+async def stream_signals(
+    current_user: TokenUser = Depends(get_token_user),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream trading signals as server-sent events
+    
+    Requires valid JWT token in Authorization header
+    
+    Sends the current signals on connect and a `signals` event with the same
+    payload as `GET /signals/` whenever a new snapshot is generated, so
+    dashboards do not need to poll. Each event id is the snapshot version;
+    clients reconnecting with `Last-Event-ID` skip a snapshot they already have.
     """
-    # Get signals based on user's payment status
-    result = await get_signals_for_user(is_paid=current_user.is_paid)
-    
-    return SignalsResponse(
-        signals=result["signals"],
-        total=result["total"],
-        is_paid=result["is_paid"],
-        cached=result["cached"],
-        message=result["message"]
+    record_usage(current_user.id, current_user.is_paid, "signals_stream")
+    
+    try:
+        stream = open_stream(current_user.is_paid, last_event_id)
+    except StreamFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open signal streams. Please try again later."
+        )
+    
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Stop nginx from buffering the stream
+            **token_headers(current_user)
+        }
+    )
+
+
+@router.get("/history", response_model=SignalHistoryResponse)
+async def get_history(
+    response: Response,
+    current_user: TokenUser = Depends(get_token_user),
+    symbol: Optional[str] = Query(None, description="Exact symbol, e.g. RELIANCE"),
+    start: Optional[datetime] = Query(None, description="Inclusive, defaults to one day before end"),
+    end: Optional[datetime] = Query(None, description="Exclusive, defaults to now (UTC)"),
+    limit: int = Query(1000, ge=1, le=HISTORY_MAX_ROWS)
+):
+    """
+    Get previously generated signals for a time range (paid users only)
+    
+    Requires valid JWT token in Authorization header
+    
+    Every generated snapshot is stored, so this returns one row per symbol
+    per snapshot, oldest first. Timestamps without a timezone are UTC.
+    """
+    if not current_user.is_paid:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Subscribe to access signal history"
+        )
+    
+    end = _to_utc_naive(end) if end else datetime.now(timezone.utc).replace(tzinfo=None)
+    start = _to_utc_naive(start) if start else end - HISTORY_DEFAULT_RANGE
+    
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    
+    record_usage(current_user.id, current_user.is_paid, "signals_history")
+    signals = await get_signal_history(start, end, symbol, limit)
+    response.headers.update(token_headers(current_user))
+    
+    return SignalHistoryResponse(
+        signals=signals,
+        total=len(signals),
+        start=start,
+        end=end
     )
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.models.user import UserRecord
+from app.models.watchlist import WATCHLIST_MAX_SYMBOLS, WatchlistResponse, WatchlistUpdate
+from app.services.signal_service import UNIVERSE
+from app.services.watchlist_service import (
+    WatchlistFull,
+    add_symbol,
+    get_watchlist,
+    remove_symbol,
+    set_watchlist
+)
+from app.dependencies import get_current_user
+
+router = APIRouter()
+
+KNOWN_SYMBOLS = frozenset(symbol.upper() for symbol in UNIVERSE.symbols)
+
+
+def _check_symbols(symbols) -> None:
+    unknown = sorted({symbol.upper() for symbol in symbols} - KNOWN_SYMBOLS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown symbols: {', '.join(unknown)}"
+        )
+
+
+def _response(symbols) -> WatchlistResponse:
+    return WatchlistResponse(symbols=sorted(symbols), total=len(symbols))
+
+
+@router.get("/", response_model=WatchlistResponse)
+async def read_watchlist(current_user: UserRecord = Depends(get_current_user)):
+    """
+    Get the current user's watchlist
+    
+    While it is not empty, `GET /signals/` only returns signals for these symbols
+    """
+    return _response(await get_watchlist(current_user.id))
+
+
+@router.put("/", response_model=WatchlistResponse)
+async def replace_watchlist(data: WatchlistUpdate, current_user: UserRecord = Depends(get_current_user)):
+    """Replace the current user's watchlist (an empty list clears it)"""
+    _check_symbols(data.symbols)
+    return _response(await set_watchlist(current_user.id, data.symbols))
+
+
+@router.post("/{symbol}", response_model=WatchlistResponse)
+async def add_to_watchlist(symbol: str, current_user: UserRecord = Depends(get_current_user)):
+    """Add a symbol to the current user's watchlist"""
+    _check_symbols([symbol])
+    
+    try:
+        symbols = await add_symbol(current_user.id, symbol)
+    except WatchlistFull:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A watchlist can hold at most {WATCHLIST_MAX_SYMBOLS} symbols"
+        )
+    
+    return _response(symbols)
+
+
+@router.delete("/{symbol}", response_model=WatchlistResponse)
+async def remove_from_watchlist(symbol: str, current_user: UserRecord = Depends(get_current_user)):
+    """Remove a symbol from the current user's watchlist"""
+    return _response(await remove_symbol(current_user.id, symbol))
@@ -12,9 +12,15 @@ from .auth_service import (
 
 from .redis_service import (
     check_rate_limit,
+    hit_rate_limit,
+    RateLimitResult,
     get_cached_data,
     set_cached_data,
-    delete_cached_data
+    delete_cached_data,
+    get_many,
+    set_many,
+    delete_many,
+    pipeline
 )
 
 __all__ = [
@@ -30,7 +36,13 @@ __all__ = [
     "update_user_subscription",
     # Redis
     "check_rate_limit",
+    "hit_rate_limit",
+    "RateLimitResult",
     "get_cached_data",
     "set_cached_data",
     "delete_cached_data",
+    "get_many",
+    "set_many",
+    "delete_many",
+    "pipeline",
 ]
\ No newline at end of file
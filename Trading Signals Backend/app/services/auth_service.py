@@ -4,7 +4,11 @@ from passlib.context import CryptContext
 from jose import JWTError, jwt
 from app.config import settings
 from app.database import get_db_connection
-from app.models.user import UserInDB
+from app.models.user import UserInDB, UserRecord
+from app.services.user_cache import cache_user, get_cached_user, invalidate_user
+from app.services.password_pool import run_password_job
+from app.services.token_cache import cache_payload, get_cached_payload, is_revoked, token_digest
+from app.services.token_versions import set_token_versions
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -37,23 +41,51 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_user_token(user: UserRecord) -> str:
+    """Create an access token carrying the user's current claims and token version"""
+    return create_access_token(
+        data={
+            "user_id": user.id,
+            "email": user.email,
+            "is_paid": user.is_paid,
+            "ver": user.token_version
+        }
+    )
+
+
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
-    """Verify and decode JWT token"""
+    """
+    Verify and decode JWT token
+    
+    Payloads of verified tokens are cached until they expire; the returned
+    dict may be shared between requests and must not be modified.
+    """
+    digest = token_digest(token)
+    
+    if is_revoked(digest):
+        return None
+    
+    payload = get_cached_payload(digest)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
+    
+    cache_payload(digest, payload)
+    return payload
 
 async def get_user_by_email(email: str) -> Optional[UserInDB]:
     """Get user from database by email"""
     async with get_db_connection() as conn:
         query = """
-            SELECT id, email, password_hash, is_paid, stripe_customer_id, stripe_subscription_id, created_at, updated_at
+            SELECT id, email, password_hash, is_paid, stripe_customer_id, stripe_subscription_id, created_at, updated_at, token_version, token_min_version
             FROM users
             WHERE email = $1
         """
@@ -68,7 +100,7 @@ async def get_user_by_id(user_id: int) -> Optional[UserInDB]:
     """Get user from database by ID"""
     async with get_db_connection() as conn:
         query = """
-            SELECT id, email, password_hash, is_paid, stripe_customer_id,stripe_subscription_id, created_at, updated_at
+            SELECT id, email, password_hash, is_paid, stripe_customer_id,stripe_subscription_id, created_at, updated_at, token_version, token_min_version
             FROM users
             WHERE id = $1
         """
@@ -79,15 +111,28 @@ async def get_user_by_id(user_id: int) -> Optional[UserInDB]:
         return None
 
 
+async def get_user_by_id_cached(user_id: int) -> Optional[UserRecord]:
+    """Get user by ID (without the password hash) from the user cache, loading it from the database on a miss"""
+    user = await get_cached_user(user_id)
+    if user is not None:
+        return user
+    
+    user = await get_user_by_id(user_id)
+    if user is None:
+        return None
+    
+    return await cache_user(user)
+
+
 async def create_user(email: str, password: str) -> UserInDB:
     """Create new user in database"""
-    password_hash = hash_password(password)
+    password_hash = await run_password_job(hash_password, password)
     
     async with get_db_connection() as conn:
         query = """
             INSERT INTO users (email, password_hash, is_paid)
             VALUES ($1, $2, $3)
-            RETURNING id, email, password_hash, is_paid, stripe_customer_id,stripe_subscription_id, created_at, updated_at
+            RETURNING id, email, password_hash, is_paid, stripe_customer_id,stripe_subscription_id, created_at, updated_at, token_version, token_min_version
         """
         row = await conn.fetchrow(query, email, password_hash, False)
         
@@ -101,7 +146,7 @@ async def authenticate_user(email: str, password: str) -> Optional[UserInDB]:
     if not user:
         return None
     
-    if not verify_password(password, user.password_hash):
+    if not await run_password_job(verify_password, password, user.password_hash):
         return None
     
     return user
@@ -116,12 +161,37 @@ async def update_user_subscription(
     async with get_db_connection() as conn:
         query = """
             UPDATE users
-            SET is_paid = TRUE,stripe_customer_id = $2,stripe_subscription_id = $3,updated_at = CURRENT_TIMESTAMP
+            SET is_paid = TRUE,stripe_customer_id = $2,stripe_subscription_id = $3,updated_at = CURRENT_TIMESTAMP,
+                token_version = token_version + 1
             WHERE id = $1
-            RETURNING id, email, password_hash, is_paid, stripe_customer_id,stripe_subscription_id, created_at, updated_at
+            RETURNING id, email, password_hash, is_paid, stripe_customer_id,stripe_subscription_id, created_at, updated_at, token_version, token_min_version
         """
         row = await conn.fetchrow(query, user_id, stripe_customer_id, stripe_subscription_id)
-        
-        if row:
-            return UserInDB(**dict(row))
-        return None
\ No newline at end of file
+    
+    # Every worker must see the new tier on the user's next request, and
+    # tokens still claiming the free tier must be re-issued
+    await invalidate_user(user_id)
+    
+    if row:
+        await set_token_versions(user_id, row["token_version"], row["token_min_version"])
+        return UserInDB(**dict(row))
+    return None
+
+
+async def revoke_user_tokens(user_id: int) -> None:
+    """Make every token issued to a user so far invalid"""
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            """
+            UPDATE users
+            SET token_version = token_version + 1, token_min_version = token_version + 1
+            WHERE id = $1
+            RETURNING token_version, token_min_version
+            """,
+            user_id
+        )
+    
+    if row:
+        await set_token_versions(user_id, row["token_version"], row["token_min_version"])
+    
+    await invalidate_user(user_id)
\ No newline at end of file
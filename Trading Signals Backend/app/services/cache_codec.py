@@ -0,0 +1,93 @@
+"""
+Codecs for values stored in Redis
+
+Encoded values start with a 3-byte magic header and a 1-byte codec tag, so
+a reader always knows how a value was written. Values without the header
+are plain JSON text from before codecs existed and still decode.
+
+Built-in codecs:
+- json          UTF-8 JSON
+- msgpack       MessagePack, smaller and much faster to decode
+- zlib          zlib-compressed JSON
+- msgpack+zlib  zlib-compressed MessagePack
+"""
+import json
+import zlib
+from typing import Any, Callable, Dict, Tuple
+import msgpack
+
+
+MAGIC = b"\xffSC"  # 0xFF never starts UTF-8 text, so legacy JSON can't collide
+ZLIB_LEVEL = 6
+
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes], Any]
+
+_codecs_by_name: Dict[str, Tuple[bytes, Encoder, Decoder]] = {}
+_codecs_by_tag: Dict[bytes, Tuple[str, Decoder]] = {}
+
+
+class CodecError(ValueError):
+    """Raised for an unknown codec name or tag"""
+
+
+def register_codec(name: str, tag: bytes, encode: Encoder, decode: Decoder) -> None:
+    """Add a codec; the one-byte tag is stored with every value it encodes"""
+    if len(tag) != 1:
+        raise CodecError("codec tag must be a single byte")
+    if tag in _codecs_by_tag and _codecs_by_tag[tag][0] != name:
+        raise CodecError(f"codec tag {tag!r} is already used by {_codecs_by_tag[tag][0]}")
+
+    _codecs_by_name[name] = (tag, encode, decode)
+    _codecs_by_tag[tag] = (name, decode)
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _msgpack_encode(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_decode(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+register_codec("json", b"j", _json_encode, json.loads)
+register_codec("msgpack", b"m", _msgpack_encode, _msgpack_decode)
+register_codec(
+    "zlib", b"z",
+    lambda value: zlib.compress(_json_encode(value), ZLIB_LEVEL),
+    lambda data: json.loads(zlib.decompress(data))
+)
+register_codec(
+    "msgpack+zlib", b"Z",
+    lambda value: zlib.compress(_msgpack_encode(value), ZLIB_LEVEL),
+    lambda data: _msgpack_decode(zlib.decompress(data))
+)
+
+
+def encode_value(value: Any, codec: str = "msgpack+zlib") -> bytes:
+    """Encode a value with the named codec, header included"""
+    try:
+        tag, encode, _ = _codecs_by_name[codec]
+    except KeyError:
+        raise CodecError(f"unknown codec: {codec}")
+    return MAGIC + tag + encode(value)
+
+
+def decode_value(data: bytes | str) -> Any:
+    """Decode a value written by encode_value, or legacy plain JSON"""
+    if isinstance(data, str):
+        return json.loads(data)
+
+    if not data.startswith(MAGIC):
+        return json.loads(data)
+
+    tag = data[len(MAGIC):len(MAGIC) + 1]
+    try:
+        _, decode = _codecs_by_tag[tag]
+    except KeyError:
+        raise CodecError(f"unknown codec tag: {tag!r}")
+    return decode(data[len(MAGIC) + 1:])
@@ -0,0 +1,110 @@
+"""
+Process pool for CPU-bound signal computation
+
+Indicator updates are pure NumPy work that holds the GIL, so running them on
+the event loop (or in a thread) stalls every request of the worker. Large
+universes are split into contiguous symbol chunks, one per pool process;
+each chunk's indicator state and ticks are shipped to a process and the
+updated state comes back with its signals. Small universes are computed
+inline, where pickling would cost more than it saves.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.engine.indicators import IndicatorEngine, advance, merge_engine, split_engine, split_rounds
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_workers = 0
+
+pool_stats = {
+    "inline_runs": 0,
+    "pool_runs": 0,
+}
+
+
+def _pool_size() -> int:
+    if settings.SIGNAL_POOL_WORKERS is None:
+        return os.cpu_count() or 1
+    return settings.SIGNAL_POOL_WORKERS
+
+
+async def start_compute_pool(universe_size: int) -> None:
+    """
+    Start the worker processes
+
+    None are started if SIGNAL_POOL_WORKERS is 0 or the universe is below
+    SIGNAL_POOL_MIN_SYMBOLS, since it would always be computed inline.
+    """
+    global _executor, _workers
+
+    _workers = _pool_size()
+    if _workers <= 0:
+        print("Signal computation runs inline (SIGNAL_POOL_WORKERS=0)")
+        return
+
+    if universe_size < settings.SIGNAL_POOL_MIN_SYMBOLS:
+        print(f"Signal computation runs inline ({universe_size} instruments < SIGNAL_POOL_MIN_SYMBOLS)")
+        return
+
+    # spawn: workers start clean instead of forking a process with a running event loop
+    _executor = ProcessPoolExecutor(max_workers=_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    # Start every process now so the first generation doesn't pay for it
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(_executor, os.getpid) for _ in range(_workers)))
+
+    print(f"Signal compute pool started ({_workers} processes)")
+
+
+async def stop_compute_pool() -> None:
+    """Shut the worker processes down"""
+    global _executor
+
+    if _executor is not None:
+        executor, _executor = _executor, None
+        # Waiting for the processes blocks, so keep it off the event loop
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+async def advance_indicators(
+    engine: IndicatorEngine,
+    rounds: List[Tuple[np.ndarray, np.ndarray]]
+) -> Dict[str, np.ndarray]:
+    """
+    Apply drained tick rounds to the engine and compute signal columns
+
+    Runs on the pool when one is running and the universe has at least
+    SIGNAL_POOL_MIN_SYMBOLS instruments, inline otherwise. The engine's state
+    is updated in place either way.
+    """
+    if _executor is None or engine.size < settings.SIGNAL_POOL_MIN_SYMBOLS:
+        pool_stats["inline_runs"] += 1
+        return advance(engine, rounds)[1]
+
+    bounds = np.linspace(0, engine.size, _workers + 1).astype(np.int64)
+    chunk_rounds = split_rounds(rounds, bounds)
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(_executor, advance, split_engine(engine, bounds[i], bounds[i + 1]), chunk_rounds[i])
+        for i in range(_workers)
+    ))
+
+    for start, (chunk, _) in zip(bounds, results):
+        merge_engine(engine, start, chunk)
+
+    pool_stats["pool_runs"] += 1
+    return {
+        name: np.concatenate([columns[name] for _, columns in results])
+        for name in results[0][1]
+    }
+
+
+def get_pool_stats() -> Dict[str, int]:
+    """Get pool size and run counters"""
+    return {"workers": _workers if _executor is not None else 0, **pool_stats}
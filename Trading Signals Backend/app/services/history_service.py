@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+import asyncpg
+from app.database import get_db_connection
+
+
+HISTORY_TABLE = "signal_history"
+HISTORY_COLUMNS = ["version", "symbol", "action", "price", "target", "stoploss", "sector", "generated_at"]
+PARTITION_LOCK_ID = 724_300_002  # pg_advisory_xact_lock key, so workers create partitions one at a time
+
+# Daily partitions this worker has already made sure exist
+_known_partitions: Set[str] = set()
+
+# Pending background writes, kept referenced until done and awaited on shutdown
+_pending_writes: Set[asyncio.Task] = set()
+
+
+def _partition_name(day: datetime) -> str:
+    return f"{HISTORY_TABLE}_{day:%Y%m%d}"
+
+
+async def _ensure_partition(conn: asyncpg.Connection, generated_at: datetime) -> None:
+    """Create the daily partition covering generated_at if it does not exist yet"""
+    day = generated_at.replace(hour=0, minute=0, second=0, microsecond=0)
+    name = _partition_name(day)
+
+    if name in _known_partitions:
+        return
+
+    # IF NOT EXISTS alone is not safe against a concurrent CREATE: the loser
+    # fails on the catalog's unique index instead
+    try:
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", PARTITION_LOCK_ID)
+            await conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {name}
+                PARTITION OF {HISTORY_TABLE}
+                FOR VALUES FROM ('{day:%Y-%m-%d}') TO ('{day + timedelta(days=1):%Y-%m-%d}')
+            """)
+    except (asyncpg.DuplicateTableError, asyncpg.UniqueViolationError):
+        # Created concurrently by something not taking the lock
+        pass
+
+    _known_partitions.add(name)
+
+
+async def store_snapshot(envelope: Dict[str, Any]) -> int:
+    """
+    Append every signal of a snapshot to the history table
+
+    Uses binary COPY, which is far cheaper than row-by-row INSERTs for
+    thousands of instruments.
+
+    Returns:
+        Number of rows written
+    """
+    generated_at = datetime.fromtimestamp(envelope["generated_at"], timezone.utc).replace(tzinfo=None)
+    version = envelope.get("version", 0)
+
+    records = [
+        (
+            version,
+            signal["symbol"],
+            signal["action"],
+            signal["price"],
+            signal["target"],
+            signal["stoploss"],
+            signal.get("sector"),
+            generated_at,
+        )
+        for signal in envelope["signals"]
+    ]
+
+    async with get_db_connection() as conn:
+        await _ensure_partition(conn, generated_at)
+        await conn.copy_records_to_table(HISTORY_TABLE, records=records, columns=HISTORY_COLUMNS)
+
+    return len(records)
+
+
+async def _store_snapshot_logged(envelope: Dict[str, Any]) -> None:
+    try:
+        count = await store_snapshot(envelope)
+        print(f"Signals v{envelope.get('version', 0)} stored in history ({count} rows)")
+    except Exception as e:
+        print(f"Signal history write failed: {e}")
+
+
+def store_snapshot_in_background(envelope: Dict[str, Any]) -> None:
+    """Write a snapshot to history without delaying the caller"""
+    task = asyncio.create_task(_store_snapshot_logged(envelope))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def flush_pending_writes() -> None:
+    """Wait for background history writes to finish (called on shutdown)"""
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes, return_exceptions=True)
+
+
+async def get_signal_history(
+    start: datetime,
+    end: datetime,
+    symbol: Optional[str] = None,
+    limit: int = 1000
+) -> List[Dict[str, Any]]:
+    """
+    Get stored signals generated in [start, end), oldest first
+
+    The range on generated_at lets Postgres prune to the matching daily
+    partitions, and (symbol, generated_at) serves single-symbol lookups.
+    """
+    async with get_db_connection() as conn:
+        if symbol:
+            query = """
+                SELECT version, symbol, action, price, target, stoploss, sector, generated_at
+                FROM signal_history
+                WHERE symbol = $1 AND generated_at >= $2 AND generated_at < $3
+                ORDER BY generated_at
+                LIMIT $4
+            """
+            rows = await conn.fetch(query, symbol.upper(), start, end, limit)
+        else:
+            query = """
+                SELECT version, symbol, action, price, target, stoploss, sector, generated_at
+                FROM signal_history
+                WHERE generated_at >= $1 AND generated_at < $2
+                ORDER BY generated_at, symbol
+                LIMIT $3
+            """
+            rows = await conn.fetch(query, start, end, limit)
+
+    return [dict(row) for row in rows]
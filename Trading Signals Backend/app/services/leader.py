@@ -0,0 +1,68 @@
+"""
+Leader lease shared by the workers
+
+One worker at a time holds the lease in Redis and does the work whose state
+must not be split between workers: signal generation (indicator state) and
+market-data ingestion (tick buffers). The refresher renews the lease every
+few seconds; if the leader dies, the lease expires and another worker's
+refresher takes it over.
+"""
+import time
+import uuid
+from app.redis_client import get_redis
+
+
+LEADER_KEY = "signals:refresher:leader"
+LEADER_TTL_MS = 30000  # Lease expires if the leader dies without releasing it
+LEADER_SAFETY_MS = 2000  # Stop acting as leader this long before the lease could expire
+
+# Unique per worker process so leases are never confused between workers
+WORKER_ID = uuid.uuid4().hex
+
+# Extend the lease only if this worker still owns it
+RENEW_LEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+# Monotonic time until which this worker may act as leader
+_leader_until = 0.0
+
+
+async def acquire_or_renew_leadership() -> bool:
+    """Take the leader lease if it is free, or extend it if we already hold it"""
+    global _leader_until
+
+    redis = get_redis()
+    started = time.monotonic()
+
+    if await redis.set(LEADER_KEY, WORKER_ID, nx=True, px=LEADER_TTL_MS):
+        print(f"Worker {WORKER_ID[:8]} became leader")
+        held = True
+    else:
+        held = bool(await redis.eval(RENEW_LEASE_SCRIPT, 1, LEADER_KEY, WORKER_ID, LEADER_TTL_MS))
+
+    _leader_until = started + (LEADER_TTL_MS - LEADER_SAFETY_MS) / 1000 if held else 0.0
+    return held
+
+
+def is_leader() -> bool:
+    """Whether this worker held the lease at its last renewal and it cannot have expired since"""
+    return time.monotonic() < _leader_until
+
+
+async def release_leadership() -> None:
+    """Give up the lease so another worker can take over at once"""
+    global _leader_until
+
+    _leader_until = 0.0
+    await get_redis().eval(RELEASE_LEASE_SCRIPT, 1, LEADER_KEY, WORKER_ID)
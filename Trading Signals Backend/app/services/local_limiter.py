@@ -0,0 +1,150 @@
+"""
+Per-worker pre-limiter in front of the Redis rate limits
+
+Each worker keeps an approximate token bucket per limiter key. When Redis
+rejects a key, its bucket is set to a deficit that refills to one token
+exactly at Redis's reset time (at max_requests per window). While a bucket
+holds less than one token, requests for that key are rejected by the worker
+without a Redis round trip. Everything else still goes to Redis, which stays
+authoritative for every request it sees; a key Redis allows is never
+rejected locally, even if its Redis counters were reset.
+
+Memory is capped at LOCAL_LIMITER_MAX_KEYS entries, least recently used
+evicted first. Locally rejected requests are added up and synced to Redis
+every LOCAL_LIMITER_SYNC_INTERVAL seconds, so the shared view (the
+SHED_KEY sorted set) still shows who is being throttled. That set is trimmed
+to the SHED_MAX_KEYS most rejected keys on every sync, so an attack spread
+over many identities cannot grow it without bound.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.config import settings
+from app.redis_client import get_redis
+from app.services.redis_service import RateLimitResult
+
+
+SHED_KEY = "rate_limit:shed"  # Sorted set: limiter key -> requests rejected by worker pre-limiters
+SHED_TTL = 3600
+SHED_MAX_KEYS = 1000  # Most rejected keys kept in SHED_KEY
+
+# Entry fields: [tokens, updated at, rejected since the last sync]
+TOKENS, UPDATED, SHED = range(3)
+
+_entries: "OrderedDict[str, List[float]]" = OrderedDict()
+_sync_task: Optional[asyncio.Task] = None
+
+local_limiter_stats = {
+    "local_rejected": 0,
+    "passed_to_redis": 0,
+    "evictions": 0,
+    "synced": 0,
+}
+
+
+def _entry(key: str, max_requests: int, now: float) -> List[float]:
+    entry = _entries.get(key)
+    if entry is None:
+        entry = _entries[key] = [float(max_requests), now, 0]
+        if len(_entries) > settings.LOCAL_LIMITER_MAX_KEYS:
+            _entries.popitem(last=False)
+            local_limiter_stats["evictions"] += 1
+    else:
+        _entries.move_to_end(key)
+    return entry
+
+
+def local_reject(key: str, max_requests: int, window_seconds: int) -> Optional[float]:
+    """
+    Decide locally whether a request is clearly over the limit
+
+    Returns:
+        Seconds to retry after if rejected locally; None if the request must
+        be checked in Redis
+    """
+    now = time.monotonic()
+    entry = _entry(key, max_requests, now)
+
+    entry[TOKENS] = min(max_requests, entry[TOKENS] + (now - entry[UPDATED]) * max_requests / window_seconds)
+    entry[UPDATED] = now
+
+    if entry[TOKENS] >= 1:
+        local_limiter_stats["passed_to_redis"] += 1
+        return None
+
+    entry[SHED] += 1
+    local_limiter_stats["local_rejected"] += 1
+    return (1 - entry[TOKENS]) * window_seconds / max_requests
+
+
+def record_result(key: str, window_seconds: int, result: RateLimitResult) -> None:
+    """Empty a key's local bucket when Redis rejected it"""
+    entry = _entries.get(key)
+    if entry is None or result.allowed:
+        return
+
+    # Refills to one token when Redis will allow the next request
+    entry[TOKENS] = 1 - result.reset_after * result.limit / window_seconds
+    entry[UPDATED] = time.monotonic()
+
+
+async def sync_shed_counts() -> None:
+    """Add locally rejected requests to the shared Redis counts, keeping the top SHED_MAX_KEYS"""
+    pending = {key: entry[SHED] for key, entry in _entries.items() if entry[SHED]}
+    if not pending:
+        return
+
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for key, count in pending.items():
+            pipe.zincrby(SHED_KEY, count, key)
+        pipe.zremrangebyrank(SHED_KEY, 0, -SHED_MAX_KEYS - 1)
+        pipe.expire(SHED_KEY, SHED_TTL)
+        await pipe.execute()
+
+    for key, count in pending.items():
+        if key in _entries:
+            _entries[key][SHED] -= count
+    local_limiter_stats["synced"] += sum(pending.values())
+
+
+async def _sync_loop() -> None:
+    while True:
+        await asyncio.sleep(settings.LOCAL_LIMITER_SYNC_INTERVAL)
+        try:
+            await sync_shed_counts()
+        except Exception as e:
+            print(f"Local rate limiter sync failed: {e}")
+
+
+async def start_local_limiter_sync() -> None:
+    """Start syncing local rejection counts to Redis"""
+    global _sync_task
+
+    if _sync_task is None:
+        _sync_task = asyncio.create_task(_sync_loop())
+
+
+async def stop_local_limiter_sync() -> None:
+    """Stop the sync task and push the remaining counts"""
+    global _sync_task
+
+    if _sync_task is None:
+        return
+
+    _sync_task.cancel()
+    try:
+        await _sync_task
+    except asyncio.CancelledError:
+        pass
+    _sync_task = None
+
+    try:
+        await sync_shed_counts()
+    except Exception as e:
+        print(f"Local rate limiter sync failed: {e}")
+
+
+def get_local_limiter_stats() -> Dict[str, int]:
+    """Get local rejection counters and the number of tracked keys"""
+    return {**local_limiter_stats, "keys": len(_entries)}
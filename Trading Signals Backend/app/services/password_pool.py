@@ -0,0 +1,116 @@
+"""
+Bounded thread pool for password hashing
+
+bcrypt takes ~200 ms of CPU per call. Run on the event loop, every signup or
+login would stall all other requests of the worker for that long. bcrypt
+releases the GIL while hashing, so a few threads hash in parallel without
+blocking the loop. At most PASSWORD_HASH_QUEUE_LIMIT jobs may be queued or
+running; beyond that requests are shed with 503 instead of queueing for
+seconds.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException, status
+from app.config import settings
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending = 0  # Jobs queued or running
+
+hash_stats = {
+    "completed": 0,
+    "rejected": 0,
+    "queue_wait_ms_total": 0.0,
+    "queue_wait_ms_max": 0.0,
+    "hash_ms_total": 0.0,
+    "hash_ms_max": 0.0,
+}
+
+
+async def start_password_pool() -> None:
+    """Start the hashing threads"""
+    global _executor
+
+    _executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    print(f"Password hashing pool started ({settings.PASSWORD_HASH_WORKERS} threads)")
+
+
+async def stop_password_pool() -> None:
+    """Finish running jobs and stop the hashing threads"""
+    global _executor
+
+    if _executor is not None:
+        executor, _executor = _executor, None
+        # Waiting for running hashes blocks, so keep it off the event loop
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+def _release() -> None:
+    global _pending
+    _pending -= 1
+
+
+def _record(waited: float, took: float) -> None:
+    hash_stats["completed"] += 1
+    hash_stats["queue_wait_ms_total"] += waited * 1000
+    hash_stats["queue_wait_ms_max"] = max(hash_stats["queue_wait_ms_max"], waited * 1000)
+    hash_stats["hash_ms_total"] += took * 1000
+    hash_stats["hash_ms_max"] = max(hash_stats["hash_ms_max"], took * 1000)
+
+
+async def run_password_job(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a hashing function on the pool
+
+    Runs inline when the pool is not started (scripts and tests).
+
+    Raises:
+        HTTPException: 503 when PASSWORD_HASH_QUEUE_LIMIT jobs are already pending
+    """
+    global _pending
+
+    if _executor is None:
+        return func(*args)
+
+    if _pending >= settings.PASSWORD_HASH_QUEUE_LIMIT:
+        hash_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests right now, please try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        result = func(*args)
+        return result, started - submitted, time.perf_counter() - started
+
+    # Released when the job finishes, not when the caller stops waiting,
+    # so abandoned requests still count against the limit while they run
+    loop = asyncio.get_running_loop()
+    _pending += 1
+    future = _executor.submit(timed)
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(_release))
+
+    result, waited, took = await asyncio.wrap_future(future)
+    _record(waited, took)
+    return result
+
+
+def get_password_pool_stats() -> Dict[str, Any]:
+    """Get pool size, queue depth and timing metrics"""
+    completed = hash_stats["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS if _executor is not None else 0,
+        "pending": _pending,
+        "completed": completed,
+        "rejected": hash_stats["rejected"],
+        "queue_wait_ms_avg": round(hash_stats["queue_wait_ms_total"] / completed, 1) if completed else 0.0,
+        "queue_wait_ms_max": round(hash_stats["queue_wait_ms_max"], 1),
+        "hash_ms_avg": round(hash_stats["hash_ms_total"] / completed, 1) if completed else 0.0,
+        "hash_ms_max": round(hash_stats["hash_ms_max"], 1),
+    }
@@ -0,0 +1,111 @@
+"""
+Redis pub/sub listener shared by everything in a worker
+
+Each worker keeps a single subscription connection and dispatches messages
+to the handlers registered for each channel, so adding a consumer never
+costs another Redis connection. Messages published while the connection
+is down are lost, so consumers that need them can register a resync hook
+that runs after every (re)subscribe.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.redis_client import get_redis_bytes
+
+
+RECONNECT_DELAY = 1  # Seconds to wait before resubscribing after an error
+
+MessageHandler = Callable[[bytes], Awaitable[None]]
+SubscribeHook = Callable[[], Awaitable[None]]
+
+_handlers: Dict[str, List[MessageHandler]] = {}
+_subscribe_hooks: List[SubscribeHook] = []
+_listener_task: Optional[asyncio.Task] = None
+_listening = False
+
+# Bumped on every (re)subscribe. Consumers caching data that is kept valid by
+# messages compare against it to detect that messages may have been missed.
+subscription_generation = 0
+
+
+def subscribe(channel: str, handler: MessageHandler) -> None:
+    """Register a handler for a channel (call before the listener starts)"""
+    _handlers.setdefault(channel, []).append(handler)
+
+
+def on_subscribed(hook: SubscribeHook) -> None:
+    """Register a hook to run after every (re)subscribe, to reload state messages may have missed"""
+    _subscribe_hooks.append(hook)
+
+
+def is_listening() -> bool:
+    """Whether the subscription is currently connected"""
+    return _listening
+
+
+async def publish(channel: str, message: bytes | str) -> int:
+    """Publish a message to a channel and return the number of receivers"""
+    redis = get_redis_bytes()
+    return await redis.publish(channel, message)
+
+
+async def _dispatch(channel: str, data: bytes) -> None:
+    for handler in _handlers.get(channel, []):
+        try:
+            await handler(data)
+        except Exception as e:
+            print(f"Pub/sub handler error on {channel}: {e}")
+
+
+async def _listen() -> None:
+    global _listening, subscription_generation
+
+    while True:
+        # Raw bytes, so handlers can receive binary-encoded payloads
+        pubsub = get_redis_bytes().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(*_handlers.keys())
+            subscription_generation += 1
+            _listening = True
+
+            # A failing hook drops the connection, so it is retried on resubscribe
+            for hook in _subscribe_hooks:
+                await hook()
+
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    await _dispatch(message["channel"].decode(), message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Pub/sub connection lost: {e}")
+        finally:
+            _listening = False
+            await pubsub.close()
+
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+async def start_pubsub_listener() -> None:
+    """Start this worker's pub/sub listener"""
+    global _listener_task
+
+    if _listener_task is None and _handlers:
+        _listener_task = asyncio.create_task(_listen())
+        print(f"Pub/sub listener started (channels: {', '.join(_handlers)})")
+
+
+async def stop_pubsub_listener() -> None:
+    """Stop this worker's pub/sub listener"""
+    global _listener_task
+
+    if _listener_task is None:
+        return
+
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
+
+    print("Pub/sub listener stopped")
@@ -1,26 +1,277 @@
-from typing import Optional
+import asyncio
+import hashlib
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+from redis.asyncio.client import Pipeline
+from redis.exceptions import NoScriptError
+from app.config import settings
 from app.redis_client import get_redis
 
-async def check_rate_limit(key: str, max_requests: int, window_seconds: int) -> bool:
+
+MAX_BATCH_COMMANDS = 512  # A micro-batch this large is sent without waiting for the end of the tick
+
+
+# Rate limiter scripts. Each checks and records one request atomically in a
+# single round trip, using the Redis clock so every worker agrees on time.
+# KEYS[1] = limiter key, ARGV[1] = max requests, ARGV[2] = window (ms).
+# Each returns {allowed (0/1), remaining, ms until the next request is allowed
+# (rejected) or until the quota is fully restored (allowed)}.
+# A key belongs to one algorithm; the data types differ.
+
+_NOW_MS = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+"""
+
+FIXED_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local count = tonumber(redis.call("GET", KEYS[1]) or "0")
+if count >= limit then
+    return {0, 0, redis.call("PTTL", KEYS[1])}
+end
+count = redis.call("INCR", KEYS[1])
+if count == 1 then
+    redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return {1, limit - count, redis.call("PTTL", KEYS[1])}
+"""
+
+# Exact: one sorted-set member per request in the window
+SLIDING_LOG_SCRIPT = _NOW_MS + """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - window)
+local count = redis.call("ZCARD", KEYS[1])
+if count >= limit then
+    local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+    return {0, 0, tonumber(oldest[2]) + window - now}
+end
+redis.call("ZADD", KEYS[1], now, ARGV[3])
+redis.call("PEXPIRE", KEYS[1], window)
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+return {1, limit - count - 1, tonumber(oldest[2]) + window - now}
+"""
+
+# Approximate: previous window's count weighted by how much of it still
+# overlaps the sliding window, plus the current window's count. Two hash
+# fields per key regardless of the limit.
+SLIDING_WINDOW_SCRIPT = _NOW_MS + """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local current = now - now % window
+local previous = current - window
+local counts = redis.call("HMGET", KEYS[1], current, previous)
+local cur = tonumber(counts[1] or "0")
+local prev = tonumber(counts[2] or "0")
+local elapsed = now - current
+local estimate = prev * (window - elapsed) / window + cur
+if estimate + 1 > limit then
+    local wait = window - elapsed
+    if cur + 1 <= limit and prev > 0 then
+        -- Until the previous window's share has decayed enough for one more
+        wait = math.max(1, math.ceil(window * (1 - (limit - cur - 1) / prev)) - elapsed)
+    end
+    return {0, 0, wait}
+end
+redis.call("HINCRBY", KEYS[1], current, 1)
+redis.call("HDEL", KEYS[1], previous - window)
+redis.call("PEXPIRE", KEYS[1], 2 * window)
+return {1, math.floor(limit - estimate - 1), 2 * window - elapsed}
+"""
+
+# Bursts of up to max requests, refilled at max / window per ms
+TOKEN_BUCKET_SCRIPT = _NOW_MS + """
+local capacity = tonumber(ARGV[1])
+local rate = capacity / tonumber(ARGV[2])
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1] or capacity)
+local ts = tonumber(state[2] or now)
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", now)
+redis.call("PEXPIRE", KEYS[1], ARGV[2])
+if allowed == 0 then
+    return {0, 0, math.ceil((1 - tokens) / rate)}
+end
+return {1, math.floor(tokens), math.ceil((capacity - tokens) / rate)}
+"""
+
+RATE_LIMIT_SCRIPTS = {
+    "fixed_window": FIXED_WINDOW_SCRIPT,
+    "sliding_log": SLIDING_LOG_SCRIPT,
+    "sliding_window": SLIDING_WINDOW_SCRIPT,
+    "token_bucket": TOKEN_BUCKET_SCRIPT,
+}
+_SCRIPT_SHAS = {
+    name: hashlib.sha1(script.encode()).hexdigest()
+    for name, script in RATE_LIMIT_SCRIPTS.items()
+}
+
+
+# Micro-batching: commands issued through _command() during one event-loop
+# tick are queued here and sent as one pipeline once the tick's other ready
+# callbacks have run. Each caller awaits its own future, so a failed command
+# only fails its caller.
+_batch: List[Tuple[str, tuple, dict, asyncio.Future]] = []
+_batch_handle: Optional[asyncio.Handle] = None
+_batch_tasks = set()
+
+batch_stats = {
+    "batches": 0,
+    "commands": 0,
+    "max_batch": 0,
+}
+
+
+async def _execute_batch(commands: List[Tuple[str, tuple, dict, asyncio.Future]]) -> None:
     redis = get_redis()
+    try:
+        if len(commands) == 1:
+            name, args, kwargs, _ = commands[0]
+            results = [await getattr(redis, name)(*args, **kwargs)]
+        else:
+            async with redis.pipeline(transaction=False) as pipe:
+                for name, args, kwargs, _ in commands:
+                    getattr(pipe, name)(*args, **kwargs)
+                results = await pipe.execute(raise_on_error=False)
+    except Exception as e:
+        # Connection-level failure (or the only command failed): every caller gets it
+        results = [e] * len(commands)
     
-    # Get current count
-    current_count = await redis.get(key)
+    for (_, _, _, future), result in zip(commands, results):
+        if future.done():  # Caller was cancelled
+            continue
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def _flush_batch() -> None:
+    global _batch, _batch_handle
     
-    if current_count is None:
-        # First request - set counter to 1 with expiry
-        await redis.setex(key, window_seconds, 1)
-        return True
+    if _batch_handle is not None:
+        _batch_handle.cancel()
+        _batch_handle = None
     
-    current_count = int(current_count)
+    commands, _batch = _batch, []
+    if not commands:
+        return
     
-    # Check if limit exceeded
-    if current_count >= max_requests:
-        return False
+    batch_stats["batches"] += 1
+    batch_stats["commands"] += len(commands)
+    batch_stats["max_batch"] = max(batch_stats["max_batch"], len(commands))
     
-    # Increment counter
-    await redis.incr(key)
-    return True
+    task = asyncio.create_task(_execute_batch(commands))
+    _batch_tasks.add(task)
+    task.add_done_callback(_batch_tasks.discard)
+
+
+async def execute_batched(command: str, *args, **kwargs) -> Any:
+    """
+    Run a client command (e.g. "get", "evalsha") as part of this tick's micro-batch
+    
+    Concurrent callers pay one round trip between them instead of one each.
+    """
+    global _batch_handle
+    
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _batch.append((command, args, kwargs, future))
+    
+    if len(_batch) >= MAX_BATCH_COMMANDS:
+        _flush_batch()
+    elif _batch_handle is None:
+        _batch_handle = loop.call_soon(_flush_batch)
+    
+    return await future
+
+
+async def _command(command: str, *args, **kwargs) -> Any:
+    """Run a command on the string client, micro-batched if REDIS_MICRO_BATCHING is on"""
+    if settings.REDIS_MICRO_BATCHING:
+        return await execute_batched(command, *args, **kwargs)
+    return await getattr(get_redis(), command)(*args, **kwargs)
+
+
+def get_batch_stats() -> Dict[str, Any]:
+    """Get micro-batch counters and the average commands per round trip"""
+    batches = batch_stats["batches"]
+    return {
+        **batch_stats,
+        "enabled": settings.REDIS_MICRO_BATCHING,
+        "avg_batch": round(batch_stats["commands"] / batches, 2) if batches else 0,
+    }
+
+
+@asynccontextmanager
+async def pipeline(transaction: bool = False) -> AsyncIterator[Pipeline]:
+    """
+    Queue commands on a pipeline and send them in one round trip
+    
+    Call `await pipe.execute()` inside the block for the replies; commands
+    still queued when the block exits normally are sent then (for writes
+    whose replies are not needed). transaction=True wraps them in MULTI/EXEC.
+    
+    Usage:
+        async with pipeline() as pipe:
+            pipe.get("a")
+            pipe.incr("b")
+            a, b = await pipe.execute()
+    """
+    async with get_redis().pipeline(transaction=transaction) as pipe:
+        yield pipe
+        if len(pipe):
+            await pipe.execute()
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the next request is allowed, or until the quota is full again
+
+
+async def hit_rate_limit(
+    key: str,
+    max_requests: int,
+    window_seconds: int,
+    algorithm: str = "fixed_window"
+) -> RateLimitResult:
+    """
+    Count one request against a limit and report the remaining quota
+    
+    Args:
+        key: Limiter key (one algorithm per key)
+        max_requests: Requests allowed per window (bucket size for token_bucket)
+        window_seconds: Window length (time to refill a whole bucket for token_bucket)
+        algorithm: fixed_window, sliding_log, sliding_window or token_bucket
+    """
+    if algorithm not in RATE_LIMIT_SCRIPTS:
+        raise ValueError(f"Invalid rate limit algorithm: {algorithm}")
+    
+    args = [max_requests, window_seconds * 1000]
+    if algorithm == "sliding_log":
+        args.append(os.urandom(8).hex())  # Unique log entry per request
+    
+    try:
+        allowed, remaining, reset_ms = await _command("evalsha", _SCRIPT_SHAS[algorithm], 1, key, *args)
+    except NoScriptError:
+        # First use since Redis started; EVAL also caches the script for EVALSHA
+        allowed, remaining, reset_ms = await _command("eval", RATE_LIMIT_SCRIPTS[algorithm], 1, key, *args)
+    
+    return RateLimitResult(bool(allowed), max_requests, max(0, remaining), max(0, reset_ms) / 1000)
+
+
+async def check_rate_limit(key: str, max_requests: int, window_seconds: int) -> bool:
+    """Fixed-window check: whether this request is within the limit"""
+    result = await hit_rate_limit(key, max_requests, window_seconds)
+    return result.allowed
 
 
 async def get_rate_limit_ttl(key: str) -> int:
@@ -30,17 +281,47 @@ async def get_rate_limit_ttl(key: str) -> int:
 
 
 async def get_cached_data(key: str) -> Optional[str]:
-    redis = get_redis()
-    return await redis.get(key)
+    return await _command("get", key)
 
 
 async def set_cached_data(key: str, value: str, expire_seconds: int) -> bool:
-    redis = get_redis()
-    await redis.setex(key, expire_seconds, value)
+    await _command("setex", key, expire_seconds, value)
     return True
 
 
 async def delete_cached_data(key: str) -> bool:
-    redis = get_redis()
-    result = await redis.delete(key)
-    return result > 0
\ No newline at end of file
+    result = await _command("delete", key)
+    return result > 0
+
+
+async def get_many(keys: Sequence[str]) -> List[Optional[str]]:
+    """Get several keys in one MGET; values line up with keys (None if missing)"""
+    if not keys:
+        return []
+    return await _command("mget", list(keys))
+
+
+async def set_many(items: Mapping[str, str], expire_seconds: Union[int, Mapping[str, int]]) -> bool:
+    """
+    Set several keys with TTLs in one round trip
+    
+    Args:
+        items: Key -> value
+        expire_seconds: One TTL for every key, or key -> TTL
+    """
+    if not items:
+        return True
+    
+    async with pipeline() as pipe:
+        for key, value in items.items():
+            ttl = expire_seconds if isinstance(expire_seconds, int) else expire_seconds[key]
+            pipe.set(key, value, ex=ttl)
+        await pipe.execute()
+    return True
+
+
+async def delete_many(keys: Sequence[str]) -> int:
+    """Delete several keys in one DEL; returns how many existed"""
+    if not keys:
+        return 0
+    return await _command("delete", *keys)
@@ -0,0 +1,81 @@
+"""
+Refresh-ahead scheduler that keeps the signals cache warm
+
+Every worker runs the loop, but only the worker holding the leader lease
+(see leader.py) regenerates signals. The leader refreshes shortly before the
+soft TTL runs out, so requests keep hitting a fresh copy and never pay for
+generation.
+"""
+import asyncio
+from typing import Optional
+from app.services.leader import acquire_or_renew_leadership, release_leadership
+from app.services.tick_ingestion import sync_tick_ingestion
+from app.services.signal_service import (
+    get_cached_envelope,
+    is_fresh,
+    load_signals_single_flight,
+)
+
+
+REFRESH_INTERVAL = 5  # Seconds between scheduler ticks
+REFRESH_AHEAD = 60  # Refresh this many seconds before the soft TTL runs out
+
+_refresher_task: Optional[asyncio.Task] = None
+
+
+async def _refresh_if_due() -> None:
+    """Regenerate signals when the cached copy is missing or about to go stale"""
+    envelope = await get_cached_envelope()
+
+    if envelope and is_fresh(envelope, REFRESH_AHEAD):
+        return
+
+    # Goes through the single-flight path, so a concurrent request-driven
+    # generation in this worker or another one is joined rather than repeated
+    await load_signals_single_flight(REFRESH_AHEAD)
+
+
+async def _run_refresher() -> None:
+    while True:
+        try:
+            leader = await acquire_or_renew_leadership()
+            await sync_tick_ingestion(leader)
+            if leader:
+                await _refresh_if_due()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Signal refresher error: {e}")
+
+        await asyncio.sleep(REFRESH_INTERVAL)
+
+
+async def start_signal_refresher() -> None:
+    """Start the background refresher for this worker"""
+    global _refresher_task
+
+    if _refresher_task is None:
+        _refresher_task = asyncio.create_task(_run_refresher())
+        print(f"Signal refresher started (refresh ahead: {REFRESH_AHEAD}s)")
+
+
+async def stop_signal_refresher() -> None:
+    """Stop the refresher and hand the leader lease to another worker"""
+    global _refresher_task
+
+    if _refresher_task is None:
+        return
+
+    _refresher_task.cancel()
+    try:
+        await _refresher_task
+    except asyncio.CancelledError:
+        pass
+    _refresher_task = None
+
+    try:
+        await release_leadership()
+    except Exception as e:
+        print(f"Signal refresher lease release warning: {e}")
+
+    print("Signal refresher stopped")
@@ -1,142 +1,589 @@
 import asyncio
-import json
-import random
+import time
+import uuid
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any
-from app.redis_client import get_redis
+from typing import List, Dict, Any, Callable, Deque, FrozenSet, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.redis_client import get_redis, get_redis_bytes
 from app.models.signal import Signal
+from app.services import pubsub_service
+from app.services.cache_codec import decode_value, encode_value
+from app.services.history_service import store_snapshot_in_background
+from app.services.compute_pool import advance_indicators
+from app.services.leader import is_leader
+from app.engine.signal_engine import Universe, columns_to_records, random_walk_ticks
+from app.engine.indicators import IndicatorEngine
+from app.engine.tick_store import TickStore
+from app.services.signal_snapshot import FORMAT_JSON, SignalSnapshot, diff_signals
 
 
 # Cache configuration
 CACHE_KEY = "signals:all"
-CACHE_TTL = 300  # 5 minutes
+CACHE_TTL = 300  # Soft TTL: 5 minutes of freshness before a refresh is due
+CACHE_HARD_TTL = 900  # Hard TTL: stale copy may be served until the key expires
+
+# L1 invalidation: every stored snapshot gets the next version and is published
+VERSION_KEY = "signals:version"
+UPDATES_CHANNEL = "signals:updates"
+
+# Single-flight configuration (one generation per expiry across all workers)
+LOCK_KEY = "signals:lock"
+LOCK_TTL_MS = 10000  # Must comfortably exceed generation time
+LOCK_POLL_INTERVAL = 0.05  # Seconds between version checks while another worker generates
+GENERATION_WAIT_TIMEOUT = 3 * LOCK_TTL_MS / 1000  # Give up waiting for a generation after this long
+
+# Compare-and-delete so a worker never releases a lock it no longer owns
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+
+class SignalsUnavailable(Exception):
+    """Raised when no snapshot exists and none was generated within GENERATION_WAIT_TIMEOUT"""
+
+
+# In-flight generation for this worker, shared by every concurrent caller
+_inflight: Optional[asyncio.Task] = None
+
+# Per-worker L1 cache of the newest decoded snapshot, and the pub/sub
+# subscription generation that has kept it up to date since it was installed
+_l1_snapshot: Optional[SignalSnapshot] = None
+_l1_generation = -1
+
+# Called with each snapshot that becomes this worker's L1 copy
+_snapshot_listeners: List[Callable[[SignalSnapshot], None]] = []
+
+# Changed symbols between consecutive L1 snapshots: (from version, to version, symbols).
+# Computed once per snapshot when it is installed; ?since= queries combine them.
+DIFF_HISTORY = 16
+_diff_history: Deque[Tuple[int, int, FrozenSet[str]]] = deque(maxlen=DIFF_HISTORY)
+
+# Cache counters exposed through /health
+cache_stats = {
+    "l1_hits": 0,
+    "hits": 0,
+    "misses": 0,
+    "generations": 0,
+    "coalesced_local": 0,   # Waiters that joined this worker's in-flight generation
+    "coalesced_remote": 0,  # Waiters served by another worker's generation
+    "stale_served": 0,      # Requests answered from a stale copy during refresh
+}
 
 
 # Mock instruments
 INSTRUMENTS = [
-    {"symbol": "NIFTY", "base_price": 21500},
-    {"symbol": "BANKNIFTY", "base_price": 45200},
-    {"symbol": "RELIANCE", "base_price": 2450},
-    {"symbol": "TCS", "base_price": 3650},
-    {"symbol": "INFY", "base_price": 1550},
-    {"symbol": "HDFCBANK", "base_price": 1650},
-    {"symbol": "ICICIBANK", "base_price": 950},
-    {"symbol": "SBIN", "base_price": 580},
-    {"symbol": "WIPRO", "base_price": 450},
-    {"symbol": "TATAMOTORS", "base_price": 780},
-    {"symbol": "LT", "base_price": 3200},
-    {"symbol": "BAJFINANCE", "base_price": 6800},
-    {"symbol": "MARUTI", "base_price": 11500},
-    {"symbol": "KOTAKBANK", "base_price": 1750},
-    {"symbol": "ITC", "base_price": 420},
-    {"symbol": "BHARTIARTL", "base_price": 1250},
-    {"symbol": "AXISBANK", "base_price": 1050},
-    {"symbol": "SUNPHARMA", "base_price": 1480},
-    {"symbol": "HINDUNILVR", "base_price": 2350},
-    {"symbol": "ASIANPAINT", "base_price": 2900},
+    {"symbol": "NIFTY", "base_price": 21500, "sector": "Index"},
+    {"symbol": "BANKNIFTY", "base_price": 45200, "sector": "Index"},
+    {"symbol": "RELIANCE", "base_price": 2450, "sector": "Energy"},
+    {"symbol": "TCS", "base_price": 3650, "sector": "IT"},
+    {"symbol": "INFY", "base_price": 1550, "sector": "IT"},
+    {"symbol": "HDFCBANK", "base_price": 1650, "sector": "Banking"},
+    {"symbol": "ICICIBANK", "base_price": 950, "sector": "Banking"},
+    {"symbol": "SBIN", "base_price": 580, "sector": "Banking"},
+    {"symbol": "WIPRO", "base_price": 450, "sector": "IT"},
+    {"symbol": "TATAMOTORS", "base_price": 780, "sector": "Automobile"},
+    {"symbol": "LT", "base_price": 3200, "sector": "Infrastructure"},
+    {"symbol": "BAJFINANCE", "base_price": 6800, "sector": "Financial Services"},
+    {"symbol": "MARUTI", "base_price": 11500, "sector": "Automobile"},
+    {"symbol": "KOTAKBANK", "base_price": 1750, "sector": "Banking"},
+    {"symbol": "ITC", "base_price": 420, "sector": "FMCG"},
+    {"symbol": "BHARTIARTL", "base_price": 1250, "sector": "Telecom"},
+    {"symbol": "AXISBANK", "base_price": 1050, "sector": "Banking"},
+    {"symbol": "SUNPHARMA", "base_price": 1480, "sector": "Pharma"},
+    {"symbol": "HINDUNILVR", "base_price": 2350, "sector": "FMCG"},
+    {"symbol": "ASIANPAINT", "base_price": 2900, "sector": "Consumer Goods"},
 ]
 
-async def generate_mock_signals() -> List[Dict[str, Any]]:
+def _load_universe() -> Universe:
+    """Load the instrument universe from INSTRUMENTS_FILE, or the built-in list"""
+    if settings.INSTRUMENTS_FILE:
+        universe = Universe.from_csv(settings.INSTRUMENTS_FILE)
+        print(f"Loaded {len(universe)} instruments from {settings.INSTRUMENTS_FILE}")
+        return universe
+    
+    return Universe.from_instruments(INSTRUMENTS)
+
+
+UNIVERSE = _load_universe()
+
+# Latest ticks per instrument, filled by tick_ingestion (or simulated below).
+# Prices start at base_price until an instrument's first tick arrives.
+TICK_STORE = TickStore(UNIVERSE.symbols, settings.TICK_BUFFER_CAPACITY, UNIVERSE.base_prices)
+
+# Indicator state for every instrument and how many of each instrument's
+# ticks it has consumed. Only the leader worker generates (see
+# _generate_or_wait), so consecutive snapshots continue one history; it
+# restarts from the new leader's state only when leadership moves.
+TICKS_PER_GENERATION = 60  # Simulated ticks per run, enough to warm up every indicator
+_indicators = IndicatorEngine(len(UNIVERSE))
+_indicators.update(UNIVERSE.base_prices)  # Instruments without ticks yet still get a signal
+_ticks_consumed = np.zeros(len(UNIVERSE), dtype=np.int64)
+
+
+def _simulate_ticks() -> None:
+    """Random-walk ticks from the last prices, used while no TICK_SOURCE is configured"""
+    now_ms = int(time.time() * 1000)
+    positions = np.arange(len(TICK_STORE))
+    
+    for _ in range(TICKS_PER_GENERATION):
+        TICK_STORE.append_batch(positions, np.full(len(positions), now_ms), random_walk_ticks(TICK_STORE.last_prices))
+
+
+async def compute_signals() -> List[Dict[str, Any]]:
+    """Advance the indicators by the ticks received since the last run and derive a signal per instrument"""
     print("Generating trading signals")
     
-    # Simulate network delay / expensive computation (2 seconds)
-    await asyncio.sleep(2)
+    if not settings.TICK_SOURCE:
+        _simulate_ticks()
+    
+    # Indicator math runs in the compute pool for large universes
+    rounds = list(TICK_STORE.drain(_ticks_consumed))
+    columns = await advance_indicators(_indicators, rounds)
     
-    signals = []
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    for instrument in INSTRUMENTS:
-        symbol = instrument["symbol"]
-        base_price = instrument["base_price"]
-        
-        # Random price variation (±2%)
-        price_variation = random.uniform(-0.02, 0.02)
-        current_price = round(base_price * (1 + price_variation), 2)
-        
-        # Random action (60% BUY, 40% SELL for realism)
-        action = random.choices(["BUY", "SELL"], weights=[0.6, 0.4])[0]
-        
-        # Calculate target and stoploss based on action
-        if action == "BUY":
-            target = round(current_price * 1.03, 2)  # 3% profit target
-            stoploss = round(current_price * 0.98, 2)  # 2% stoploss
-        else:  # SELL
-            target = round(current_price * 0.97, 2)  # 3% profit target
-            stoploss = round(current_price * 1.02, 2)  # 2% stoploss
-        
-        signal = {
-            "symbol": symbol,
-            "action": action,
-            "price": current_price,
-            "target": target,
-            "stoploss": stoploss,
-            "timestamp": timestamp
-        }
-        
-        signals.append(signal)
+    # SMA/MACD crossovers and RSI decide the action, ATR places target and stoploss
+    signals = columns_to_records(UNIVERSE.symbols, columns, timestamp, UNIVERSE.sectors)
     
     print(f"Generated {len(signals)} trading signals")
     return signals
 
 
-async def get_cached_signals() -> List[Dict[str, Any]] | None:
-    """Get signals from Redis cache"""
-    redis = get_redis()
+async def get_cached_envelope() -> Optional[Dict[str, Any]]:
+    """
+    Get the cached signals envelope from Redis
+    
+    The envelope holds the signals with their version, generation time and
+    soft expiry. Values written before envelopes existed (a bare list) are
+    returned as an already-stale envelope so they get refreshed on first read.
+    Plain JSON written before cache codecs existed is still read.
+    """
+    redis = get_redis_bytes()
     
     cached_data = await redis.get(CACHE_KEY)
     
-    if cached_data:
+    if not cached_data:
+        return None
+    
+    envelope = decode_value(cached_data)
+    
+    if isinstance(envelope, list):
+        return {"version": 0, "generated_at": 0, "soft_expires_at": 0, "signals": envelope}
+    
+    return envelope
+
+
+def is_fresh(envelope: Dict[str, Any], margin: float = 0) -> bool:
+    """Check whether an envelope stays within its soft TTL for at least margin seconds"""
+    return time.time() + margin < envelope["soft_expires_at"]
+
+
+async def get_cached_signals() -> List[Dict[str, Any]] | None:
+    """Get signals from Redis cache"""
+    envelope = await get_cached_envelope()
+    
+    if envelope:
         print("Cache HIT - Returning signals from Redis")
-        return json.loads(cached_data)
+        return envelope["signals"]
     
     print("Cache MISS - Need to generate signals")
     return None
 
 
-async def cache_signals(signals: List[Dict[str, Any]]) -> None:
-    """Store signals in Redis cache with TTL"""
+async def cache_signals(signals: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Store signals in Redis cache with soft and hard TTLs
+    
+    The snapshot is stamped with the next value of the version counter and
+    published, so every worker replaces its L1 copy without polling Redis.
+    Stored and published with CACHE_CODEC (compressed by default).
+    """
+    redis = get_redis_bytes()
+    
+    version = await redis.incr(VERSION_KEY)
+    now = time.time()
+    envelope = {
+        "version": version,
+        "generated_at": now,
+        "soft_expires_at": now + CACHE_TTL,
+        "signals": signals
+    }
+    encoded = encode_value(envelope, settings.CACHE_CODEC)
+    
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.setex(CACHE_KEY, CACHE_HARD_TTL, encoded)
+        pipe.publish(UPDATES_CHANNEL, encoded)
+        await pipe.execute()
+    
+    print(f"Signals v{version} cached in Redis ({len(encoded)} bytes {settings.CACHE_CODEC}, soft TTL: {CACHE_TTL}s, hard TTL: {CACHE_HARD_TTL}s)")
+    return envelope
+
+
+def install_snapshot(envelope: Dict[str, Any], generation: Optional[int] = None) -> SignalSnapshot:
+    """
+    Decode an envelope into a snapshot and make it this worker's L1 copy
+    
+    The L1 copy is only replaced by a newer version, so late or duplicate
+    messages never roll it back. An envelope no newer than the L1 copy still
+    confirms that copy is current, so it is trusted again from then on (e.g.
+    after a pub/sub reconnect).
+    
+    Args:
+        envelope: Envelope read from Redis or received through pub/sub
+        generation: Subscription generation from before the envelope was read
+            (defaults to the current one)
+    """
+    global _l1_snapshot, _l1_generation
+    
+    if generation is None:
+        generation = pubsub_service.subscription_generation
+    
+    if _l1_snapshot is not None and envelope.get("version", 0) <= _l1_snapshot.version:
+        _l1_generation = generation
+        return _l1_snapshot
+    
+    snapshot = SignalSnapshot(envelope, CACHE_HARD_TTL)
+    
+    if not snapshot.is_expired():
+        # Build the query indexes now rather than inside the first filtered request
+        snapshot.index
+        
+        if _l1_snapshot is not None:
+            _diff_history.append((
+                _l1_snapshot.version,
+                snapshot.version,
+                diff_signals(_l1_snapshot.signals, snapshot.signals)
+            ))
+        
+        _l1_snapshot = snapshot
+        _l1_generation = generation
+        
+        for listener in _snapshot_listeners:
+            listener(snapshot)
+    
+    return snapshot
+
+
+def add_snapshot_listener(listener: Callable[[SignalSnapshot], None]) -> None:
+    """Register a callback for every new snapshot installed in this worker"""
+    _snapshot_listeners.append(listener)
+
+
+def get_l1_snapshot() -> Optional[SignalSnapshot]:
+    """
+    Get this worker's L1 snapshot if it can be served without asking Redis
+    
+    It is only trusted while the pub/sub subscription that would have
+    delivered newer versions has been connected the whole time.
+    """
+    snapshot = _l1_snapshot
+    
+    if snapshot is None or snapshot.is_expired():
+        return None
+    
+    if not pubsub_service.is_listening() or _l1_generation != pubsub_service.subscription_generation:
+        return None
+    
+    return snapshot
+
+
+async def _on_signals_published(data: bytes) -> None:
+    install_snapshot(decode_value(data))
+
+
+pubsub_service.subscribe(UPDATES_CHANNEL, _on_signals_published)
+
+
+async def _release_lock(token: str) -> None:
+    """Release the generation lock if this worker still holds it"""
     redis = get_redis()
+    await redis.eval(RELEASE_LOCK_SCRIPT, 1, LOCK_KEY, token)
+
+
+async def _generate_or_wait(margin: float = 0) -> Tuple[SignalSnapshot, bool]:
+    """
+    Generate signals while holding the Redis lock, or wait for the worker
+    that holds it to publish a fresh result
+
+    Only the leader generates, so the indicator state of one worker produces
+    every snapshot; other workers wait for its result. While waiting only the
+    version counter is polled; the cached blob is fetched and decoded once it
+    moves past the version seen last. If nothing fresh arrives within
+    GENERATION_WAIT_TIMEOUT (no leader, or its generation keeps failing), a
+    stale copy is served if one exists.
+
+    Args:
+        margin: Seconds of remaining freshness below which the cache is regenerated
+
+    Returns:
+        Tuple of (snapshot, cached) where cached is False only for the generator
+
+    Raises:
+        SignalsUnavailable: Nothing was cached and nothing was generated in time
+    """
+    redis = get_redis()
+    deadline = time.monotonic() + GENERATION_WAIT_TIMEOUT
+    seen_version = None  # Version of the cached envelope checked last
+    
+    while time.monotonic() < deadline:
+        token = uuid.uuid4().hex
+        
+        if is_leader() and await redis.set(LOCK_KEY, token, nx=True, px=LOCK_TTL_MS):
+            try:
+                # Another worker may have refreshed the cache before we got the lock
+                envelope = await get_cached_envelope()
+                if envelope and is_fresh(envelope, margin):
+                    return install_snapshot(envelope), True
+                
+                signals = await compute_signals()
+                envelope = await cache_signals(signals)
+                cache_stats["generations"] += 1
+                
+                # Exactly one worker generates each snapshot, so it alone records it
+                store_snapshot_in_background(envelope)
+                return install_snapshot(envelope), False
+            finally:
+                await _release_lock(token)
+        
+        # Another worker generates - poll until its result lands in the cache.
+        # If the leader dies, another worker's refresher takes over the lease.
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        
+        version = await redis.get(VERSION_KEY)
+        if version is not None and seen_version is not None and int(version) <= seen_version:
+            continue
+        
+        envelope = await get_cached_envelope()
+        if envelope is None:
+            continue
+        
+        # The counter is bumped just before the blob is written, so only
+        # remember versions that actually landed
+        seen_version = envelope.get("version", 0)
+        if is_fresh(envelope, margin):
+            cache_stats["coalesced_remote"] += 1
+            return install_snapshot(envelope), True
+    
+    envelope = await get_cached_envelope()
+    if envelope is None:
+        raise SignalsUnavailable()
+    
+    print(f"No fresh signals within {GENERATION_WAIT_TIMEOUT:.0f}s, serving the cached copy")
+    cache_stats["stale_served"] += 1
+    return install_snapshot(envelope), True
+
+
+def _clear_inflight(task: asyncio.Task) -> None:
+    global _inflight
+    if _inflight is task:
+        _inflight = None
+        
+        # Nobody may be awaiting a background refresh, so surface its failure here
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Signal generation failed: {task.exception()}")
+
+
+def _start_generation(margin: float = 0) -> asyncio.Task:
+    """Get this worker's in-flight generation task, starting one if needed"""
+    global _inflight
+    
+    if _inflight is None:
+        _inflight = asyncio.create_task(_generate_or_wait(margin))
+        _inflight.add_done_callback(_clear_inflight)
+    else:
+        cache_stats["coalesced_local"] += 1
+    
+    return _inflight
+
+
+async def load_signals_single_flight(margin: float = 0) -> Tuple[SignalSnapshot, bool]:
+    """
+    Load signals after a cache miss with stampede protection
+    
+    Concurrent callers in this worker share one in-flight task, and workers
+    coordinate through a Redis lock so only one generation runs per expiry.
+    The task is shielded so a disconnecting client does not cancel it for
+    the other waiters.
+    
+    Args:
+        margin: Regenerate unless the cache stays fresh for this many seconds
+    """
+    return await asyncio.shield(_start_generation(margin))
+
+
+def refresh_signals_in_background() -> None:
+    """Start a single-flight refresh without waiting for it"""
+    if _inflight is None:
+        _start_generation()
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Get a copy of the signal cache counters"""
+    return dict(cache_stats)
+
+
+async def get_snapshot() -> Tuple[SignalSnapshot, bool]:
+    """
+    Get the current signals snapshot, cheapest source first
+    
+    L1 costs no network round trip or parsing, Redis costs one GET and a
+    decode, and only a cold cache waits for generation. A copy past its soft
+    TTL is still served while a background refresh runs.
+    
+    Returns:
+        Tuple of (snapshot, cached)
+    """
+    snapshot = get_l1_snapshot()
+    
+    if snapshot is not None:
+        cache_stats["l1_hits"] += 1
+    else:
+        # Taken before the read, so a version published while the
+        # subscription was reconnecting cannot be missed
+        generation = pubsub_service.subscription_generation
+        envelope = await get_cached_envelope()
+        
+        if envelope is None:
+            # Cold cache - generate once, shared by all concurrent callers
+            cache_stats["misses"] += 1
+            return await load_signals_single_flight()
+        
+        cache_stats["hits"] += 1
+        snapshot = install_snapshot(envelope, generation)
     
-    signals_json = json.dumps(signals)
-    await redis.setex(CACHE_KEY, CACHE_TTL, signals_json)
+    if not snapshot.is_fresh():
+        # Serve the stale copy and let the refresh happen off the request path
+        cache_stats["stale_served"] += 1
+        refresh_signals_in_background()
     
-    print(f"Signals cached in Redis (TTL: {CACHE_TTL} seconds)")
+    return snapshot, True
 
 
-async def get_signals_for_user(is_paid: bool) -> Dict[str, Any]:
+async def get_signals_for_user(is_paid: bool, watchlist: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
     """
     Get trading signals for user (with caching)
     
     Args:
         is_paid: Whether user has paid subscription
+        watchlist: Only include these symbols (None or empty for all)
     
     Returns:
         Dictionary with signals and metadata
     """
-    # Try to get from cache first
-    signals = await get_cached_signals()
-    cached = True
-    
-    # If cache miss, generate new signals
-    if signals is None:
-        signals = await generate_mock_signals()
-        await cache_signals(signals)
-        cached = False
-    
-    # Filter signals based on user type
-    if is_paid:
-        # Paid users see all signals
-        filtered_signals = signals
-        message = None
-    else:
-        # Free users see only first 3 signals
-        filtered_signals = signals[:3]
-        message = f"Subscribe for ₹499 to see all {len(signals)} signals"
-    
-    return {
-        "signals": filtered_signals,
-        "total": len(filtered_signals),
-        "is_paid": is_paid,
-        "cached": cached,
-        "message": message
-    }
\ No newline at end of file
+    snapshot, cached = await get_snapshot()
+    return build_user_view(snapshot, is_paid, cached, watchlist)
+
+
+def build_user_view(
+    snapshot: SignalSnapshot,
+    is_paid: bool,
+    cached: bool,
+    watchlist: Optional[FrozenSet[str]] = None
+) -> Dict[str, Any]:
+    """Build the signals payload a user of the given tier is allowed to see"""
+    return snapshot.user_view(is_paid, cached, watchlist=watchlist)
+
+
+def changed_since(snapshot: SignalSnapshot, since: int) -> Optional[FrozenSet[str]]:
+    """
+    Symbols that changed after version `since` up to the given snapshot
+    
+    Returns None when this worker's diff history does not reach back to
+    `since`, in which case the caller should send the full snapshot.
+    """
+    if since == snapshot.version:
+        return frozenset()
+    
+    changed = set()
+    
+    for from_version, to_version, symbols in reversed(_diff_history):
+        if to_version > snapshot.version:
+            continue
+        if to_version <= since:
+            break
+        
+        changed |= symbols
+        
+        if from_version <= since:
+            return frozenset(changed)
+    
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in {candidate.removeprefix("W/") for candidate in candidates}
+
+
+def render_signals_body(
+    snapshot: SignalSnapshot,
+    cached: bool,
+    is_paid: bool,
+    since: Optional[int] = None,
+    fmt: str = FORMAT_JSON,
+    watchlist: Optional[FrozenSet[str]] = None
+) -> bytes:
+    """
+    Get the pre-rendered signals body for a tier, optionally as a delta
+    
+    There are only a few distinct bodies per snapshot (free/paid, cached or
+    not, per since version and format), so each is encoded once and shared
+    by every request. With `since`, only signals that changed after that version are
+    included; the full snapshot is sent if the delta cannot be computed.
+    Watchlist bodies are shared by every user with the same watchlist.
+    """
+    delta = None
+    
+    if since is not None:
+        changed = changed_since(snapshot, since)
+        if changed is not None:
+            delta = (since, changed)
+    
+    return snapshot.render_body(is_paid, cached, delta, fmt, watchlist)
+
+
+def query_signals(
+    snapshot: SignalSnapshot,
+    cached: bool,
+    is_paid: bool,
+    cursor: Optional[int] = None,
+    limit: int = 100,
+    watchlist: Optional[FrozenSet[str]] = None,
+    since: Optional[int] = None,
+    **filters
+) -> Dict[str, Any]:
+    """
+    Get a filtered page of trading signals for user
+    
+    Args:
+        snapshot: Snapshot from get_snapshot()
+        cached: Whether the snapshot came from cache
+        is_paid: Whether user has paid subscription
+        cursor: next_cursor from the previous page
+        limit: Maximum signals per page
+        watchlist: Only match these symbols (None or empty for all)
+        since: Only match signals changed after this version; ignored (and
+            `since` is None in the result) if the delta cannot be computed
+        **filters: symbol, action, sector, min_price, max_price
+    
+    Returns:
+        Dictionary with signals, metadata and next_cursor
+    """
+    delta = None
+    
+    if since is not None:
+        changed = changed_since(snapshot, since)
+        if changed is not None:
+            delta = (since, changed)
+    
+    return snapshot.query_view(is_paid, cached, cursor, limit, watchlist, delta, **filters)
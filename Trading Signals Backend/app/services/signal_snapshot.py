@@ -0,0 +1,295 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import msgpack
+from app.engine.signal_index import SignalIndex
+
+
+# Free users see only the first few signals
+FREE_SIGNAL_LIMIT = 3
+
+# Rendered watchlist bodies kept per snapshot; popular watchlists stay memoized
+WATCHLIST_VIEW_CACHE = 256
+
+# Fields that make a symbol count as changed between snapshots (not timestamp)
+DIFF_FIELDS = ("action", "price", "target", "stoploss")
+
+# Response encodings, negotiated from the Accept header.
+# "columns" and "msgpack" send one array per field instead of one object per
+# signal, with timestamps as epoch seconds.
+FORMAT_JSON = "json"
+FORMAT_COLUMNS = "columns"
+FORMAT_MSGPACK = "msgpack"
+
+MEDIA_TYPES = {
+    FORMAT_JSON: "application/json",
+    FORMAT_COLUMNS: "application/vnd.signals.columns+json",
+    FORMAT_MSGPACK: "application/msgpack",
+}
+
+_ACCEPTED_TYPES = {
+    **{media_type: fmt for fmt, media_type in MEDIA_TYPES.items()},
+    "application/x-msgpack": FORMAT_MSGPACK,
+}
+
+COLUMN_FIELDS = ("symbol", "action", "price", "target", "stoploss", "timestamp", "sector")
+
+
+def diff_signals(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> FrozenSet[str]:
+    """Symbols whose signal is new or differs between two snapshots"""
+    previous = {signal["symbol"]: signal for signal in old}
+
+    return frozenset(
+        signal["symbol"]
+        for signal in new
+        if signal["symbol"] not in previous
+        or any(signal[field] != previous[signal["symbol"]][field] for field in DIFF_FIELDS)
+    )
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """
+    Pick the response format for an Accept header
+
+    Supported types are ranked by q-value, ties by order. Anything else,
+    including a missing header or */*, gets plain JSON.
+    """
+    if not accept:
+        return FORMAT_JSON
+
+    ranked = []
+    for order, part in enumerate(accept.split(",")):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0 and media_type.lower() in _ACCEPTED_TYPES:
+            ranked.append((-quality, order, _ACCEPTED_TYPES[media_type.lower()]))
+
+    return min(ranked)[2] if ranked else FORMAT_JSON
+
+
+def _epoch_seconds(timestamp: str, parsed: Dict[str, int]) -> int:
+    # A snapshot shares one timestamp string, so each is parsed only once
+    if timestamp not in parsed:
+        parsed[timestamp] = int(datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").timestamp())
+    return parsed[timestamp]
+
+
+def to_columns(view: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a signals payload into struct-of-arrays form"""
+    signals = view["signals"]
+    parsed: Dict[str, int] = {}
+
+    columns = {field: [signal.get(field) for signal in signals] for field in COLUMN_FIELDS}
+    columns["timestamp"] = [_epoch_seconds(timestamp, parsed) for timestamp in columns["timestamp"]]
+
+    result = {key: value for key, value in view.items() if key != "signals"}
+    result["columns"] = columns
+    return result
+
+
+def encode_view(view: Dict[str, Any], fmt: str = FORMAT_JSON) -> bytes:
+    """Encode a signals payload in one of the response formats"""
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.packb(to_columns(view), use_bin_type=True)
+
+    if fmt == FORMAT_COLUMNS:
+        view = to_columns(view)
+
+    # Encoded the same way as FastAPI's JSONResponse
+    return json.dumps(view, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def watchlist_tag(watchlist: FrozenSet[str]) -> str:
+    """Short digest identifying a watchlist, the same in every worker"""
+    return hashlib.blake2b(",".join(sorted(watchlist)).encode(), digest_size=6).hexdigest()
+
+
+def query_tag(params: Dict[str, Any]) -> str:
+    """Short digest identifying a query's parameters (None values ignored)"""
+    canonical = "&".join(f"{name}={value}" for name, value in sorted(params.items()) if value is not None)
+    return hashlib.blake2b(canonical.encode(), digest_size=6).hexdigest()
+
+
+class SignalSnapshot:
+    """
+    One decoded generation of signals as held in a worker's L1 cache
+
+    Built once per version from the cached envelope. Anything derived from
+    the signals belongs here and is memoized on first use, so it is computed
+    once per snapshot and shared by every request that reads it.
+    """
+
+    def __init__(self, envelope: Dict[str, Any], hard_ttl: int):
+        self.version: int = envelope.get("version", 0)
+        self.signals: List[Dict[str, Any]] = envelope["signals"]
+        self.generated_at: float = envelope["generated_at"]
+        self.soft_expires_at: float = envelope["soft_expires_at"]
+        self.hard_expires_at: float = self.generated_at + hard_ttl
+        self._bodies: Dict[Tuple[bool, bool, Optional[int], str], bytes] = {}
+        self._index: Optional[SignalIndex] = None
+        self._watchlist_bodies: "OrderedDict[Tuple[FrozenSet[str], bool, bool, Optional[int], str], bytes]" = OrderedDict()
+
+    def is_fresh(self) -> bool:
+        """Within the soft TTL - no refresh needed"""
+        return time.time() < self.soft_expires_at
+
+    def is_expired(self) -> bool:
+        """Past the hard TTL - must not be served"""
+        return time.time() >= self.hard_expires_at
+
+    @property
+    def index(self) -> SignalIndex:
+        """Lookup indexes for filtered queries, built on first use"""
+        if self._index is None:
+            self._index = SignalIndex(self.signals)
+        return self._index
+
+    def _upgrade_message(self, is_paid: bool) -> Optional[str]:
+        if is_paid:
+            return None
+        return f"Subscribe for ₹499 to see all {len(self.signals)} signals"
+
+    def etag(
+        self,
+        is_paid: bool,
+        fmt: str = FORMAT_JSON,
+        watchlist: Optional[FrozenSet[str]] = None,
+        query: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Weak ETag for everything a tier can see in this snapshot, per format, watchlist and query"""
+        suffix = "" if fmt == FORMAT_JSON else f"-{fmt}"
+        if watchlist:
+            suffix += f"-wl{watchlist_tag(watchlist)}"
+        if query:
+            suffix += f"-q{query_tag(query)}"
+        return f'W/"{self.version}-{"paid" if is_paid else "free"}{suffix}"'
+
+    def user_view(
+        self,
+        is_paid: bool,
+        cached: bool,
+        delta: Optional[Tuple[int, FrozenSet[str]]] = None,
+        watchlist: Optional[FrozenSet[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the signals payload a user of the given tier is allowed to see
+
+        Args:
+            is_paid: Whether user has paid subscription
+            cached: Whether the snapshot came from cache
+            delta: (since version, changed symbols) to only include what changed
+            watchlist: Only include these symbols (looked up in the symbol index)
+        """
+        # Paid users see all signals, free users only the first few
+        if watchlist:
+            positions = self.index.positions_for(watchlist)
+            if not is_paid:
+                positions = positions[positions < FREE_SIGNAL_LIMIT]
+            filtered_signals = [self.signals[position] for position in positions.tolist()]
+        else:
+            filtered_signals = self.signals if is_paid else self.signals[:FREE_SIGNAL_LIMIT]
+
+        if delta is not None:
+            changed = delta[1]
+            filtered_signals = [signal for signal in filtered_signals if signal["symbol"] in changed]
+
+        return {
+            "signals": filtered_signals,
+            "total": len(filtered_signals),
+            "is_paid": is_paid,
+            "cached": cached,
+            "message": self._upgrade_message(is_paid),
+            "version": self.version,
+            "since": delta[0] if delta is not None else None,
+            "watchlist": bool(watchlist)
+        }
+
+    def render_body(
+        self,
+        is_paid: bool,
+        cached: bool = True,
+        delta: Optional[Tuple[int, FrozenSet[str]]] = None,
+        fmt: str = FORMAT_JSON,
+        watchlist: Optional[FrozenSet[str]] = None
+    ) -> bytes:
+        """
+        Get the response body for a tier, rendered once per snapshot
+
+        Encoded the same way as FastAPI's JSONResponse (or as columns /
+        MessagePack), so the bytes can be returned as-is without model
+        validation or serialization per request. Delta bodies are memoized
+        per since version as well. Watchlist bodies are shared by every user
+        with the same watchlist, the most recently used ones are kept.
+        """
+        since = delta[0] if delta is not None else None
+
+        if not watchlist:
+            key = (is_paid, cached, since, fmt)
+            body = self._bodies.get(key)
+            if body is None:
+                body = encode_view(self.user_view(is_paid, cached, delta), fmt)
+                self._bodies[key] = body
+            return body
+
+        watchlist_key = (watchlist, is_paid, cached, since, fmt)
+        body = self._watchlist_bodies.get(watchlist_key)
+
+        if body is None:
+            body = encode_view(self.user_view(is_paid, cached, delta, watchlist), fmt)
+            self._watchlist_bodies[watchlist_key] = body
+            if len(self._watchlist_bodies) > WATCHLIST_VIEW_CACHE:
+                self._watchlist_bodies.popitem(last=False)
+        else:
+            self._watchlist_bodies.move_to_end(watchlist_key)
+
+        return body
+
+    def query_view(
+        self,
+        is_paid: bool,
+        cached: bool,
+        cursor: Optional[int],
+        limit: int,
+        watchlist: Optional[FrozenSet[str]] = None,
+        delta: Optional[Tuple[int, FrozenSet[str]]] = None,
+        **filters
+    ) -> Dict[str, Any]:
+        """
+        Build the payload for a filtered, paginated query
+
+        Free users only ever match within the signals their tier can see.
+        With a delta, only the changed symbols can match.
+        """
+        symbols = watchlist or None
+        if delta is not None:
+            symbols = delta[1] if symbols is None else symbols & delta[1]
+
+        positions, next_cursor = self.index.query(
+            symbols=symbols,
+            visible=None if is_paid else FREE_SIGNAL_LIMIT,
+            cursor=cursor,
+            limit=limit,
+            **filters
+        )
+        filtered_signals = [self.signals[position] for position in positions]
+
+        return {
+            "signals": filtered_signals,
+            "total": len(filtered_signals),
+            "is_paid": is_paid,
+            "cached": cached,
+            "message": self._upgrade_message(is_paid),
+            "version": self.version,
+            "since": delta[0] if delta is not None else None,
+            "next_cursor": next_cursor,
+            "watchlist": bool(watchlist)
+        }
@@ -0,0 +1,130 @@
+"""
+Server-sent events fan-out of signal snapshots
+
+New snapshots reach each worker once through its pub/sub listener (see
+signal_service.install_snapshot). Each snapshot is encoded once per tier and
+the same bytes are handed to every connected client of that tier.
+
+Every client has a single-slot mailbox that always holds the newest frame.
+A slow consumer therefore skips intermediate snapshots instead of buffering
+them, and it never holds up the broadcast to other clients.
+"""
+import asyncio
+from typing import AsyncIterator, Dict, Optional, Set
+from app.services.signal_service import add_snapshot_listener, get_snapshot
+from app.services.signal_snapshot import SignalSnapshot
+
+
+STREAM_MAX_CLIENTS = 1000  # Per worker
+HEARTBEAT_INTERVAL = 15  # Seconds between keep-alive comments on an idle stream
+
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+
+stream_stats = {
+    "clients": 0,
+    "frames_sent": 0,
+    "frames_skipped": 0,  # Replaced before a slow client read them
+}
+
+
+class StreamFull(Exception):
+    """Raised when the worker already serves STREAM_MAX_CLIENTS streams"""
+
+
+class _Subscriber:
+    def __init__(self, is_paid: bool):
+        self.is_paid = is_paid
+        self.frame: Optional[bytes] = None
+        self.ready = asyncio.Event()
+
+    def offer(self, frame: bytes) -> None:
+        # Latest wins: an unread frame is replaced, never queued behind
+        if self.frame is not None:
+            stream_stats["frames_skipped"] += 1
+        self.frame = frame
+        self.ready.set()
+
+    def take(self) -> Optional[bytes]:
+        frame, self.frame = self.frame, None
+        self.ready.clear()
+        return frame
+
+
+_subscribers: Set[_Subscriber] = set()
+
+
+def encode_frame(snapshot: SignalSnapshot, is_paid: bool) -> bytes:
+    """Encode a snapshot as an SSE event for one tier"""
+    # The pre-rendered body is compact single-line JSON, valid as one data line
+    header = f"id: {snapshot.version}\nevent: signals\ndata: ".encode()
+    return header + snapshot.render_body(is_paid) + b"\n\n"
+
+
+def _broadcast(snapshot: SignalSnapshot) -> None:
+    if not _subscribers:
+        return
+
+    frames = {
+        is_paid: encode_frame(snapshot, is_paid)
+        for is_paid in {subscriber.is_paid for subscriber in _subscribers}
+    }
+
+    for subscriber in _subscribers:
+        subscriber.offer(frames[subscriber.is_paid])
+
+
+add_snapshot_listener(_broadcast)
+
+
+def open_stream(is_paid: bool, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Check for a free slot and return the client's event stream
+
+    The check happens before the response starts so the caller can turn
+    StreamFull into an error status. The client is only registered once the
+    stream is iterated, so a client that disconnects before that never
+    holds a slot (concurrent opens may briefly exceed the limit).
+
+    Args:
+        is_paid: Tier that decides which frame the client receives
+        last_event_id: Version the client already has (sent back on reconnect)
+    """
+    if len(_subscribers) >= STREAM_MAX_CLIENTS:
+        raise StreamFull()
+
+    return _stream(is_paid, last_event_id)
+
+
+async def _stream(is_paid: bool, last_event_id: Optional[str]) -> AsyncIterator[bytes]:
+    # Registered here, inside the generator, so the finally below always releases it
+    subscriber = _Subscriber(is_paid)
+    _subscribers.add(subscriber)
+    stream_stats["clients"] = len(_subscribers)
+
+    try:
+        # Start with the current snapshot unless the client already has it.
+        # A newer one broadcast meanwhile is already waiting in the mailbox.
+        snapshot, _ = await get_snapshot()
+        if subscriber.frame is None and last_event_id != str(snapshot.version):
+            stream_stats["frames_sent"] += 1
+            yield encode_frame(snapshot, subscriber.is_paid)
+
+        while True:
+            try:
+                await asyncio.wait_for(subscriber.ready.wait(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT_FRAME
+                continue
+
+            frame = subscriber.take()
+            if frame is not None:
+                stream_stats["frames_sent"] += 1
+                yield frame
+    finally:
+        _subscribers.discard(subscriber)
+        stream_stats["clients"] = len(_subscribers)
+
+
+def get_stream_stats() -> Dict[str, int]:
+    """Get a copy of the stream counters"""
+    return dict(stream_stats)
@@ -3,7 +3,8 @@ from typing import Optional, Dict, Any
 from fastapi import HTTPException, status
 from app.config import settings
 from app.services.auth_service import update_user_subscription, get_user_by_id
-from app.redis_client import get_redis
+from app.services.user_cache import invalidate_user
+from app.services.redis_service import get_cached_data, set_cached_data
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
@@ -56,20 +57,18 @@ def verify_webhook_signature(payload: bytes, signature: str) -> Optional[Dict[st
 
 async def is_webhook_processed(event_id: str) -> bool:
     """Check if webhook event has already been processed (idempotency)"""
-    redis = get_redis()
     redis_key = f"webhook:{event_id}"
     
-    result = await redis.get(redis_key)
+    result = await get_cached_data(redis_key)
     return result is not None
 
 
 async def mark_webhook_processed(event_id: str) -> None:
     """Mark webhook event as processed in Redis"""
-    redis = get_redis()
     redis_key = f"webhook:{event_id}"
     
     # Store for 24 hours (86400 seconds)
-    await redis.setex(redis_key, 86400, "processed")
+    await set_cached_data(redis_key, "processed", 86400)
 
 
 async def handle_checkout_completed(session: Dict[str, Any]) -> bool:
@@ -115,6 +114,8 @@ async def handle_checkout_completed(session: Dict[str, Any]) -> bool:
     
     except Exception as e:
         print(f"Error updating user {user_id}: {str(e)}")
+        # The row may have changed before the error; never keep serving the old tier
+        await invalidate_user(user_id)
         return False
 
 async def get_subscription_status(user_id: int) -> Optional[Dict[str, Any]]:
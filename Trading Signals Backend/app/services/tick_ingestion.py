@@ -0,0 +1,247 @@
+"""
+Market-data ingestion into the per-symbol tick buffers
+
+TICK_SOURCE selects where ticks come from:
+- file:/path/ticks.csv   replay a CSV with timestamp, symbol, price[, volume]
+- udp://host:port        datagrams of "symbol,price[,volume[,timestamp]]" lines
+- tcp://host:port        the same line format over TCP connections
+
+Without a source the signal generator simulates ticks itself. Ticks for
+unknown symbols and unparsable lines are dropped and counted.
+
+Only the leader worker ingests (the refresher calls sync_tick_ingestion on
+every tick), since it is the one generating signals from the buffers and a
+udp:// or tcp:// port can only be bound by one worker. When leadership
+moves, the old leader closes its source and the new one opens it. A worker
+that leads again resumes a file: replay after the last row it stored rather
+than from the start, so its indicators never consume the same ticks twice.
+"""
+import asyncio
+import csv
+import itertools
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import numpy as np
+from app.config import settings
+from app.services.signal_service import TICK_STORE
+
+
+REPLAY_BATCH_SIZE = 10_000  # CSV rows stored per batch before yielding to the event loop
+
+tick_stats = {
+    "received": 0,
+    "dropped": 0,
+}
+
+_task: Optional[asyncio.Task] = None
+_transport: Optional[asyncio.BaseTransport] = None
+_server: Optional[asyncio.AbstractServer] = None
+
+# CSV data rows this worker has already stored, per replayed file
+_replay_offsets: Dict[str, int] = {}
+
+
+def _parse_timestamp(value: str) -> int:
+    """Epoch milliseconds from epoch seconds or an ISO timestamp (UTC if naive)"""
+    try:
+        return int(float(value) * 1000)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp() * 1000)
+
+
+def parse_tick_line(line: str) -> Optional[Tuple[int, int, float, float]]:
+    """
+    Parse "symbol,price[,volume[,timestamp]]"
+
+    Returns:
+        (position, timestamp ms, price, volume), or None for an unknown symbol or bad line
+    """
+    fields = line.strip().split(",")
+    try:
+        position = TICK_STORE.positions.get(fields[0].strip().upper())
+        if position is None:
+            return None
+
+        price = float(fields[1])
+        volume = float(fields[2]) if len(fields) > 2 and fields[2] else 0.0
+        timestamp = _parse_timestamp(fields[3]) if len(fields) > 3 else int(time.time() * 1000)
+        return position, timestamp, price, volume
+    except (IndexError, ValueError):
+        return None
+
+
+def ingest_lines(data: str) -> None:
+    """Store every tick in a block of newline-separated lines"""
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+
+        tick = parse_tick_line(line)
+        if tick is None:
+            tick_stats["dropped"] += 1
+            continue
+
+        TICK_STORE.append(*tick)
+        tick_stats["received"] += 1
+
+
+def _store_rows(rows: List[Dict[str, str]]) -> None:
+    positions, timestamps, prices, volumes = [], [], [], []
+
+    for row in rows:
+        try:
+            position = TICK_STORE.positions.get(row["symbol"].upper())
+            if position is None:
+                raise ValueError(row["symbol"])
+            timestamps.append(_parse_timestamp(row["timestamp"]))
+            prices.append(float(row["price"]))
+            volumes.append(float(row.get("volume") or 0))
+            positions.append(position)
+        except (KeyError, ValueError, AttributeError):
+            tick_stats["dropped"] += 1
+
+    TICK_STORE.append_batch(positions, timestamps, prices, volumes)
+    tick_stats["received"] += len(positions)
+
+
+async def replay_file(path: str, speed: float = 0.0) -> None:
+    """
+    Replay a tick CSV into the buffers
+
+    Resumes after the rows this worker stored in an earlier replay of the
+    same file (e.g. before it lost and regained leadership).
+
+    Args:
+        path: CSV with timestamp, symbol, price and optional volume columns
+        speed: 1.0 replays at the recorded pace, 10.0 ten times faster, 0 as fast as possible
+    """
+    offset = _replay_offsets.get(path, 0)
+    print(f"Replaying ticks from {path}" + (f" after row {offset}" if offset else ""))
+    started = time.monotonic()
+    first_timestamp = None
+
+    with open(path, newline="") as f:
+        batch = []
+        for row in itertools.islice(csv.DictReader(f), offset, None):
+            batch.append(row)
+            if len(batch) < REPLAY_BATCH_SIZE and speed <= 0:
+                continue
+
+            if speed > 0:
+                # Wait until this row is due; one row per batch keeps the pacing exact
+                timestamp = _parse_timestamp(row["timestamp"]) / 1000
+                first_timestamp = timestamp if first_timestamp is None else first_timestamp
+                delay = (timestamp - first_timestamp) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            _store_rows(batch)
+            _replay_offsets[path] = _replay_offsets.get(path, 0) + len(batch)
+            batch = []
+            await asyncio.sleep(0)
+
+        _store_rows(batch)
+        _replay_offsets[path] = _replay_offsets.get(path, 0) + len(batch)
+
+    print(f"Tick replay finished ({tick_stats['received']} ticks, {tick_stats['dropped']} dropped)")
+
+
+async def _replay_logged(path: str, speed: float) -> None:
+    try:
+        await replay_file(path, speed)
+    except Exception as e:
+        print(f"Tick replay from {path} failed: {e}")
+
+
+class _DatagramReceiver(asyncio.DatagramProtocol):
+    def datagram_received(self, data: bytes, addr) -> None:
+        ingest_lines(data.decode("utf-8", errors="replace"))
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while line := await reader.readline():
+            ingest_lines(line.decode("utf-8", errors="replace"))
+    finally:
+        writer.close()
+
+
+async def start_tick_ingestion() -> None:
+    """Start reading from TICK_SOURCE, if one is configured"""
+    global _task, _transport, _server
+
+    source = settings.TICK_SOURCE
+    if not source:
+        print("No TICK_SOURCE configured, signals use simulated ticks")
+        return
+
+    url = urlparse(source)
+
+    if url.scheme == "file":
+        _task = asyncio.create_task(_replay_logged(url.path, settings.TICK_REPLAY_SPEED))
+    elif url.scheme == "udp":
+        loop = asyncio.get_running_loop()
+        _transport, _ = await loop.create_datagram_endpoint(_DatagramReceiver, local_addr=(url.hostname, url.port))
+    elif url.scheme == "tcp":
+        _server = await asyncio.start_server(_handle_connection, url.hostname, url.port)
+    else:
+        raise ValueError(f"Unsupported TICK_SOURCE: {source}")
+
+    print(f"Tick ingestion started from {source} ({TICK_STORE.nbytes / 1024 / 1024:.1f} MiB of tick buffers)")
+
+
+def is_ingesting() -> bool:
+    """Whether this worker has the tick source open"""
+    return _task is not None or _transport is not None or _server is not None
+
+
+async def sync_tick_ingestion(leader: bool) -> None:
+    """Open the tick source when this worker leads, close it when it no longer does"""
+    if not settings.TICK_SOURCE:
+        return
+
+    try:
+        if leader and not is_ingesting():
+            await start_tick_ingestion()
+        elif not leader and is_ingesting():
+            await stop_tick_ingestion()
+            print("Tick ingestion handed over to the new leader")
+    except Exception as e:
+        # e.g. the old leader still has the port bound; retried on the next tick
+        print(f"Tick ingestion failed to start: {e}")
+
+
+async def stop_tick_ingestion() -> None:
+    """Stop the tick source"""
+    global _task, _transport, _server
+
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+    if _transport is not None:
+        _transport.close()
+        _transport = None
+
+    if _server is not None:
+        _server.close()
+        await _server.wait_closed()
+        _server = None
+
+
+def get_tick_stats() -> Dict[str, int]:
+    """Get ingestion counters and buffer usage"""
+    return {
+        **tick_stats,
+        "symbols_with_ticks": int(np.count_nonzero(TICK_STORE.written)),
+        "buffer_bytes": TICK_STORE.nbytes,
+    }
@@ -0,0 +1,120 @@
+"""
+Per-worker cache of verified JWT payloads
+
+A client sends the same token on every request for days, so each worker
+keeps the payloads of the last TOKEN_CACHE_SIZE tokens it verified, keyed
+by a digest of the token, until the token's `exp`. Only tokens that passed
+a full signature check are ever stored.
+
+Revoked token digests are kept until the token would have expired: in a
+Redis sorted set (scored by `exp`) that workers load at startup and again
+whenever the pub/sub subscription reconnects (broadcasts sent while it was
+down are lost), and in every worker's memory through a pub/sub broadcast.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.config import settings
+from app.redis_client import get_redis
+from app.services import pubsub_service
+
+
+REVOKED_KEY = "tokens:revoked"
+REVOCATION_CHANNEL = "tokens:revoke"
+
+# digest -> (exp, payload)
+_payloads: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# digest -> exp, for tokens that must be rejected despite a valid signature
+_revoked: Dict[bytes, float] = {}
+
+token_cache_stats = {
+    "hits": 0,
+    "misses": 0,
+    "revoked_rejected": 0,
+}
+
+
+def token_digest(token: str) -> bytes:
+    """Fixed-size key for a token"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def is_revoked(digest: bytes) -> bool:
+    exp = _revoked.get(digest)
+    if exp is None:
+        return False
+    if exp <= time.time():
+        del _revoked[digest]
+        return False
+    token_cache_stats["revoked_rejected"] += 1
+    return True
+
+
+def get_cached_payload(digest: bytes) -> Optional[Dict[str, Any]]:
+    """Payload of a token verified earlier, if it has not expired or been revoked"""
+    entry = _payloads.get(digest)
+    if entry is None:
+        token_cache_stats["misses"] += 1
+        return None
+
+    exp, payload = entry
+    if exp <= time.time():
+        del _payloads[digest]
+        token_cache_stats["misses"] += 1
+        return None
+
+    _payloads.move_to_end(digest)
+    token_cache_stats["hits"] += 1
+    return payload
+
+
+def cache_payload(digest: bytes, payload: Dict[str, Any]) -> None:
+    """Remember a verified payload until its exp (tokens without exp are not cached)"""
+    exp = payload.get("exp")
+    if exp is None:
+        return
+
+    _payloads[digest] = (float(exp), payload)
+    _payloads.move_to_end(digest)
+
+    while len(_payloads) > settings.TOKEN_CACHE_SIZE:
+        _payloads.popitem(last=False)
+
+
+def _forget(digest: bytes, exp: float) -> None:
+    _payloads.pop(digest, None)
+    _revoked[digest] = exp
+
+
+async def revoke_token(token: str, exp: float) -> None:
+    """Reject a token in every worker until it expires"""
+    digest = token_digest(token)
+    _forget(digest, exp)
+
+    redis = get_redis()
+    await redis.zadd(REVOKED_KEY, {digest.hex(): exp})
+    await redis.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+    await pubsub_service.publish(REVOCATION_CHANNEL, f"{digest.hex()}:{exp}")
+
+
+async def load_revoked_tokens() -> None:
+    """Load revocations of tokens that have not expired yet (at startup and on every resubscribe)"""
+    members = await get_redis().zrangebyscore(REVOKED_KEY, time.time(), "+inf", withscores=True)
+    for digest, exp in members:
+        _forget(bytes.fromhex(digest), exp)
+
+
+async def _on_token_revoked(data: bytes) -> None:
+    digest, exp = data.decode().split(":")
+    _forget(bytes.fromhex(digest), float(exp))
+
+
+pubsub_service.subscribe(REVOCATION_CHANNEL, _on_token_revoked)
+pubsub_service.on_subscribed(load_revoked_tokens)
+
+
+def get_token_cache_stats() -> Dict[str, int]:
+    """Get hit/miss counters and cache sizes"""
+    return {**token_cache_stats, "size": len(_payloads), "revoked": len(_revoked)}
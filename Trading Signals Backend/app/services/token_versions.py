@@ -0,0 +1,69 @@
+"""
+Per-user token versions for the stateless authorization fast path
+
+Every token carries the user's `token_version` as its `ver` claim. The
+version is bumped whenever claims in older tokens go stale (payment) or
+older tokens must stop working (revocation, which also raises
+`token_min_version`). Both numbers live in Postgres and are mirrored into
+one Redis hash per user, so checking a token costs a single HMGET.
+
+Both numbers only ever grow, so the mirror is written by a script that only
+raises them: a refill that read Postgres before an update, or two updates
+landing out of order, can never bring back an older pair.
+"""
+from typing import Optional, Tuple
+from app.database import get_db_connection
+from app.redis_client import get_redis
+
+
+TOKEN_VERSIONS_KEY = "token_versions:{user_id}"
+TOKEN_VERSIONS_TTL = 86400  # Idle mirrors are refilled from Postgres
+
+# KEYS[1] = versions hash, ARGV = version, min version, TTL (s)
+RAISE_VERSIONS_SCRIPT = """
+local current = redis.call("HMGET", KEYS[1], "ver", "min")
+local version = math.max(tonumber(current[1] or "0"), tonumber(ARGV[1]))
+local min_version = math.max(tonumber(current[2] or "0"), tonumber(ARGV[2]))
+redis.call("HSET", KEYS[1], "ver", version, "min", min_version)
+redis.call("EXPIRE", KEYS[1], ARGV[3])
+return {version, min_version}
+"""
+
+
+def _key(user_id: int) -> str:
+    return TOKEN_VERSIONS_KEY.format(user_id=user_id)
+
+
+async def set_token_versions(user_id: int, version: int, min_version: int) -> Tuple[int, int]:
+    """
+    Mirror a user's versions into Redis after reading them from Postgres
+
+    Returns the mirrored (version, min_version), which are higher than the
+    arguments if a newer update already reached Redis.
+    """
+    version, min_version = await get_redis().eval(
+        RAISE_VERSIONS_SCRIPT, 1, _key(user_id), version, min_version, TOKEN_VERSIONS_TTL
+    )
+    return int(version), int(min_version)
+
+
+async def get_token_versions(user_id: int) -> Optional[Tuple[int, int]]:
+    """
+    Get (token_version, token_min_version) for a user
+
+    Reads Postgres only when Redis has no copy. Returns None for an unknown user.
+    """
+    version, min_version = await get_redis().hmget(_key(user_id), "ver", "min")
+    if version is not None and min_version is not None:
+        return int(version), int(min_version)
+
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            "SELECT token_version, token_min_version FROM users WHERE id = $1",
+            user_id
+        )
+
+    if row is None:
+        return None
+
+    return await set_token_versions(user_id, row["token_version"], row["token_min_version"])
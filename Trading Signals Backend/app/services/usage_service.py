@@ -0,0 +1,188 @@
+"""
+Per-user API usage metering with write-behind to Postgres
+
+Requests are counted in worker memory (a dict increment per request). Every
+USAGE_REDIS_FLUSH_INTERVAL seconds each worker adds its counts to one Redis
+hash with a single pipeline; every USAGE_DB_FLUSH_INTERVAL seconds the hash
+is atomically taken and upserted into usage_daily in one executemany. The
+most a crash can lose is a worker's last Redis interval, or the counts taken
+by a flush that had not committed yet. Shutdown flushes everything, straight
+to Postgres if Redis is unavailable.
+"""
+import asyncio
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.database import get_db_connection
+from app.redis_client import get_redis
+
+
+PENDING_KEY = "usage:pending"  # Hash: "user_id:day:endpoint:tier" -> requests not yet in Postgres
+
+# Read and clear the pending hash atomically, so concurrent flushes never
+# write the same counts twice
+TAKE_PENDING_SCRIPT = """
+local data = redis.call("HGETALL", KEYS[1])
+redis.call("DEL", KEYS[1])
+return data
+"""
+
+UPSERT_USAGE = """
+    INSERT INTO usage_daily (user_id, day, endpoint, tier, requests)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (user_id, day, endpoint, tier)
+    DO UPDATE SET requests = usage_daily.requests + EXCLUDED.requests, updated_at = CURRENT_TIMESTAMP
+"""
+
+UsageKey = Tuple[int, date, str, str]
+
+_counts: Counter = Counter()
+_redis_task: Optional[asyncio.Task] = None
+_db_task: Optional[asyncio.Task] = None
+
+usage_stats = {
+    "recorded": 0,
+    "redis_flushes": 0,
+    "db_rows_upserted": 0,
+    "flush_errors": 0,
+}
+
+
+def record_usage(user_id: int, is_paid: bool, endpoint: str) -> None:
+    """Count one request (memory only; never blocks)"""
+    day = datetime.now(timezone.utc).date()
+    _counts[(user_id, day, endpoint, "paid" if is_paid else "free")] += 1
+    usage_stats["recorded"] += 1
+
+
+def _field(key: UsageKey) -> str:
+    user_id, day, endpoint, tier = key
+    return f"{user_id}:{day.isoformat()}:{endpoint}:{tier}"
+
+
+def _parse_field(field: str) -> UsageKey:
+    user_id, day, endpoint, tier = field.split(":")
+    return int(user_id), date.fromisoformat(day), endpoint, tier
+
+
+def _take_local() -> Dict[UsageKey, int]:
+    global _counts
+    taken, _counts = _counts, Counter()
+    return taken
+
+
+def _restore_local(counts: Dict[UsageKey, int]) -> None:
+    _counts.update(counts)
+
+
+async def flush_to_redis() -> None:
+    """Add this worker's counts to the shared pending hash"""
+    counts = _take_local()
+    if not counts:
+        return
+
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for key, count in counts.items():
+                pipe.hincrby(PENDING_KEY, _field(key), count)
+            await pipe.execute()
+    except Exception:
+        _restore_local(counts)
+        raise
+
+    usage_stats["redis_flushes"] += 1
+
+
+async def _upsert(counts: Dict[UsageKey, int]) -> None:
+    # Sorted so concurrent flushes lock rows in the same order
+    records = [(*key, count) for key, count in sorted(counts.items())]
+    async with get_db_connection() as conn:
+        await conn.executemany(UPSERT_USAGE, records)
+    usage_stats["db_rows_upserted"] += len(records)
+
+
+async def flush_to_db() -> None:
+    """Move every pending count from Redis into usage_daily"""
+    redis = get_redis()
+    data = await redis.eval(TAKE_PENDING_SCRIPT, 1, PENDING_KEY)
+    if not data:
+        return
+
+    counts = {_parse_field(field): int(count) for field, count in zip(data[::2], data[1::2])}
+
+    try:
+        await _upsert(counts)
+    except Exception:
+        # Put the counts back for the next flush
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, count in counts.items():
+                pipe.hincrby(PENDING_KEY, _field(key), count)
+            await pipe.execute()
+        raise
+
+
+async def _flush_loop(flush, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush()
+        except Exception as e:
+            usage_stats["flush_errors"] += 1
+            print(f"Usage flush failed: {e}")
+
+
+async def start_usage_metering() -> None:
+    """Start the periodic flushes"""
+    global _redis_task, _db_task
+
+    _redis_task = asyncio.create_task(_flush_loop(flush_to_redis, settings.USAGE_REDIS_FLUSH_INTERVAL))
+    _db_task = asyncio.create_task(_flush_loop(flush_to_db, settings.USAGE_DB_FLUSH_INTERVAL))
+
+
+async def stop_usage_metering() -> None:
+    """Stop the periodic flushes and write every remaining count to Postgres"""
+    global _redis_task, _db_task
+
+    for task in (_redis_task, _db_task):
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _redis_task = _db_task = None
+
+    try:
+        await flush_to_redis()
+        await flush_to_db()
+    except Exception as e:
+        print(f"Usage flush through Redis failed ({e}), writing to Postgres directly")
+        counts = _take_local()
+        if counts:
+            try:
+                await _upsert(counts)
+            except Exception as e:
+                print(f"Usage counts lost on shutdown: {e}")
+
+    print(f"Usage metering stopped ({usage_stats['db_rows_upserted']} rows upserted)")
+
+
+def get_usage_stats() -> Dict[str, int]:
+    """Get metering counters and the number of counts not yet flushed by this worker"""
+    return {**usage_stats, "unflushed_keys": len(_counts)}
+
+
+async def get_usage(user_id: int, start: date, end: date) -> List[Dict]:
+    """Get a user's daily usage between start and end (inclusive) from Postgres"""
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT day, endpoint, tier, requests
+            FROM usage_daily
+            WHERE user_id = $1 AND day BETWEEN $2 AND $3
+            ORDER BY day, endpoint, tier
+            """,
+            user_id, start, end
+        )
+    return [dict(row) for row in rows]
@@ -0,0 +1,146 @@
+"""
+Two-level cache of user records for request authentication
+
+L1 is a per-worker LRU whose entries live USER_CACHE_TTL seconds; L2 is a
+Redis copy shared by all workers. Only the UserRecord projection is cached,
+never the password hash. Changes to a user row must go through
+invalidate_user(), which replaces the Redis copy with a short-lived
+tombstone and broadcasts the user id so every worker drops its L1 entry.
+A fill from a database read that raced the change finds the tombstone and
+is discarded. Like the signals L1, local entries are only trusted while the
+pub/sub subscription that delivers invalidations has been connected since
+they were stored.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.config import settings
+from app.redis_client import get_redis_bytes
+from app.models.user import UserInDB, UserRecord
+from app.services import pubsub_service
+from app.services.cache_codec import decode_value, encode_value
+
+
+USER_KEY = "user:{user_id}"
+INVALIDATION_CHANNEL = "users:invalidate"
+CODEC = "msgpack"  # Records are too small for compression to pay off
+
+TOMBSTONE = b"invalidated"
+TOMBSTONE_TTL_MS = 5000  # Longer than a database read plus cache fill can take
+
+# Store the record unless the user was invalidated since it was read
+FILL_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+return 1
+"""
+
+# user_id -> (expires at, subscription generation when stored, user)
+_local: "OrderedDict[int, Tuple[float, int, UserRecord]]" = OrderedDict()
+
+user_cache_stats = {
+    "l1_hits": 0,
+    "l2_hits": 0,
+    "misses": 0,
+    "invalidations": 0,
+    "stale_fills": 0,
+}
+
+
+def _key(user_id: int) -> str:
+    return USER_KEY.format(user_id=user_id)
+
+
+def _get_local(user_id: int) -> Optional[UserRecord]:
+    entry = _local.get(user_id)
+    if entry is None:
+        return None
+
+    expires_at, generation, user = entry
+    if (
+        expires_at <= time.monotonic()
+        or generation != pubsub_service.subscription_generation
+        or not pubsub_service.is_listening()
+    ):
+        del _local[user_id]
+        return None
+
+    _local.move_to_end(user_id)
+    return user
+
+
+def _store_local(user: UserRecord) -> None:
+    _local[user.id] = (
+        time.monotonic() + settings.USER_CACHE_TTL,
+        pubsub_service.subscription_generation,
+        user
+    )
+    _local.move_to_end(user.id)
+
+    while len(_local) > settings.USER_CACHE_SIZE:
+        _local.popitem(last=False)
+
+
+async def get_cached_user(user_id: int) -> Optional[UserRecord]:
+    """Get a user from the worker's L1, then Redis; None on a miss"""
+    user = _get_local(user_id)
+    if user is not None:
+        user_cache_stats["l1_hits"] += 1
+        return user
+
+    data = await get_redis_bytes().get(_key(user_id))
+    if data is None or data == TOMBSTONE:
+        user_cache_stats["misses"] += 1
+        return None
+
+    user = UserRecord.model_validate(decode_value(data))
+    _store_local(user)
+    user_cache_stats["l2_hits"] += 1
+    return user
+
+
+async def cache_user(user: UserInDB) -> UserRecord:
+    """
+    Store a user loaded from the database in both levels
+
+    Returns the cached projection. Nothing is stored if the user was
+    invalidated in the meantime, as the record may predate the change.
+    """
+    record = UserRecord.model_validate(user.model_dump(exclude={"password_hash"}))
+
+    stored = await get_redis_bytes().eval(
+        FILL_SCRIPT,
+        1,
+        _key(user.id),
+        TOMBSTONE,
+        encode_value(record.model_dump(mode="json"), CODEC),
+        settings.USER_CACHE_REDIS_TTL
+    )
+
+    if stored:
+        _store_local(record)
+    else:
+        user_cache_stats["stale_fills"] += 1
+    return record
+
+
+async def invalidate_user(user_id: int) -> None:
+    """Drop a user's cached record in Redis and in every worker"""
+    _local.pop(user_id, None)
+    await get_redis_bytes().set(_key(user_id), TOMBSTONE, px=TOMBSTONE_TTL_MS)
+    await pubsub_service.publish(INVALIDATION_CHANNEL, str(user_id))
+    user_cache_stats["invalidations"] += 1
+
+
+async def _on_user_invalidated(data: bytes) -> None:
+    _local.pop(int(data), None)
+
+
+pubsub_service.subscribe(INVALIDATION_CHANNEL, _on_user_invalidated)
+
+
+def get_user_cache_stats() -> Dict[str, int]:
+    """Get hit/miss counters and the L1 size"""
+    return {**user_cache_stats, "l1_size": len(_local)}
@@ -0,0 +1,146 @@
+"""
+Per-user watchlists
+
+Postgres is the source of truth; each watchlist is mirrored into a Redis set
+so the signals endpoint can read it without a database round trip. An empty
+watchlist is stored as a set holding only EMPTY_MARKER, so users without a
+watchlist don't fall through to Postgres on every request.
+
+Writes lock the user's row first, so concurrent changes to one watchlist are
+applied one at a time and the size cap cannot be exceeded. While still
+holding the lock they drop the mirror and leave a short-lived tombstone; the
+next read refills the mirror from Postgres, unless the tombstone shows that
+its database read may predate a write.
+"""
+from typing import FrozenSet, Iterable
+from app.database import get_db_connection
+from app.redis_client import get_redis
+from app.models.watchlist import WATCHLIST_MAX_SYMBOLS
+
+
+WATCHLIST_KEY = "watchlist:{user_id}"
+WATCHLIST_TTL = 86400  # Mirror is rebuilt from Postgres after a day without writes
+EMPTY_MARKER = ""
+
+TOMBSTONE_KEY = "watchlist:{user_id}:invalidated"
+TOMBSTONE_TTL_MS = 5000  # Longer than a database read plus mirror fill can take
+
+# Replace the mirror unless a write invalidated it since the symbols were read
+FILL_SCRIPT = """
+if redis.call("EXISTS", KEYS[2]) == 1 then
+    return 0
+end
+redis.call("DEL", KEYS[1])
+redis.call("SADD", KEYS[1], unpack(ARGV, 2))
+redis.call("EXPIRE", KEYS[1], ARGV[1])
+return 1
+"""
+
+# Serializes watchlist writes per user without blocking foreign-key checks
+LOCK_USER_SQL = "SELECT 1 FROM users WHERE id = $1 FOR NO KEY UPDATE"
+
+
+class WatchlistFull(Exception):
+    """Raised when adding a symbol would take a watchlist past WATCHLIST_MAX_SYMBOLS"""
+
+
+def _key(user_id: int) -> str:
+    return WATCHLIST_KEY.format(user_id=user_id)
+
+
+async def _mirror(user_id: int, symbols: FrozenSet[str]) -> None:
+    """Replace the Redis copy of a watchlist read from Postgres, unless it was invalidated since"""
+    await get_redis().eval(
+        FILL_SCRIPT,
+        2,
+        _key(user_id),
+        TOMBSTONE_KEY.format(user_id=user_id),
+        WATCHLIST_TTL,
+        *(symbols or {EMPTY_MARKER})
+    )
+
+
+async def _invalidate(user_id: int) -> None:
+    """Drop the Redis copy of a watchlist (called while holding the user's row lock)"""
+    async with get_redis().pipeline(transaction=True) as pipe:
+        pipe.delete(_key(user_id))
+        pipe.set(TOMBSTONE_KEY.format(user_id=user_id), 1, px=TOMBSTONE_TTL_MS)
+        await pipe.execute()
+
+
+async def _load_from_db(user_id: int) -> FrozenSet[str]:
+    async with get_db_connection() as conn:
+        rows = await conn.fetch("SELECT symbol FROM watchlist_symbols WHERE user_id = $1", user_id)
+    return frozenset(row["symbol"] for row in rows)
+
+
+async def get_watchlist(user_id: int) -> FrozenSet[str]:
+    """Get a user's watchlist symbols, from Redis when mirrored"""
+    members = await get_redis().smembers(_key(user_id))
+    
+    if members:
+        return frozenset(members) - {EMPTY_MARKER}
+    
+    symbols = await _load_from_db(user_id)
+    await _mirror(user_id, symbols)
+    return symbols
+
+
+async def set_watchlist(user_id: int, symbols: Iterable[str]) -> FrozenSet[str]:
+    """Replace a user's watchlist"""
+    symbols = frozenset(symbol.upper() for symbol in symbols)
+    
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            await conn.execute(LOCK_USER_SQL, user_id)
+            await conn.execute("DELETE FROM watchlist_symbols WHERE user_id = $1", user_id)
+            await conn.executemany(
+                "INSERT INTO watchlist_symbols (user_id, symbol) VALUES ($1, $2)",
+                [(user_id, symbol) for symbol in symbols]
+            )
+            await _invalidate(user_id)
+    
+    return symbols
+
+
+async def add_symbol(user_id: int, symbol: str) -> FrozenSet[str]:
+    """
+    Add one symbol to a user's watchlist
+    
+    Raises:
+        WatchlistFull: The watchlist is full and does not hold the symbol yet
+    """
+    symbol = symbol.upper()
+    
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            await conn.execute(LOCK_USER_SQL, user_id)
+            rows = await conn.fetch("SELECT symbol FROM watchlist_symbols WHERE user_id = $1", user_id)
+            symbols = frozenset(row["symbol"] for row in rows)
+            
+            if symbol not in symbols:
+                if len(symbols) >= WATCHLIST_MAX_SYMBOLS:
+                    raise WatchlistFull()
+                await conn.execute(
+                    "INSERT INTO watchlist_symbols (user_id, symbol) VALUES ($1, $2)",
+                    user_id, symbol
+                )
+                symbols = symbols | {symbol}
+                await _invalidate(user_id)
+    
+    return symbols
+
+
+async def remove_symbol(user_id: int, symbol: str) -> FrozenSet[str]:
+    """Remove one symbol from a user's watchlist"""
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            await conn.execute(LOCK_USER_SQL, user_id)
+            await conn.execute(
+                "DELETE FROM watchlist_symbols WHERE user_id = $1 AND symbol = $2",
+                user_id, symbol.upper()
+            )
+            rows = await conn.fetch("SELECT symbol FROM watchlist_symbols WHERE user_id = $1", user_id)
+            await _invalidate(user_id)
+    
+    return frozenset(row["symbol"] for row in rows)
@@ -0,0 +1,55 @@
+"""
+Benchmark: Redis value size and encode/decode time per cache codec
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_cache_codec
+"""
+import json
+import time
+from datetime import datetime
+import numpy as np
+from app.engine.signal_engine import Universe, generate_signals
+from app.services.cache_codec import decode_value, encode_value
+
+
+SIZES = [20, 2_000, 50_000]
+CODECS = ["json", "zlib", "msgpack", "msgpack+zlib"]
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(42)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    print(f"{'signals':>8} {'codec':>13} {'bytes':>11} {'vs plain':>9} {'encode (ms)':>12} {'decode (ms)':>12}")
+
+    for n in SIZES:
+        universe = Universe([f"SYM{i}" for i in range(n)], rng.uniform(10, 50_000, n), ["IT"] * n)
+        envelope = {"version": 1, "generated_at": time.time(), "soft_expires_at": time.time() + 300,
+                    "signals": generate_signals(universe, timestamp, rng)}
+        repeat = 100 if n <= 2_000 else 5
+
+        # What cache_signals stored before codecs: json.dumps with default separators
+        plain = json.dumps(envelope).encode()
+
+        for codec in CODECS:
+            encoded = encode_value(envelope, codec)
+            encode_time = best_of(lambda: encode_value(envelope, codec), repeat)
+            decode_time = best_of(lambda: decode_value(encoded), repeat)
+
+            print(
+                f"{n:>8,} {codec:>13} {len(encoded):>11,} {len(encoded) / len(plain):>8.0%} "
+                f"{encode_time * 1000:>12.3f} {decode_time * 1000:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: event-loop latency while signals are generated inline vs in the pool
+
+A probe task sleeps PROBE_INTERVAL in a loop and records how late it wakes
+up, the delay every other request on the worker would see.
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_compute_pool
+"""
+import asyncio
+import os
+import time
+import numpy as np
+from app.config import settings
+from app.engine.indicators import IndicatorEngine
+from app.engine.signal_engine import random_walk_ticks
+from app.services import compute_pool
+
+
+SYMBOLS = 200_000
+ROUNDS = 60  # Ticks per symbol per generation, as in signal_service
+GENERATIONS = 3
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def measure(engine, rounds):
+    lags, stop = [], asyncio.Event()
+    task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    for _ in range(GENERATIONS):
+        await compute_pool.advance_indicators(engine, rounds)
+    elapsed = (time.perf_counter() - start) / GENERATIONS
+
+    stop.set()
+    await task
+    return elapsed, np.percentile(lags, 99) * 1000, max(lags) * 1000
+
+
+async def main():
+    rng = np.random.default_rng(42)
+    prices = rng.uniform(10, 5_000, SYMBOLS)
+    rounds = []
+    for _ in range(ROUNDS):
+        prices = random_walk_ticks(prices, rng)
+        rounds.append((np.arange(SYMBOLS), prices))
+
+    print(f"{SYMBOLS:,} symbols x {ROUNDS} ticks per generation, {os.cpu_count()} CPUs")
+    print(f"{'mode':>12} {'generation (ms)':>16} {'loop lag p99 (ms)':>18} {'loop lag max (ms)':>18}")
+
+    settings.SIGNAL_POOL_MIN_SYMBOLS = 0
+    for workers in (0, 2, os.cpu_count()):
+        settings.SIGNAL_POOL_WORKERS = workers
+        await compute_pool.start_compute_pool(SYMBOLS)
+
+        engine = IndicatorEngine(SYMBOLS)
+        elapsed, p99, worst = await measure(engine, rounds)
+        label = "inline" if workers == 0 else f"pool x{workers}"
+        print(f"{label:>12} {elapsed * 1000:>16.0f} {p99:>18.1f} {worst:>18.1f}")
+
+        await compute_pool.stop_compute_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+Benchmark: credential-stuffing burst against login-style limits, with and
+without the per-worker pre-limiter
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_local_limiter
+"""
+import asyncio
+import time
+import redis.asyncio as aioredis
+from app.config import settings
+from app import redis_client
+from app.services import local_limiter
+from app.services.redis_service import hit_rate_limit
+
+
+ATTEMPTS = 20_000
+EMAILS = 50  # Accounts under attack
+MAX_REQUESTS = 5
+WINDOW_SECONDS = 900
+
+
+async def attack(use_local):
+    redis_calls = rejected = 0
+    start = time.perf_counter()
+
+    for i in range(ATTEMPTS):
+        key = f"bench:login:{i % EMAILS}:{use_local}"
+
+        if use_local and local_limiter.local_reject(key, MAX_REQUESTS, WINDOW_SECONDS) is not None:
+            rejected += 1
+            continue
+
+        result = await hit_rate_limit(key, MAX_REQUESTS, WINDOW_SECONDS, "sliding_log")
+        redis_calls += 1
+        rejected += not result.allowed
+        if use_local:
+            local_limiter.record_result(key, WINDOW_SECONDS, result)
+
+    return time.perf_counter() - start, redis_calls, rejected
+
+
+async def main():
+    redis = await aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    redis_client.redis_client = redis
+
+    print(f"{ATTEMPTS:,} login attempts on {EMAILS} accounts, {MAX_REQUESTS} per {WINDOW_SECONDS}s")
+    print(f"{'mode':>14} {'Redis calls':>12} {'rejected':>9} {'us/attempt':>11}")
+
+    for use_local in (False, True):
+        elapsed, redis_calls, rejected = await attack(use_local)
+        label = "pre-limiter" if use_local else "Redis only"
+        print(f"{label:>14} {redis_calls:>12,} {rejected:>9,} {elapsed / ATTEMPTS * 1e6:>11.1f}")
+
+    keys = await redis.keys("bench:login:*")
+    if keys:
+        await redis.delete(*keys)
+    await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
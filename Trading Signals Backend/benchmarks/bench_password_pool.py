@@ -0,0 +1,75 @@
+"""
+Benchmark: event-loop latency during a login burst, inline vs the hashing pool
+
+A probe task sleeps PROBE_INTERVAL in a loop and records how late it wakes
+up, the delay a /signals/ request on the same worker would see while
+BURST password checks are in progress.
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_password_pool
+"""
+import asyncio
+import time
+import numpy as np
+from fastapi import HTTPException
+from app.config import settings
+from app.services import password_pool
+from app.services.auth_service import hash_password, verify_password
+
+
+BURST = 40
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def login(password_hash):
+    try:
+        await password_pool.run_password_job(verify_password, "Test@123456", password_hash)
+        return True
+    except HTTPException:
+        return False
+
+
+async def measure(password_hash):
+    lags, stop = [], asyncio.Event()
+    task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login(password_hash) for _ in range(BURST)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await task
+    return elapsed, sum(results), np.percentile(lags, 99) * 1000, max(lags) * 1000
+
+
+async def main():
+    password_hash = hash_password("Test@123456")
+
+    print(f"{BURST} concurrent logins")
+    print(f"{'mode':>18} {'burst (ms)':>11} {'served':>7} {'loop lag p99 (ms)':>18} {'loop lag max (ms)':>18}")
+
+    for workers, limit in ((0, BURST), (4, BURST), (4, BURST // 4)):
+        settings.PASSWORD_HASH_WORKERS = workers
+        settings.PASSWORD_HASH_QUEUE_LIMIT = limit
+        if workers:
+            await password_pool.start_password_pool()
+
+        elapsed, served, p99, worst = await measure(password_hash)
+        label = "inline" if workers == 0 else f"pool x{workers} q{limit}"
+        print(f"{label:>18} {elapsed * 1000:>11.0f} {served:>7} {p99:>18.1f} {worst:>18.1f}")
+
+        await password_pool.stop_password_pool()
+
+    print(password_pool.get_password_pool_stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
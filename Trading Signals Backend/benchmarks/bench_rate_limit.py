@@ -0,0 +1,84 @@
+"""
+Benchmark: Redis round trips, commands and latency per rate-limit check
+
+Compares the old GET + SETEX/INCR check with the scripted limiters. Round
+trips are counted on the client; commands executed inside Redis come from
+INFO commandstats.
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import time
+import redis.asyncio as aioredis
+from app.config import settings
+from app import redis_client
+from app.services.redis_service import RATE_LIMIT_SCRIPTS, hit_rate_limit
+
+
+CHECKS = 5_000
+IDENTITIES = 100
+MAX_REQUESTS = 30
+WINDOW_SECONDS = 60
+
+
+async def legacy_check(redis, key):
+    """The check before scripted limiters: GET, then SETEX or INCR"""
+    current_count = await redis.get(key)
+    if current_count is None:
+        await redis.setex(key, WINDOW_SECONDS, 1)
+        return True
+    if int(current_count) >= MAX_REQUESTS:
+        return False
+    await redis.incr(key)
+    return True
+
+
+async def server_commands(redis):
+    stats = await redis.info("commandstats")
+    return sum(entry["calls"] for name, entry in stats.items() if name not in ("cmdstat_info", "cmdstat_config|resetstat"))
+
+
+async def measure(redis, label, check):
+    await redis.config_resetstat()
+    round_trips = 0
+    execute = redis.execute_command
+
+    async def counted(*args, **kwargs):
+        nonlocal round_trips
+        round_trips += 1
+        return await execute(*args, **kwargs)
+
+    redis.execute_command = counted
+    start = time.perf_counter()
+    for i in range(CHECKS):
+        await check(f"bench:rate:{label}:{i % IDENTITIES}")
+    elapsed = time.perf_counter() - start
+    redis.execute_command = execute
+
+    commands = await server_commands(redis)
+    print(f"{label:>16} {round_trips / CHECKS:>12.2f} {commands / CHECKS:>10.2f} {elapsed / CHECKS * 1e6:>10.0f}")
+
+
+async def main():
+    redis = await aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    redis_client.redis_client = redis
+
+    print(f"{CHECKS:,} checks over {IDENTITIES} identities, {MAX_REQUESTS} per {WINDOW_SECONDS}s")
+    print(f"{'limiter':>16} {'round trips':>12} {'commands':>10} {'us/check':>10}")
+
+    await measure(redis, "legacy", lambda key: legacy_check(redis, key))
+    for algorithm in RATE_LIMIT_SCRIPTS:
+        await measure(
+            redis, algorithm,
+            lambda key, algorithm=algorithm: hit_rate_limit(key, MAX_REQUESTS, WINDOW_SECONDS, algorithm)
+        )
+
+    keys = await redis.keys("bench:rate:*")
+    if keys:
+        await redis.delete(*keys)
+    await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
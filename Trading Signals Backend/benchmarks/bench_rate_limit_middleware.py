@@ -0,0 +1,104 @@
+"""
+Benchmark: per-request overhead of the rate_limit decorator vs RateLimitMiddleware
+
+The Redis check is replaced by a constant answer in both, so only the cost
+of finding the limit and the identity is measured.
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_rate_limit_middleware
+"""
+import asyncio
+import importlib
+import inspect
+import json
+import time
+from fastapi import Request
+from app.middleware import rate_limit_middleware
+from app.models.auth import LoginRequest
+from app.services.auth_service import create_access_token
+from app.services.redis_service import RateLimitResult
+
+
+REQUESTS = 100_000
+ALLOWED = RateLimitResult(True, 5, 4, 900.0)
+
+# The package re-exports the decorator under the module's name
+decorator_module = importlib.import_module("app.middleware.rate_limit")
+
+
+async def always_allowed(*args, **kwargs):
+    return ALLOWED
+
+
+async def endpoint_app(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def main():
+    decorator_module.hit_rate_limit = always_allowed
+    rate_limit_middleware.hit_rate_limit = always_allowed
+
+    body = json.dumps({"email": "user@example.com", "password": "Test@123456"}).encode()
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/auth/login",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("10.0.0.1", 50000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        pass
+
+    @decorator_module.rate_limit(key_prefix="login", max_requests=5, window_seconds=900, identifier="email")
+    async def login(request: Request, data: LoginRequest):
+        return None
+
+    request = Request(scope)
+    data = LoginRequest(email="user@example.com", password="Test@123456")
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await login(request, data)
+    decorator_us = (time.perf_counter() - start) / REQUESTS * 1e6
+
+    # What the decorator did per request before the signature was cached
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        inspect.signature(login.__wrapped__).bind(request, data).apply_defaults()
+    signature_us = (time.perf_counter() - start) / REQUESTS * 1e6
+
+    middleware = rate_limit_middleware.RateLimitMiddleware(endpoint_app)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await middleware(scope, receive, send)
+    middleware_us = (time.perf_counter() - start) / REQUESTS * 1e6
+
+    token = create_access_token({"user_id": 1, "email": "user@example.com", "is_paid": False})
+    signals = {**scope, "path": "/signals/", "method": "GET", "headers": [(b"authorization", f"Bearer {token}".encode())]}
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await middleware(signals, receive, send)
+    signals_us = (time.perf_counter() - start) / REQUESTS * 1e6
+
+    unlisted = {**scope, "path": "/health", "method": "GET"}
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await middleware(unlisted, receive, send)
+    passthrough_us = (time.perf_counter() - start) / REQUESTS * 1e6
+
+    print(f"{REQUESTS:,} requests, Redis check stubbed")
+    print(f"{'decorator (old, per-call inspect.signature)':>46} {decorator_us + signature_us:>8.2f} us")
+    print(f"{'decorator (signature cached)':>46} {decorator_us:>8.2f} us")
+    print(f"{'middleware (body read + replay, headers)':>46} {middleware_us:>8.2f} us")
+    print(f"{'middleware, /signals/ tier from the JWT':>46} {signals_us:>8.2f} us")
+    print(f"{'middleware, route without a limit':>46} {passthrough_us:>8.2f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Benchmark: Redis round trips and latency with batched helpers and micro-batching
+
+Part 1 reads and writes a group of keys one command at a time vs get_many /
+set_many. Part 2 runs concurrent "requests" (a rate limit check plus a cache
+read, like a webhook idempotency check) with REDIS_MICRO_BATCHING off and on,
+using the app's connection pool.
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_redis_batching
+"""
+import asyncio
+import time
+from redis.exceptions import ConnectionError
+from app.config import settings
+from app.redis_client import create_redis_pool, close_redis_pool, get_redis
+from app.services import redis_service
+from app.services.redis_service import get_cached_data, get_many, hit_rate_limit, set_cached_data, set_many
+
+
+GROUP_SIZE = 20  # Keys per multi-key read/write
+GROUPS = 500
+REQUESTS = 5_000
+CONCURRENCY = (1, 10, 50, 200)
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def multi_key(keys):
+    start = time.perf_counter()
+    for _ in range(GROUPS):
+        for key in keys:
+            await set_cached_data(key, "x" * 100, 60)
+    set_single = (time.perf_counter() - start) / GROUPS * 1e6
+
+    start = time.perf_counter()
+    for _ in range(GROUPS):
+        await set_many({key: "x" * 100 for key in keys}, 60)
+    set_batched = (time.perf_counter() - start) / GROUPS * 1e6
+
+    start = time.perf_counter()
+    for _ in range(GROUPS):
+        for key in keys:
+            await get_cached_data(key)
+    get_single = (time.perf_counter() - start) / GROUPS * 1e6
+
+    start = time.perf_counter()
+    for _ in range(GROUPS):
+        await get_many(keys)
+    get_batched = (time.perf_counter() - start) / GROUPS * 1e6
+
+    print(f"{GROUP_SIZE} keys per call, {GROUPS} calls (micro-batching off)")
+    print(f"{'SETEX x ' + str(GROUP_SIZE):>16} {set_single:>9.0f} us   {'set_many':>10} {set_batched:>9.0f} us")
+    print(f"{'GET x ' + str(GROUP_SIZE):>16} {get_single:>9.0f} us   {'get_many':>10} {get_batched:>9.0f} us")
+
+
+async def request_flow(i, latencies):
+    start = time.perf_counter()
+    await hit_rate_limit(f"bench:batch:rate:{i % 100}", 1_000_000, 60, "sliding_window")
+    await get_cached_data(f"bench:batch:webhook:{i % 1000}")
+    latencies.append(time.perf_counter() - start)
+
+
+async def concurrent(concurrency):
+    latencies, errors = [], 0
+    queue = iter(range(REQUESTS))
+
+    async def worker():
+        nonlocal errors
+        for i in queue:
+            try:
+                await request_flow(i, latencies)
+            except ConnectionError:
+                errors += 1  # Pool exhausted (REDIS_POOL_MAX_CONNECTIONS)
+
+    batches = redis_service.batch_stats["batches"]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    batches = redis_service.batch_stats["batches"] - batches
+
+    round_trips = batches if settings.REDIS_MICRO_BATCHING else REQUESTS * 2
+    mode = "batched" if settings.REDIS_MICRO_BATCHING else "direct"
+    print(
+        f"{concurrency:>6} {mode:>8} {REQUESTS / elapsed:>10,.0f} "
+        f"{percentile(latencies, 0.5) * 1e3:>8.2f} {percentile(latencies, 0.99) * 1e3:>8.2f} "
+        f"{round_trips / REQUESTS:>12.2f} {errors:>7}"
+    )
+
+
+async def main():
+    await create_redis_pool()
+    redis = get_redis()
+
+    settings.REDIS_MICRO_BATCHING = False
+    await multi_key([f"bench:batch:key:{i}" for i in range(GROUP_SIZE)])
+
+    print(f"\n{REQUESTS:,} requests (rate limit check + cache read), pool of {settings.REDIS_POOL_MAX_CONNECTIONS}")
+    print(f"{'tasks':>6} {'mode':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'trips/req':>12} {'errors':>7}")
+    for concurrency in CONCURRENCY:
+        for batching in (False, True):
+            settings.REDIS_MICRO_BATCHING = batching
+            await concurrent(concurrency)
+
+    keys = await redis.keys("bench:batch:*")
+    if keys:
+        await redis.delete(*keys)
+    await close_redis_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
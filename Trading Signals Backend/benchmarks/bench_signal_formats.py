@@ -0,0 +1,62 @@
+"""
+Benchmark: payload size and client decode time per /signals/ format
+
+Encoding happens once per snapshot and tier, so the per-request cost is
+bytes on the wire and the client's decode time.
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_signal_formats
+"""
+import gzip
+import json
+import time
+from datetime import datetime
+import msgpack
+import numpy as np
+from app.engine.signal_engine import Universe, generate_signals
+from app.services.signal_snapshot import FORMAT_COLUMNS, FORMAT_JSON, FORMAT_MSGPACK, SignalSnapshot
+
+
+SIZES = [20, 2_000, 50_000]
+
+DECODERS = {
+    FORMAT_JSON: json.loads,
+    FORMAT_COLUMNS: json.loads,
+    FORMAT_MSGPACK: msgpack.unpackb,
+}
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(42)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    print(f"{'signals':>8} {'format':>8} {'bytes':>11} {'gzip bytes':>11} {'encode (ms)':>12} {'decode (ms)':>12}")
+
+    for n in SIZES:
+        universe = Universe([f"SYM{i}" for i in range(n)], rng.uniform(10, 50_000, n), ["IT"] * n)
+        envelope = {"version": 1, "generated_at": time.time(), "soft_expires_at": time.time() + 300,
+                    "signals": generate_signals(universe, timestamp, rng)}
+        repeat = 200 if n <= 2_000 else 5
+
+        for fmt, decode in DECODERS.items():
+            encode_time = best_of(lambda: SignalSnapshot(envelope, hard_ttl=900).render_body(True, fmt=fmt), repeat)
+            body = SignalSnapshot(envelope, hard_ttl=900).render_body(True, fmt=fmt)
+            decode_time = best_of(lambda: decode(body), repeat)
+
+            print(
+                f"{n:>8,} {fmt:>8} {len(body):>11,} {len(gzip.compress(body)):>11,} "
+                f"{encode_time * 1000:>12.3f} {decode_time * 1000:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: SignalsResponse model vs pre-rendered bytes for GET /signals/
+
+Drives two otherwise identical FastAPI routes in-process through ASGI (no
+network, no auth) so the difference is validation + JSON encoding alone.
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_signals_response
+"""
+import asyncio
+import time
+from datetime import datetime
+import numpy as np
+from fastapi import FastAPI
+from fastapi.responses import Response
+from app.engine.signal_engine import Universe, generate_signals
+from app.models.signal import SignalsResponse
+from app.services.signal_snapshot import SignalSnapshot
+
+
+REQUESTS = 5_000
+SIZES = [20, 2_000]
+
+
+def build_app(snapshot: SignalSnapshot) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model", response_model=SignalsResponse)
+    async def model_route():
+        # What the endpoint did before: rebuild and revalidate the model
+        result = snapshot.user_view(is_paid=True, cached=True)
+        return SignalsResponse(
+            signals=result["signals"],
+            total=result["total"],
+            is_paid=result["is_paid"],
+            cached=result["cached"],
+            message=result["message"]
+        )
+
+    @app.get("/raw")
+    async def raw_route():
+        return Response(content=snapshot.render_body(is_paid=True), media_type="application/json")
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def requests_per_second(app: FastAPI, path: str) -> float:
+    for _ in range(200):
+        await call(app, path)
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await call(app, path)
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    rng = np.random.default_rng(42)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    print(f"{'signals':>8} {'model req/s':>12} {'raw req/s':>10} {'gain':>6}")
+
+    for n in SIZES:
+        universe = Universe([f"SYM{i}" for i in range(n)], rng.uniform(10, 50_000, n))
+        envelope = {"version": 1, "generated_at": time.time(), "soft_expires_at": time.time() + 300,
+                    "signals": generate_signals(universe, timestamp, rng)}
+        app = build_app(SignalSnapshot(envelope, hard_ttl=900))
+
+        model_rps = await requests_per_second(app, "/model")
+        raw_rps = await requests_per_second(app, "/raw")
+
+        print(f"{n:>8,} {model_rps:>12,.0f} {raw_rps:>10,.0f} {raw_rps / model_rps:>5.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""
+Benchmark: deque-per-symbol tick storage vs preallocated ring buffers
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_tick_store
+"""
+import time
+from collections import deque
+import numpy as np
+from app.engine.tick_store import TickStore
+
+
+SYMBOLS = 5_000
+CAPACITY = 1024
+TICKS = 2_000_000
+BATCH = 10_000
+WINDOW_READS = 50_000
+
+
+def main():
+    rng = np.random.default_rng(42)
+    positions = rng.integers(0, SYMBOLS, TICKS)
+    timestamps = np.arange(TICKS, dtype=np.int64)
+    prices = rng.uniform(10, 5_000, TICKS)
+    readers = rng.integers(0, SYMBOLS, WINDOW_READS)
+
+    # Baseline: a bounded deque of (timestamp, price) tuples per symbol
+    buffers = [deque(maxlen=CAPACITY) for _ in range(SYMBOLS)]
+    start = time.perf_counter()
+    for position, timestamp, price in zip(positions.tolist(), timestamps.tolist(), prices.tolist()):
+        buffers[position].append((timestamp, price))
+    deque_write = TICKS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for position in readers.tolist():
+        np.fromiter((price for _, price in buffers[position]), dtype=np.float64)
+    deque_read = (time.perf_counter() - start) / WINDOW_READS
+
+    store = TickStore([f"SYM{i}" for i in range(SYMBOLS)], CAPACITY)
+    start = time.perf_counter()
+    for offset in range(0, TICKS, BATCH):
+        chunk = slice(offset, offset + BATCH)
+        store.append_batch(positions[chunk], timestamps[chunk], prices[chunk])
+    store_write = TICKS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for position in readers.tolist():
+        store.window(position)
+    store_read = (time.perf_counter() - start) / WINDOW_READS
+
+    print(f"{SYMBOLS:,} symbols, capacity {CAPACITY}, {TICKS:,} ticks")
+    print(f"{'':>14} {'ticks/s':>12} {'window read (us)':>17}")
+    print(f"{'deques':>14} {deque_write:>12,.0f} {deque_read * 1e6:>17.1f}")
+    print(f"{'ring buffers':>14} {store_write:>12,.0f} {store_read * 1e6:>17.1f}")
+    print(f"ring buffer memory: {store.nbytes / 1024 / 1024:.1f} MiB (fixed)")
+
+
+if __name__ == "__main__":
+    main()
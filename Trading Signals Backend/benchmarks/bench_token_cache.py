@@ -0,0 +1,52 @@
+"""
+Benchmark: per-request token verification with and without the payload cache
+
+Run inside the backend container:
+    docker exec -it trading_signals_backend python -m benchmarks.bench_token_cache
+"""
+import time
+from jose import jwt
+from app.config import settings
+from app.services import token_cache
+from app.services.auth_service import create_access_token, verify_token
+
+
+TOKENS = 1_000
+REQUESTS = 100_000
+
+
+def per_call_us(tokens, requests):
+    start = time.perf_counter()
+    for i in range(requests):
+        verify_token(tokens[i % len(tokens)])
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    tokens = [
+        create_access_token({"user_id": i, "email": f"user{i}@example.com", "is_paid": i % 2 == 0})
+        for i in range(TOKENS)
+    ]
+
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        jwt.decode(tokens[i % TOKENS], settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    decode_us = (time.perf_counter() - start) / REQUESTS * 1e6
+
+    # Cache smaller than the token set: every lookup misses and decodes
+    settings.TOKEN_CACHE_SIZE = TOKENS // 2
+    miss_us = per_call_us(tokens, REQUESTS)
+
+    settings.TOKEN_CACHE_SIZE = TOKENS
+    per_call_us(tokens, TOKENS)
+    hit_us = per_call_us(tokens, REQUESTS)
+
+    print(f"{TOKENS:,} distinct tokens, {REQUESTS:,} verifications")
+    print(f"{'jwt.decode':>22} {decode_us:>8.2f} us/request")
+    print(f"{'verify_token, misses':>22} {miss_us:>8.2f} us/request")
+    print(f"{'verify_token, hits':>22} {hit_us:>8.2f} us/request ({decode_us / hit_us:.0f}x faster)")
+    print(token_cache.get_token_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
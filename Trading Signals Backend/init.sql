@@ -6,12 +6,63 @@ CREATE TABLE IF NOT EXISTS users (
     stripe_customer_id VARCHAR(255),
     stripe_subscription_id VARCHAR(255),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    token_version INTEGER NOT NULL DEFAULT 0,
+    token_min_version INTEGER NOT NULL DEFAULT 0
 );
 
+-- Columns added after the first release; CREATE TABLE IF NOT EXISTS leaves
+-- existing tables as they are. This file is applied again by the backend on
+-- every startup, so every statement must be idempotent.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS token_min_version INTEGER NOT NULL DEFAULT 0;
+
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_stripe_customer ON users(stripe_customer_id);
 
+-- One row per symbol on a user's watchlist (mirrored into Redis sets)
+CREATE TABLE IF NOT EXISTS watchlist_symbols (
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    symbol VARCHAR(32) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, symbol)
+);
+
+-- API requests per user, day (UTC), endpoint and tier. Counts are buffered in
+-- worker memory and Redis and added here in periodic bulk upserts. No foreign
+-- key to users: a user deleted before a flush must not fail the whole batch,
+-- and usage history outlives the account.
+CREATE TABLE IF NOT EXISTS usage_daily (
+    user_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    endpoint VARCHAR(32) NOT NULL,
+    tier VARCHAR(8) NOT NULL,
+    requests BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, day, endpoint, tier)
+);
+
+ALTER TABLE usage_daily DROP CONSTRAINT IF EXISTS usage_daily_user_id_fkey;
+
+CREATE INDEX IF NOT EXISTS idx_usage_daily_day ON usage_daily(day);
+
+-- Every generated signal snapshot, partitioned by day on generated_at (UTC).
+-- Daily partitions (signal_history_YYYYMMDD) are created by the backend
+-- before it writes into them.
+CREATE TABLE IF NOT EXISTS signal_history (
+    version BIGINT NOT NULL,
+    symbol VARCHAR(32) NOT NULL,
+    action VARCHAR(4) NOT NULL,
+    price DOUBLE PRECISION NOT NULL,
+    target DOUBLE PRECISION NOT NULL,
+    stoploss DOUBLE PRECISION NOT NULL,
+    sector VARCHAR(64),
+    generated_at TIMESTAMP NOT NULL
+) PARTITION BY RANGE (generated_at);
+
+CREATE INDEX IF NOT EXISTS idx_signal_history_symbol_time ON signal_history(symbol, generated_at);
+CREATE INDEX IF NOT EXISTS idx_signal_history_time ON signal_history(generated_at);
+
 DO $$
 BEGIN
     RAISE NOTICE 'Database schema initialized successfully!';
@@ -28,6 +28,30 @@ async def clear_rate_limits():
     yield
 
 
+@pytest.fixture
+async def redis(request, monkeypatch):
+    """
+    In-memory Redis (fakeredis, with Lua) installed as the app's Redis clients
+    
+    Both the decoded and the raw bytes client share one fresh server per test.
+    The decoded client is returned; parametrize indirectly with "bytes" to get
+    the raw one, e.g. @pytest.mark.parametrize("redis", ["bytes"], indirect=True).
+    """
+    import fakeredis
+    from app import redis_client
+    
+    server = fakeredis.FakeServer()
+    text_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    bytes_client = fakeredis.FakeAsyncRedis(server=server)
+    monkeypatch.setattr(redis_client, "redis_client", text_client)
+    monkeypatch.setattr(redis_client, "redis_bytes_client", bytes_client)
+    
+    yield bytes_client if getattr(request, "param", "text") == "bytes" else text_client
+    
+    await text_client.close()
+    await bytes_client.close()
+
+
 @pytest.fixture(scope="function")
 async def client():
     """Create an async test client that connects to the running backend"""
@@ -121,6 +121,22 @@ class TestAuthEndpoints:
         assert "Incorrect email or password" in response.json()["detail"]
     
     
+    async def test_login_rate_limited(self, client: AsyncClient, test_user_data):
+        """Test the 6th login attempt for an email within the window is rejected"""
+        # A fresh email, since workers remember rejected identities in memory
+        credentials = test_user_data
+        
+        for _ in range(5):
+            response = await client.post("/auth/login", json=credentials)
+            assert response.status_code == 401
+        
+        response = await client.post("/auth/login", json=credentials)
+        
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) > 0
+        assert response.headers["x-ratelimit-remaining"] == "0"
+    
+    
     async def test_get_me_authenticated(self, client: AsyncClient, test_user_data, cleanup_test_user):
         """Test /me endpoint with valid token"""
         # Signup and get token
@@ -142,6 +158,49 @@ class TestAuthEndpoints:
         assert "created_at" in data
     
     
+    async def test_get_me_served_from_user_cache(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test repeated /me calls return the same user and count user cache hits"""
+        signup_response = await client.post("/auth/signup", json=test_user_data)
+        headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+        
+        first = await client.get("/auth/me", headers=headers)
+        second = await client.get("/auth/me", headers=headers)
+        
+        assert first.json() == second.json()
+        
+        stats = (await client.get("/health")).json()["users_cache"]
+        assert stats["l1_hits"] + stats["l2_hits"] >= 1
+    
+    
+    async def test_logout_revokes_token(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test a token is rejected after /logout"""
+        signup_response = await client.post("/auth/signup", json=test_user_data)
+        headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+        
+        assert (await client.get("/auth/me", headers=headers)).status_code == 200
+        
+        response = await client.post("/auth/logout", headers=headers)
+        assert response.status_code == 204
+        
+        assert (await client.get("/auth/me", headers=headers)).status_code == 401
+    
+    
+    async def test_refresh_and_logout_all(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test /refresh issues a working token and /logout-all revokes both"""
+        signup_response = await client.post("/auth/signup", json=test_user_data)
+        headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+        
+        response = await client.post("/auth/refresh", headers=headers)
+        assert response.status_code == 200
+        refreshed = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        assert (await client.get("/signals/", headers=refreshed)).status_code == 200
+        
+        assert (await client.post("/auth/logout-all", headers=refreshed)).status_code == 204
+        
+        assert (await client.get("/signals/", headers=headers)).status_code == 401
+        assert (await client.get("/auth/me", headers=refreshed)).status_code == 401
+    
+    
     async def test_get_me_no_token(self, client: AsyncClient):
         """Test /me endpoint without authentication token"""
         response = await client.get("/auth/me")
@@ -157,3 +216,50 @@ class TestAuthEndpoints:
         )
         
         assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+class TestClaimsOnlyAuth:
+    """Test cases for get_token_user with AUTH_TRUST_TOKEN_CLAIMS on"""
+    
+    @pytest.fixture(autouse=True)
+    def trust_claims(self, monkeypatch):
+        from app.config import settings
+        
+        monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    
+    
+    @staticmethod
+    def credentials(user_id: int, version: int):
+        from fastapi.security import HTTPAuthorizationCredentials
+        from app.services.auth_service import create_access_token
+        
+        token = create_access_token({"user_id": user_id, "email": "claims@example.com", "is_paid": False, "ver": version})
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    
+    
+    async def test_revoked_token_stays_revoked_after_stale_write(self, redis):
+        """Test a stale versions write arriving after logout-all cannot re-admit old tokens"""
+        import random
+        from fastapi import HTTPException
+        from app.dependencies import get_token_user
+        from app.services.token_versions import _key, set_token_versions
+        
+        user_id = random.randint(10**8, 10**9)  # Not in Postgres; the Redis mirror decides
+        try:
+            await set_token_versions(user_id, 1, 0)
+            user = await get_token_user(self.credentials(user_id, 1))
+            assert user.id == user_id and user.reissued_token is None
+            
+            # logout-all, then a refill that read Postgres before it
+            assert await set_token_versions(user_id, 2, 2) == (2, 2)
+            assert await set_token_versions(user_id, 1, 0) == (2, 2)
+            
+            with pytest.raises(HTTPException) as exc:
+                await get_token_user(self.credentials(user_id, 1))
+            assert exc.value.status_code == 401
+            
+            assert (await get_token_user(self.credentials(user_id, 2))).id == user_id
+            assert 0 < await redis.ttl(_key(user_id))
+        finally:
+            await redis.delete(_key(user_id))
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from app.engine.backtest import (
+    OPEN, STOPLOSS, TARGET, PriceSeries, SignalBatch, run_backtest, score_symbol, summarize
+)
+
+
+def make_series(highs, lows):
+    """Bars one minute apart starting at t=1000, close halfway between high and low"""
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    timestamps = 1000 + 60 * np.arange(len(highs))
+    close = (highs + lows) / 2
+    return PriceSeries(timestamps, close, highs, lows, close)
+
+
+def naive_outcomes(prices, signals, max_bars=None):
+    """Bar-by-bar reference scan"""
+    outcomes = []
+    for i in range(len(signals)):
+        start = np.searchsorted(prices.timestamps, signals.timestamps[i])
+        limit = len(prices) if max_bars is None else min(start + max_bars, len(prices))
+        outcome = OPEN
+        for j in range(start, limit):
+            if signals.is_buy[i]:
+                hit_target = prices.high[j] >= signals.target[i]
+                hit_stop = prices.low[j] <= signals.stoploss[i]
+            else:
+                hit_target = prices.low[j] <= signals.target[i]
+                hit_stop = prices.high[j] >= signals.stoploss[i]
+            if hit_stop:
+                outcome = STOPLOSS
+                break
+            if hit_target:
+                outcome = TARGET
+                break
+        outcomes.append(outcome)
+    return np.asarray(outcomes)
+
+
+class TestBacktest:
+    """Test cases for the vectorized signal backtester"""
+    
+    def test_buy_and_sell_outcomes(self):
+        """First touched level decides the outcome, in both directions"""
+        prices = make_series(highs=[101, 102, 104, 101, 99], lows=[99, 100, 101, 97, 95])
+        signals = SignalBatch(
+            ["X"] * 4,
+            [1000, 1000, 1060, 1000],
+            [True, True, False, False],
+            [100, 100, 102, 100],
+            [103, 110, 98, 90],
+            [98, 98.5, 105, 110],
+        )
+        
+        result = score_symbol(prices, signals)
+        
+        assert result["outcome"].tolist() == [TARGET, STOPLOSS, TARGET, OPEN]
+        assert result["holding_bars"].tolist() == [3, 4, 3, 5]
+        assert result["r_multiple"][0] == pytest.approx(1.5)
+        assert result["r_multiple"][1] == pytest.approx(-1.0)
+    
+    
+    def test_same_bar_counts_as_stoploss(self):
+        """When target and stop are inside one bar, the stop is assumed first"""
+        prices = make_series(highs=[101, 106], lows=[99, 94])
+        signals = SignalBatch(["X"], [1000], [True], [100], [105], [95])
+        
+        result = score_symbol(prices, signals)
+        
+        assert result["outcome"].tolist() == [STOPLOSS]
+        assert result["exit_price"].tolist() == [95]
+    
+    
+    def test_max_bars_and_missing_data(self):
+        """Horizon closes open signals; signals without bars or prices are not scored"""
+        prices = make_series(highs=[101, 102, 103, 110], lows=[99, 99, 99, 99])
+        signals = SignalBatch(
+            ["X", "X", "Y"],
+            [1000, 5000, 1000],
+            [True, True, True],
+            [100, 100, 100],
+            [105, 105, 105],
+            [95, 95, 95],
+        )
+        
+        results = run_backtest(signals, {"X": prices}, max_bars=2)
+        
+        assert results["outcome"].tolist() == [OPEN, OPEN, OPEN]
+        assert results["scored"].tolist() == [True, False, False]
+        assert results["exit_price"][0] == prices.close[1]
+        
+        report = summarize(results)
+        assert list(report) == ["X"]
+        assert report["X"]["signals"] == 1
+        assert report["X"]["open"] == 1
+    
+    
+    def test_matches_bar_by_bar_scan(self):
+        """Binary-lifting search agrees with a naive scan on a random walk"""
+        rng = np.random.default_rng(3)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, 2_000)))
+        prices = make_series(close * (1 + rng.uniform(0, 0.004, 2_000)), close * (1 - rng.uniform(0, 0.004, 2_000)))
+        
+        n = 1_000
+        timestamps = rng.integers(900, int(prices.timestamps[-1]) + 100, n)
+        is_buy = rng.random(n) < 0.5
+        entry = np.interp(timestamps, prices.timestamps, close)
+        signals = SignalBatch(
+            ["X"] * n,
+            timestamps,
+            is_buy,
+            entry,
+            np.where(is_buy, entry * 1.01, entry * 0.99),
+            np.where(is_buy, entry * 0.995, entry * 1.005),
+        )
+        
+        for max_bars in (None, 40):
+            result = score_symbol(prices, signals, max_bars)
+            assert np.array_equal(result["outcome"], naive_outcomes(prices, signals, max_bars))
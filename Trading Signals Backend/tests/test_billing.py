@@ -0,0 +1,40 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+class TestBillingEndpoints:
+    """Test cases for billing endpoints"""
+    
+    async def _signup_headers(self, client: AsyncClient, test_user_data) -> dict:
+        response = await client.post("/auth/signup", json=test_user_data)
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    
+    async def test_usage_report(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test a new user's usage report covers the default range"""
+        headers = await self._signup_headers(client, test_user_data)
+        
+        response = await client.get("/billing/usage", headers=headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["total_requests"] == sum(row["requests"] for row in data["usage"])
+        assert data["start"] <= data["end"]
+    
+    
+    async def test_usage_invalid_range(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test start after end is rejected"""
+        headers = await self._signup_headers(client, test_user_data)
+        
+        response = await client.get("/billing/usage?start=2026-02-01&end=2026-01-01", headers=headers)
+        
+        assert response.status_code == 400
+    
+    
+    async def test_usage_no_token(self, client: AsyncClient):
+        """Test the usage report requires authentication"""
+        response = await client.get("/billing/usage")
+        
+        assert response.status_code == 403
@@ -0,0 +1,49 @@
+import json
+import pytest
+from app.services.cache_codec import MAGIC, CodecError, decode_value, encode_value, register_codec
+
+
+ENVELOPE = {
+    "version": 3,
+    "generated_at": 1700000000.5,
+    "soft_expires_at": 1700000300.5,
+    "signals": [
+        {"symbol": "RELIANCE", "action": "BUY", "price": 2461.1, "target": 2534.93, "stoploss": 2411.88,
+         "timestamp": "2024-01-01 09:15:00", "sector": "Energy"},
+    ] * 50,
+}
+
+
+class TestCacheCodec:
+    """Test cases for Redis value codecs"""
+    
+    @pytest.mark.parametrize("codec", ["json", "msgpack", "zlib", "msgpack+zlib"])
+    def test_round_trip(self, codec):
+        """Every built-in codec decodes back to the original value"""
+        encoded = encode_value(ENVELOPE, codec)
+        
+        assert encoded.startswith(MAGIC)
+        assert decode_value(encoded) == ENVELOPE
+    
+    
+    def test_legacy_json_is_readable(self):
+        """Values written before codecs existed (plain JSON, str or bytes) still decode"""
+        legacy = json.dumps(ENVELOPE)
+        
+        assert decode_value(legacy) == ENVELOPE
+        assert decode_value(legacy.encode()) == ENVELOPE
+    
+    
+    def test_compressed_is_smaller(self):
+        """Compression pays off on repetitive signal payloads"""
+        assert len(encode_value(ENVELOPE, "msgpack+zlib")) < len(encode_value(ENVELOPE, "json")) / 4
+    
+    
+    def test_unknown_codec(self):
+        """Unknown codec names and tags are rejected"""
+        with pytest.raises(CodecError):
+            encode_value(ENVELOPE, "brotli")
+        with pytest.raises(CodecError):
+            decode_value(MAGIC + b"?" + b"{}")
+        with pytest.raises(CodecError):
+            register_codec("other", b"j", str.encode, bytes.decode)
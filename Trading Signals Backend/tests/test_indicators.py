@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from app.engine.indicators import (
+    ATR_PERIOD, EMA_FAST, EMA_SLOW, MACD_SIGNAL, RSI_PERIOD,
+    IndicatorEngine, advance, merge_engine, split_engine, split_rounds
+)
+
+
+def wilder(values, period):
+    """Reference Wilder smoothing: plain mean of the first `period`, then smoothed"""
+    average = 0.0
+    for n, value in enumerate(values, start=1):
+        average += (value - average) / min(n, period)
+    return average
+
+
+def ema(values, period):
+    alpha = 2 / (period + 1)
+    result = [values[0]]
+    for value in values[1:]:
+        result.append(result[-1] + alpha * (value - result[-1]))
+    return np.asarray(result)
+
+
+@pytest.fixture
+def paths():
+    """Random-walk prices: 200 ticks for 50 symbols"""
+    rng = np.random.default_rng(11)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (200, 50)), axis=0))
+
+
+class TestIndicatorEngine:
+    """Test cases for the incremental indicator engine"""
+    
+    def test_matches_full_recomputation(self, paths):
+        """O(1) updates agree with recomputing each indicator over the whole history"""
+        engine = IndicatorEngine(paths.shape[1], sma_fast=5, sma_slow=20)
+        for tick in paths:
+            engine.update(tick)
+        
+        sma = engine.sma()
+        assert np.allclose(sma["fast"], paths[-5:].mean(axis=0))
+        assert np.allclose(sma["slow"], paths[-20:].mean(axis=0))
+        
+        for i in range(0, paths.shape[1], 7):
+            path = paths[:, i]
+            macd = ema(path, EMA_FAST) - ema(path, EMA_SLOW)
+            assert engine.macd()[i] == pytest.approx(macd[-1])
+            assert engine.macd_signal[i] == pytest.approx(ema(macd, MACD_SIGNAL)[-1])
+            
+            change = np.diff(path)
+            gain = wilder(np.maximum(change, 0), RSI_PERIOD)
+            loss = wilder(np.maximum(-change, 0), RSI_PERIOD)
+            assert engine.rsi()[i] == pytest.approx(100 - 100 / (1 + gain / loss))
+            assert engine.atr[i] == pytest.approx(wilder(np.abs(change), ATR_PERIOD))
+    
+    
+    def test_partial_batches_match_full_batches(self, paths):
+        """Ticking symbols in subsets gives the same state as ticking them all together"""
+        together = IndicatorEngine(paths.shape[1])
+        apart = IndicatorEngine(paths.shape[1])
+        even, odd = np.arange(0, 50, 2), np.arange(1, 50, 2)
+        
+        for tick in paths:
+            together.update(tick)
+            apart.update(tick[odd], odd)
+            apart.update(tick[even], even)
+        
+        assert np.allclose(together.sma()["slow"], apart.sma()["slow"])
+        assert np.allclose(together.rsi(), apart.rsi())
+        assert np.allclose(together.atr, apart.atr)
+    
+    
+    def test_signal_levels_follow_action(self, paths):
+        """Uptrends buy, downtrends sell, levels sit on the right side of the entry"""
+        engine = IndicatorEngine(3)
+        ramp = np.linspace(100, 130, 60)
+        for up, down, noise in zip(ramp, ramp[::-1], paths[:60, 0]):
+            engine.update(np.array([up, down, noise]))
+        
+        columns = engine.signal_columns()
+        is_buy, price = columns["is_buy"], columns["price"]
+        
+        assert is_buy[:2].tolist() == [True, False]
+        assert np.all(np.where(is_buy, columns["target"] > price, columns["target"] < price))
+        assert np.all(np.where(is_buy, columns["stoploss"] < price, columns["stoploss"] > price))
+    
+    
+    def test_chunked_advance_matches_whole_engine(self, paths):
+        """Splitting symbols into chunks, advancing each and merging back changes nothing"""
+        rng = np.random.default_rng(2)
+        rounds = []
+        for tick in paths:
+            traded = np.flatnonzero(rng.random(50) < 0.7)
+            rounds.append((traded, tick[traded]))
+        
+        whole = IndicatorEngine(50)
+        _, expected = advance(whole, rounds)
+        
+        chunked = IndicatorEngine(50)
+        bounds = np.array([0, 13, 30, 50])
+        parts = []
+        for i, chunk_rounds in enumerate(split_rounds(rounds, bounds)):
+            chunk, columns = advance(split_engine(chunked, bounds[i], bounds[i + 1]), chunk_rounds)
+            merge_engine(chunked, bounds[i], chunk)
+            parts.append(columns)
+        
+        for name in expected:
+            assert np.array_equal(np.concatenate([part[name] for part in parts]), expected[name])
+        assert np.array_equal(chunked.count, whole.count)
+        assert np.allclose(chunked.rsi(), whole.rsi())
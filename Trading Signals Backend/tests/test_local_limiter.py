@@ -0,0 +1,25 @@
+import pytest
+from app.services import local_limiter
+
+
+@pytest.fixture
+def entries(monkeypatch):
+    """No tracked keys"""
+    monkeypatch.setattr(local_limiter, "_entries", local_limiter.OrderedDict())
+
+
+class TestLocalLimiter:
+    """Test cases for the per-worker pre-limiter"""
+    
+    async def test_shed_counts_keep_top_keys(self, redis, entries, monkeypatch):
+        """Synced rejection counts are trimmed to the most rejected keys"""
+        monkeypatch.setattr(local_limiter, "SHED_MAX_KEYS", 2)
+        
+        for key, rejected in (("ip:a", 5), ("ip:b", 1), ("ip:c", 3)):
+            local_limiter._entry(key, 10, 0.0)[local_limiter.SHED] = rejected
+        await local_limiter.sync_shed_counts()
+        
+        shed = await redis.zrange(local_limiter.SHED_KEY, 0, -1, withscores=True)
+        assert shed == [("ip:c", 3.0), ("ip:a", 5.0)]
+        assert 0 < await redis.ttl(local_limiter.SHED_KEY)
+        assert all(entry[local_limiter.SHED] == 0 for entry in local_limiter._entries.values())
@@ -0,0 +1,201 @@
+import asyncio
+import time
+import pytest
+from redis.exceptions import NoScriptError
+from app.config import settings
+from app.services import redis_service
+
+
+@pytest.fixture
+def batching(redis, monkeypatch):
+    """Micro-batching on, with an empty queue and fresh counters"""
+    monkeypatch.setattr(settings, "REDIS_MICRO_BATCHING", True)
+    monkeypatch.setattr(redis_service, "_batch", [])
+    monkeypatch.setattr(redis_service, "_batch_handle", None)
+    monkeypatch.setattr(redis_service, "batch_stats", {"batches": 0, "commands": 0, "max_batch": 0})
+    return redis_service.batch_stats
+
+
+class Clock:
+    """Wall clock under test control; fakeredis reads it for TIME and key expiry"""
+    
+    def __init__(self, now: float):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen clock starting on a whole second, so 1 s windows start at 0 ms"""
+    clock = Clock(1_700_000_000.0)
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+class TestMicroBatching:
+    """Test cases for micro-batched Redis commands"""
+    
+    async def test_one_tick_is_one_pipeline(self, redis, batching):
+        """Commands issued in the same tick go out together and each caller gets its reply"""
+        await redis.set("a", "1")
+        
+        results = await asyncio.gather(
+            redis_service.get_cached_data("a"),
+            redis_service.get_cached_data("missing"),
+            redis_service.set_cached_data("b", "2", 60),
+            redis_service._command("incr", "c"),
+        )
+        
+        assert results == ["1", None, True, 1]
+        assert batching == {"batches": 1, "commands": 4, "max_batch": 4}
+        assert await redis.get("b") == "2"
+    
+    
+    async def test_error_reaches_only_its_caller(self, redis, batching):
+        """A failing command (e.g. NOSCRIPT) fails its own caller, not the rest of the batch"""
+        results = await asyncio.gather(
+            redis_service.execute_batched("set", "a", "1"),
+            redis_service.execute_batched("evalsha", "0" * 40, 1, "k"),
+            redis_service.execute_batched("incr", "c"),
+            return_exceptions=True
+        )
+        
+        assert results[0] is True
+        assert isinstance(results[1], NoScriptError)
+        assert results[2] == 1
+        assert batching["batches"] == 1
+    
+    
+    async def test_cancelled_caller(self, redis, batching):
+        """A caller cancelled before the reply arrives does not break the other callers"""
+        cancelled = asyncio.create_task(redis_service.execute_batched("set", "a", "1"))
+        waiting = asyncio.create_task(redis_service.execute_batched("incr", "c"))
+        await asyncio.sleep(0)  # Both are queued
+        
+        cancelled.cancel()
+        
+        assert await asyncio.wait_for(waiting, 1) == 1
+        assert cancelled.cancelled()
+        assert batching["batches"] == 1
+    
+    
+    async def test_full_batch_is_sent_early(self, redis, batching, monkeypatch):
+        """A batch reaching MAX_BATCH_COMMANDS is sent without waiting for the tick to end"""
+        monkeypatch.setattr(redis_service, "MAX_BATCH_COMMANDS", 3)
+        
+        results = await asyncio.gather(*(redis_service._command("incr", "c") for _ in range(7)))
+        
+        assert sorted(results) == list(range(1, 8))
+        assert batching == {"batches": 3, "commands": 7, "max_batch": 3}
+    
+    
+    async def test_get_many_set_many(self, redis, batching):
+        """set_many writes every key with its TTL, get_many reads them back in key order"""
+        await redis_service.set_many({"a": "1", "b": "2"}, 60)
+        await redis_service.set_many({"c": "3"}, {"c": 120})
+        
+        assert await redis_service.get_many(["a", "missing", "b", "c"]) == ["1", None, "2", "3"]
+        assert 0 < await redis.ttl("a") <= 60
+        assert 60 < await redis.ttl("c") <= 120
+        assert await redis_service.get_many([]) == []
+        assert await redis_service.delete_many(["a", "b", "missing"]) == 2
+
+
+
+class TestRateLimitScripts:
+    """Test cases for the Lua rate limiters (limit 3 per second unless noted)"""
+    
+    async def hit(self, algorithm: str, limit: int = 3, window: int = 1):
+        return await redis_service.hit_rate_limit(f"test:{algorithm}", limit, window, algorithm)
+    
+    
+    async def test_fixed_window(self, redis, clock):
+        """Allows the limit per window, then rejects until the window's key expires"""
+        for remaining in (2, 1, 0):
+            result = await self.hit("fixed_window")
+            assert result.allowed and result.remaining == remaining
+            assert result.reset_after == 1.0
+        
+        clock.advance(0.4)
+        result = await self.hit("fixed_window")
+        assert not result.allowed and result.remaining == 0
+        assert result.reset_after == 0.6
+        
+        clock.advance(0.601)  # Redis expires a key once its expiry time has passed
+        assert (await self.hit("fixed_window")).allowed
+    
+    
+    async def test_sliding_log(self, redis, clock):
+        """Rejects while the window holds the limit, until the oldest request leaves it"""
+        for remaining in (2, 1, 0):
+            result = await self.hit("sliding_log")
+            assert result.allowed and result.remaining == remaining
+            clock.advance(0.1)
+        
+        result = await self.hit("sliding_log")
+        assert not result.allowed and result.remaining == 0
+        assert result.reset_after == pytest.approx(0.7)
+        
+        clock.advance(0.7)
+        result = await self.hit("sliding_log")
+        assert result.allowed and result.remaining == 0
+        assert result.reset_after == pytest.approx(0.1)  # Until the second request leaves the window
+    
+    
+    async def test_sliding_window_decay(self, redis, clock):
+        """The previous window's count is weighted by how much of it still overlaps"""
+        for _ in range(10):
+            assert (await self.hit("sliding_window", limit=10)).allowed
+        assert not (await self.hit("sliding_window", limit=10)).allowed
+        
+        # 250 ms into the next window: 10 * 0.75 + 0 = 7.5 counted
+        clock.advance(1.25)
+        result = await self.hit("sliding_window", limit=10)
+        assert result.allowed and result.remaining == 1
+        assert result.reset_after == pytest.approx(1.75)
+        
+        # 7.5 + 1 = 8.5 counted, one more fits
+        assert (await self.hit("sliding_window", limit=10)).remaining == 0
+        
+        # 9.5 counted: the next fits once 10 * (1 - elapsed) + 2 + 1 <= 10, at ~300 ms
+        result = await self.hit("sliding_window", limit=10)
+        assert not result.allowed and result.remaining == 0
+        assert 0.05 <= result.reset_after <= 0.052
+        
+        clock.advance(0.04)
+        assert not (await self.hit("sliding_window", limit=10)).allowed
+        clock.advance(result.reset_after - 0.04)
+        assert (await self.hit("sliding_window", limit=10)).allowed
+    
+    
+    async def test_token_bucket(self, redis, clock):
+        """Allows a burst of the bucket size, then one request per refilled token"""
+        for remaining in (2, 1, 0):
+            result = await self.hit("token_bucket", window=3)
+            assert result.allowed and result.remaining == remaining
+        assert result.reset_after == pytest.approx(3.0)  # Until the bucket is full again
+        
+        result = await self.hit("token_bucket", window=3)
+        assert not result.allowed and result.remaining == 0
+        assert result.reset_after == pytest.approx(1.0)
+        
+        clock.advance(0.9)
+        assert not (await self.hit("token_bucket", window=3)).allowed
+        clock.advance(0.1)
+        assert (await self.hit("token_bucket", window=3)).allowed
+    
+    
+    @pytest.mark.parametrize("micro_batching", [False, True])
+    async def test_noscript_falls_back_to_eval(self, redis, clock, monkeypatch, micro_batching):
+        """The first call after a script cache flush runs EVAL, which caches the script again"""
+        monkeypatch.setattr(settings, "REDIS_MICRO_BATCHING", micro_batching)
+        await redis.script_flush()
+        
+        assert (await self.hit("sliding_window")).allowed
+        assert await redis.script_exists(redis_service._SCRIPT_SHAS["sliding_window"]) == [True]
+        assert (await self.hit("sliding_window")).remaining == 1
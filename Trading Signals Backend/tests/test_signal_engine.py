@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from app.engine.signal_engine import Universe, generate_signal_columns, generate_signals
+from app.engine.signal_index import SignalIndex
+
+
+class TestSignalEngine:
+    """Test cases for the columnar signal generation engine"""
+    
+    def test_targets_and_stoplosses_follow_action(self):
+        """BUY signals target above entry and stop below it, SELL the other way round"""
+        base_prices = np.linspace(100, 50_000, 5_000)
+        columns = generate_signal_columns(base_prices, np.random.default_rng(7))
+        
+        is_buy = columns["is_buy"]
+        price = columns["price"]
+        
+        assert np.all(columns["target"][is_buy] > price[is_buy])
+        assert np.all(columns["stoploss"][is_buy] < price[is_buy])
+        assert np.all(columns["target"][~is_buy] < price[~is_buy])
+        assert np.all(columns["stoploss"][~is_buy] > price[~is_buy])
+        
+        # Prices stay within ±2% of base (plus rounding)
+        assert np.all(np.abs(price / base_prices - 1) <= 0.02 + 1e-4)
+    
+    
+    def test_records_match_signal_model(self):
+        """Records keep the universe order and the Signal fields"""
+        universe = Universe.from_instruments([
+            {"symbol": "NIFTY", "base_price": 21500},
+            {"symbol": "TCS", "base_price": 3650},
+        ])
+        
+        signals = generate_signals(universe, "2024-01-01 09:15:00", np.random.default_rng(1))
+        
+        assert [s["symbol"] for s in signals] == ["NIFTY", "TCS"]
+        for signal in signals:
+            assert set(signal) == {"symbol", "action", "price", "target", "stoploss", "timestamp", "sector"}
+            assert signal["action"] in ("BUY", "SELL")
+            assert isinstance(signal["price"], float)
+    
+    
+    def test_universe_length_mismatch(self):
+        """Symbols and prices must line up"""
+        with pytest.raises(ValueError):
+            Universe(["A", "B"], [1.0])
+
+
+class TestSignalIndex:
+    """Test cases for per-snapshot signal query indexes"""
+    
+    @pytest.fixture
+    def signals(self):
+        universe = Universe(
+            [f"SYM{i}" for i in range(500)],
+            np.linspace(100, 5_000, 500),
+            ["Banking" if i % 3 == 0 else "IT" for i in range(500)]
+        )
+        return generate_signals(universe, "2024-01-01 09:15:00", np.random.default_rng(3))
+    
+    
+    def test_filters_match_linear_scan(self, signals):
+        """Indexed lookups return exactly what a full scan would, in snapshot order"""
+        index = SignalIndex(signals)
+        
+        positions, next_cursor = index.query(action="buy", sector="BANKING", min_price=1_000, max_price=3_000, limit=1_000)
+        
+        expected = [
+            i for i, s in enumerate(signals)
+            if s["action"] == "BUY" and s["sector"] == "Banking" and 1_000 <= s["price"] <= 3_000
+        ]
+        assert positions == expected
+        assert next_cursor is None
+    
+    
+    def test_cursor_pagination_covers_all_matches(self, signals):
+        """Following next_cursor visits every match exactly once"""
+        index = SignalIndex(signals)
+        
+        seen, cursor = [], None
+        while True:
+            positions, cursor = index.query(action="SELL", cursor=cursor, limit=17)
+            seen.extend(positions)
+            if cursor is None:
+                break
+        
+        assert seen == [i for i, s in enumerate(signals) if s["action"] == "SELL"]
+    
+    
+    def test_symbol_lookup_respects_visible_limit(self, signals):
+        """A free-tier query cannot reach past the visible signals"""
+        index = SignalIndex(signals)
+        
+        assert index.query(symbol="sym1", visible=3)[0] == [1]
+        assert index.query(symbol="SYM10", visible=3)[0] == []
+        assert index.query(symbol="UNKNOWN")[0] == []
+    
+    
+    def test_symbols_filter_matches_watchlist(self, signals):
+        """A symbols filter returns only those symbols, in snapshot order"""
+        index = SignalIndex(signals)
+        watchlist = {"SYM7", "SYM2", "SYM400", "UNKNOWN"}
+        
+        positions, _ = index.query(symbols=watchlist, limit=1_000)
+        
+        assert positions == [2, 7, 400]
+        assert index.query(symbols=watchlist, visible=3)[0] == [2]
+        assert index.query(symbols=set(), limit=1_000)[0] == []
@@ -0,0 +1,80 @@
+import time
+import pytest
+from app.config import settings
+from app.services import signal_service
+from app.services.cache_codec import encode_value
+
+
+@pytest.fixture
+def follower(redis, monkeypatch):
+    """A worker that is not the leader, with an empty L1 and short waits"""
+    monkeypatch.setattr(signal_service, "is_leader", lambda: False)
+    monkeypatch.setattr(signal_service, "GENERATION_WAIT_TIMEOUT", 0.3)
+    monkeypatch.setattr(signal_service, "LOCK_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(signal_service, "_l1_snapshot", None)
+    monkeypatch.setattr(signal_service, "_diff_history", signal_service.deque(maxlen=signal_service.DIFF_HISTORY))
+
+
+async def _store(redis, version: int, age: float = 0) -> None:
+    generated_at = time.time() - age
+    envelope = {
+        "version": version,
+        "generated_at": generated_at,
+        "soft_expires_at": generated_at + signal_service.CACHE_TTL,
+        "signals": [],
+    }
+    await redis.set(signal_service.VERSION_KEY, version)
+    await redis.set(signal_service.CACHE_KEY, encode_value(envelope, settings.CACHE_CODEC))
+
+
+class TestGenerateOrWait:
+    """Test cases for workers waiting on another worker's generation"""
+    
+    async def test_cold_cache_without_leader_gives_up(self, redis, follower):
+        """Nothing cached and nobody generating raises instead of waiting forever"""
+        with pytest.raises(signal_service.SignalsUnavailable):
+            await signal_service._generate_or_wait()
+    
+    
+    async def test_stale_copy_served_after_deadline(self, redis, follower, monkeypatch):
+        """A stale copy is served at the deadline, decoded only while its version is new"""
+        await _store(redis, 3, age=signal_service.CACHE_TTL + 1)
+        
+        decodes = 0
+        get_cached_envelope = signal_service.get_cached_envelope
+        
+        async def counting_get_cached_envelope():
+            nonlocal decodes
+            decodes += 1
+            return await get_cached_envelope()
+        
+        monkeypatch.setattr(signal_service, "get_cached_envelope", counting_get_cached_envelope)
+        
+        snapshot, cached = await signal_service._generate_or_wait()
+        
+        assert snapshot.version == 3 and cached
+        assert decodes == 2  # First poll and the final fallback, not every poll
+
+
+
+class TestL1Snapshot:
+    """Test cases for the per-worker L1 snapshot"""
+    
+    async def test_reconnect_rearmed_by_current_version(self, redis, follower, monkeypatch):
+        """After a pub/sub reconnect, reading the same version from Redis makes L1 trusted again"""
+        monkeypatch.setattr(signal_service.pubsub_service, "_listening", True)
+        monkeypatch.setattr(signal_service, "cache_stats", dict.fromkeys(signal_service.cache_stats, 0))
+        await _store(redis, 5)
+        
+        await signal_service.get_snapshot()
+        assert signal_service.get_l1_snapshot().version == 5
+        
+        monkeypatch.setattr(signal_service.pubsub_service, "subscription_generation", signal_service.pubsub_service.subscription_generation + 1)
+        assert signal_service.get_l1_snapshot() is None
+        
+        for _ in range(3):
+            snapshot, _ = await signal_service.get_snapshot()
+            assert snapshot.version == 5
+        
+        assert signal_service.cache_stats["hits"] == 2  # Once to install, once to confirm after the reconnect
+        assert signal_service.cache_stats["l1_hits"] == 2
@@ -0,0 +1,142 @@
+import msgpack
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+class TestSignalsEndpoints:
+    """Test cases for trading signals endpoints"""
+    
+    async def _signup_token(self, client: AsyncClient, test_user_data) -> str:
+        response = await client.post("/auth/signup", json=test_user_data)
+        return response.json()["access_token"]
+    
+    
+    async def test_free_user_signals(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test free user sees 3 signals with snapshot version and ETag"""
+        token = await self._signup_token(client, test_user_data)
+        
+        response = await client.get("/signals/", headers={"Authorization": f"Bearer {token}"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["total"] == 3
+        assert len(data["signals"]) == 3
+        assert data["is_paid"] == False
+        assert data["message"] is not None
+        assert "version" in data
+        assert response.headers["etag"].endswith('-free"')
+    
+    
+    async def test_conditional_get_not_modified(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test If-None-Match with the current ETag returns 304"""
+        token = await self._signup_token(client, test_user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        first = await client.get("/signals/", headers=headers)
+        etag = first.headers["etag"]
+        
+        response = await client.get("/signals/", headers={**headers, "If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+    
+    
+    async def test_since_current_version_is_empty(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test ?since=<current version> returns no changed signals"""
+        token = await self._signup_token(client, test_user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        version = (await client.get("/signals/", headers=headers)).json()["version"]
+        
+        response = await client.get(f"/signals/?since={version}", headers=headers)
+        data = response.json()
+        
+        # A new snapshot may land between the two calls; then the delta is non-empty
+        if data["version"] == version:
+            assert data["signals"] == []
+            assert data["since"] == version
+    
+    
+    async def test_since_with_filters(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test ?since= also applies to filtered pages, which get their own ETag"""
+        token = await self._signup_token(client, test_user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        first = await client.get("/signals/?limit=2", headers=headers)
+        version = first.json()["version"]
+        
+        response = await client.get(f"/signals/?limit=2&since={version}", headers=headers)
+        data = response.json()
+        
+        assert response.headers["etag"] != first.headers["etag"]
+        if data["version"] == version:
+            assert data["signals"] == []
+            assert data["since"] == version
+    
+    
+    async def test_filtered_query(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test filters only match within the free tier's visible signals"""
+        token = await self._signup_token(client, test_user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        response = await client.get("/signals/?action=BUY&limit=2", headers=headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert len(data["signals"]) <= 2
+        assert all(signal["action"] == "BUY" for signal in data["signals"])
+        assert "next_cursor" in data
+    
+    
+    async def test_msgpack_columns(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test Accept: application/msgpack returns the same signals as arrays per field"""
+        token = await self._signup_token(client, test_user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        rows = (await client.get("/signals/", headers=headers)).json()
+        response = await client.get("/signals/", headers={**headers, "Accept": "application/msgpack"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        assert response.headers["etag"].endswith('-free-msgpack"')
+        data = msgpack.unpackb(response.content)
+        
+        if data["version"] == rows["version"]:
+            assert data["columns"]["symbol"] == [signal["symbol"] for signal in rows["signals"]]
+            assert all(isinstance(timestamp, int) for timestamp in data["columns"]["timestamp"])
+        assert len(response.content) < len((await client.get("/signals/", headers=headers)).content)
+    
+    
+    async def test_columnar_json(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test the columnar JSON variant"""
+        token = await self._signup_token(client, test_user_data)
+        headers = {"Authorization": f"Bearer {token}", "Accept": "application/vnd.signals.columns+json"}
+        
+        response = await client.get("/signals/", headers=headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "signals" not in data
+        assert len(data["columns"]["price"]) == data["total"] == 3
+    
+    
+    async def test_rate_limit_headers(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test /signals/ responses carry the free tier's rate limit headers"""
+        token = await self._signup_token(client, test_user_data)
+        
+        response = await client.get("/signals/", headers={"Authorization": f"Bearer {token}"})
+        
+        assert response.status_code == 200
+        assert response.headers["x-ratelimit-limit"] == "60"
+        assert int(response.headers["x-ratelimit-remaining"]) < 60
+        assert "x-ratelimit-reset" in response.headers
+    
+    
+    async def test_signals_no_token(self, client: AsyncClient):
+        """Test /signals/ without authentication token"""
+        response = await client.get("/signals/")
+        
+        assert response.status_code == 403
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from app.engine.tick_store import TickStore
+
+
+@pytest.fixture
+def ticks():
+    """500 ticks spread unevenly over 4 symbols"""
+    rng = np.random.default_rng(5)
+    positions = rng.choice(4, 500, p=[0.55, 0.25, 0.15, 0.05])
+    return positions, np.arange(500) * 1000, rng.uniform(90, 110, 500)
+
+
+class TestTickStore:
+    """Test cases for the per-symbol tick ring buffers"""
+    
+    def test_window_is_contiguous_view_of_newest_ticks(self, ticks):
+        """After wrapping, a window still returns the newest ticks oldest first, without copying"""
+        positions, timestamps, prices = ticks
+        store = TickStore(["A", "B", "C", "D"], capacity=32)
+        for tick in zip(positions, timestamps, prices):
+            store.append(*tick)
+        
+        for symbol in range(4):
+            expected = prices[positions == symbol][-32:]
+            _, window, _ = store.window(symbol)
+            assert np.array_equal(window, expected)
+            assert np.shares_memory(window, store._prices)
+            assert not window.flags.writeable
+        
+        _, last_five, _ = store.window(0, 5)
+        assert np.array_equal(last_five, prices[positions == 0][-5:])
+        assert np.array_equal(store.last_prices, [prices[positions == s][-1] for s in range(4)])
+    
+    
+    def test_batch_append_matches_single_appends(self, ticks):
+        """Batches with repeated symbols keep per-symbol arrival order"""
+        positions, timestamps, prices = ticks
+        one_by_one = TickStore(["A", "B", "C", "D"], capacity=16)
+        batched = TickStore(["A", "B", "C", "D"], capacity=16)
+        
+        for tick in zip(positions, timestamps, prices):
+            one_by_one.append(*tick)
+        for chunk in np.array_split(np.arange(500), 7):
+            batched.append_batch(positions[chunk], timestamps[chunk], prices[chunk])
+        
+        assert np.array_equal(one_by_one.written, batched.written)
+        for symbol in range(4):
+            for expected, actual in zip(one_by_one.window(symbol), batched.window(symbol)):
+                assert np.array_equal(expected, actual)
+    
+    
+    def test_drain_yields_unread_ticks_in_order(self, ticks):
+        """Draining replays each symbol's unread ticks once, skipping overwritten ones"""
+        positions, timestamps, prices = ticks
+        store = TickStore(["A", "B", "C", "D"], capacity=64)
+        consumed = np.zeros(4, dtype=np.int64)
+        
+        store.append_batch(positions[:20], timestamps[:20], prices[:20])
+        list(store.drain(consumed))
+        store.append_batch(positions[20:], timestamps[20:], prices[20:])
+        
+        seen = {symbol: [] for symbol in range(4)}
+        for rows, values in store.drain(consumed):
+            assert len(set(rows.tolist())) == len(rows)
+            for row, value in zip(rows, values):
+                seen[row].append(value)
+        
+        for symbol in range(4):
+            remaining = prices[20:][positions[20:] == symbol]
+            assert seen[symbol] == remaining[-64:].tolist()
+        assert np.array_equal(consumed, store.written)
+        assert list(store.drain(consumed)) == []
+    
+    
+    def test_memory_is_fixed(self, ticks):
+        """Buffer memory is allocated up front and does not grow with ticks"""
+        positions, timestamps, prices = ticks
+        store = TickStore(["A", "B", "C", "D"], capacity=8)
+        before = store.nbytes
+        
+        store.append_batch(positions, timestamps, prices)
+        
+        assert store.nbytes == before
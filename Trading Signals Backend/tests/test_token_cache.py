@@ -0,0 +1,29 @@
+import asyncio
+import time
+import pytest
+from app.services import pubsub_service, token_cache
+
+
+@pytest.fixture
+async def listener(redis, monkeypatch):
+    """No revocations in memory; the pub/sub listener is stopped afterwards"""
+    monkeypatch.setattr(token_cache, "_revoked", {})
+    yield
+    await pubsub_service.stop_pubsub_listener()
+
+
+class TestTokenCache:
+    """Test cases for token revocation"""
+    
+    async def test_revocations_reload_on_subscribe(self, redis, listener):
+        """Revocations whose broadcast was missed are loaded when the listener subscribes"""
+        digest = token_cache.token_digest("missed-broadcast")
+        await redis.zadd(token_cache.REVOKED_KEY, {digest.hex(): time.time() + 60})
+        
+        await pubsub_service.start_pubsub_listener()
+        for _ in range(50):
+            if token_cache._revoked:
+                break
+            await asyncio.sleep(0.02)
+        
+        assert token_cache.is_revoked(digest)
@@ -0,0 +1,73 @@
+from datetime import date
+import pytest
+from app.services import usage_service
+
+
+@pytest.fixture
+def counts(monkeypatch):
+    """Empty local counts"""
+    monkeypatch.setattr(usage_service, "_counts", usage_service.Counter())
+
+
+class TestUsageService:
+    """Test cases for usage metering"""
+    
+    def test_field_round_trip(self):
+        """Redis hash fields decode back to the usage key"""
+        key = (42, date(2024, 3, 1), "signals_history", "paid")
+        
+        assert usage_service._parse_field(usage_service._field(key)) == key
+    
+    
+    def test_record_usage_counts_by_tier(self, monkeypatch):
+        """Requests are counted per user, endpoint and tier"""
+        monkeypatch.setattr(usage_service, "_counts", usage_service.Counter())
+        
+        usage_service.record_usage(1, False, "signals")
+        usage_service.record_usage(1, False, "signals")
+        usage_service.record_usage(1, True, "signals")
+        
+        counts = {(user_id, endpoint, tier): n for (user_id, _, endpoint, tier), n in usage_service._counts.items()}
+        assert counts == {(1, "signals", "free"): 2, (1, "signals", "paid"): 1}
+    
+    
+    async def test_failed_redis_flush_keeps_counts(self, monkeypatch):
+        """Counts stay in memory when Redis cannot take them"""
+        monkeypatch.setattr(usage_service, "_counts", usage_service.Counter())
+        usage_service.record_usage(7, False, "signals")
+        
+        class DownRedis:
+            def pipeline(self, **kwargs):
+                raise ConnectionError("Redis unavailable")
+        
+        monkeypatch.setattr(usage_service, "get_redis", DownRedis)
+        with pytest.raises(ConnectionError):
+            await usage_service.flush_to_redis()
+        
+        assert sum(usage_service._counts.values()) == 1
+    
+    
+    async def test_failed_db_flush_restores_counts(self, redis, counts, monkeypatch):
+        """Counts taken from Redis go back when the upsert fails, and are written once it succeeds"""
+        for _ in range(3):
+            usage_service.record_usage(7, True, "signals")
+        usage_service.record_usage(8, False, "signals_stream")
+        await usage_service.flush_to_redis()
+        
+        async def failing_upsert(counts):
+            raise RuntimeError("database unavailable")
+        
+        monkeypatch.setattr(usage_service, "_upsert", failing_upsert)
+        with pytest.raises(RuntimeError):
+            await usage_service.flush_to_db()
+        
+        written = {}
+        
+        async def upsert(counts):
+            written.update(counts)
+        
+        monkeypatch.setattr(usage_service, "_upsert", upsert)
+        await usage_service.flush_to_db()
+        
+        assert {(user_id, tier): n for (user_id, _, _, tier), n in written.items()} == {(7, "paid"): 3, (8, "free"): 1}
+        assert await redis.exists(usage_service.PENDING_KEY) == 0
@@ -0,0 +1,51 @@
+import random
+from datetime import datetime
+import pytest
+from app.models.user import UserInDB
+from app.services import pubsub_service, user_cache
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    """A listening subscription and an empty L1"""
+    monkeypatch.setattr(pubsub_service, "_listening", True)
+    monkeypatch.setattr(user_cache, "_local", user_cache.OrderedDict())
+
+
+def _user(is_paid: bool = False) -> UserInDB:
+    now = datetime(2024, 3, 1, 12, 0)
+    return UserInDB(
+        id=random.randint(10**8, 10**9),
+        email="cache@test.com",
+        password_hash="$2b$12$secret",
+        is_paid=is_paid,
+        created_at=now,
+        updated_at=now
+    )
+
+
+@pytest.mark.parametrize("redis", ["bytes"], indirect=True)
+class TestUserCache:
+    """Test cases for the two-level user cache"""
+    
+    async def test_password_hash_is_not_cached(self, redis):
+        """Only the projection without the password hash is stored"""
+        user = _user()
+        
+        record = await user_cache.cache_user(user)
+        
+        assert not hasattr(record, "password_hash")
+        assert b"$2b$12$secret" not in await redis.get(user_cache._key(user.id))
+        assert (await user_cache.get_cached_user(user.id)).email == user.email
+    
+    
+    async def test_fill_after_invalidation_is_discarded(self, redis):
+        """A record read before an invalidation is not cached after it"""
+        stale = _user(is_paid=False)
+        
+        await user_cache.invalidate_user(stale.id)
+        record = await user_cache.cache_user(stale)
+        
+        assert record.is_paid == False
+        assert await user_cache.get_cached_user(stale.id) is None
+        assert stale.id not in user_cache._local
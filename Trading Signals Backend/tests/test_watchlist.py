@@ -0,0 +1,93 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+class TestWatchlistEndpoints:
+    """Test cases for watchlist endpoints"""
+    
+    async def _signup_headers(self, client: AsyncClient, test_user_data) -> dict:
+        response = await client.post("/auth/signup", json=test_user_data)
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    
+    async def test_empty_watchlist(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test a new user has an empty watchlist and sees all visible signals"""
+        headers = await self._signup_headers(client, test_user_data)
+        
+        response = await client.get("/watchlist/", headers=headers)
+        
+        assert response.status_code == 200
+        assert response.json() == {"symbols": [], "total": 0}
+        
+        data = (await client.get("/signals/", headers=headers)).json()
+        assert data["watchlist"] == False
+        assert data["total"] == 3
+    
+    
+    async def test_watchlist_filters_signals(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test signals are limited to watchlist symbols unless ?watchlist=false"""
+        headers = await self._signup_headers(client, test_user_data)
+        symbol = (await client.get("/signals/", headers=headers)).json()["signals"][0]["symbol"]
+        
+        response = await client.post(f"/watchlist/{symbol.lower()}", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["symbols"] == [symbol]
+        
+        data = (await client.get("/signals/", headers=headers)).json()
+        assert data["watchlist"] == True
+        assert [signal["symbol"] for signal in data["signals"]] == [symbol]
+        
+        data = (await client.get("/signals/?watchlist=false", headers=headers)).json()
+        assert data["watchlist"] == False
+        assert data["total"] == 3
+    
+    
+    async def test_replace_and_remove(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test PUT replaces the watchlist and DELETE removes a symbol"""
+        headers = await self._signup_headers(client, test_user_data)
+        symbols = [s["symbol"] for s in (await client.get("/signals/", headers=headers)).json()["signals"]]
+        
+        response = await client.put("/watchlist/", json={"symbols": symbols[:2]}, headers=headers)
+        assert response.json()["total"] == 2
+        
+        response = await client.delete(f"/watchlist/{symbols[0]}", headers=headers)
+        assert response.json()["symbols"] == [symbols[1]]
+    
+    
+    async def test_unknown_symbol(self, client: AsyncClient, test_user_data, cleanup_test_user):
+        """Test unknown symbols are rejected"""
+        headers = await self._signup_headers(client, test_user_data)
+        
+        response = await client.post("/watchlist/NOT_A_SYMBOL", headers=headers)
+        
+        assert response.status_code == 400
+
+
+class TestWatchlistMirror:
+    """Test cases for the Redis mirror of watchlists"""
+    
+    async def test_read_fills_mirror(self, redis, monkeypatch):
+        """A database read is mirrored, an empty watchlist as the marker"""
+        from app.services import watchlist_service
+        
+        async def load_from_db(user_id):
+            return frozenset() if user_id == 1 else frozenset({"TCS"})
+        
+        monkeypatch.setattr(watchlist_service, "_load_from_db", load_from_db)
+        
+        assert await watchlist_service.get_watchlist(1) == frozenset()
+        assert await watchlist_service.get_watchlist(2) == frozenset({"TCS"})
+        assert await redis.smembers(watchlist_service._key(1)) == {watchlist_service.EMPTY_MARKER}
+        assert await redis.smembers(watchlist_service._key(2)) == {"TCS"}
+    
+    
+    async def test_stale_read_is_not_mirrored_after_write(self, redis):
+        """Symbols read before a write cannot replace the mirror after it"""
+        from app.services import watchlist_service
+        
+        await watchlist_service._mirror(3, frozenset({"TCS"}))
+        await watchlist_service._invalidate(3)
+        await watchlist_service._mirror(3, frozenset({"TCS"}))
+        
+        assert await redis.exists(watchlist_service._key(3)) == 0
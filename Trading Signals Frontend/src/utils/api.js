@@ -1,3 +1,5 @@
+import { auth } from './auth';
+
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
 export const api = {
@@ -62,6 +64,12 @@ export const api = {
       throw new Error('Failed to fetch signals');
     }
 
+    // Sent when the token predates an upgrade; it carries the current tier
+    const reissuedToken = response.headers.get('X-Access-Token');
+    if (reissuedToken) {
+      auth.setToken(reissuedToken);
+    }
+
     return response.json();
   },
 